@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface processing the "sat" files of many simu-cic runs in
+a pool of processes:
+
+    python simu_cic_cli.py [-j 4] info|convert|passes|eclipses|stats PATH [PATH ...]
+
+where each PATH is a run directory or a "sat" file.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from simu_cic_columnar import COLUMNAR_SUFFIX, save_columnar
+from simu_cic_file_manager import CONTENT_REGISTRY, File, get_sat_filepaths
+from simu_cic_intervals import Interval_Set
+from simu_cic_writer import write_sat_file
+
+COMMANDS = ["info", "convert", "passes", "eclipses", "stats"]
+
+# Contents processed by the commands restricted to one kind of file.
+COMMAND_CONTENTS = {"passes" : "GEOMETRICAL_VISIBILITY_GROUND_STATION", "eclipses" : "SATELLITE_ECLIPSE"}
+
+# Output formats of convert and the suffix of the converted files.
+CONVERT_FORMATS = {"columnar" : ".txt" + COLUMNAR_SUFFIX, "csv" : ".csv", "txt" : ".txt", "txt.gz" : ".txt.gz",
+                   "txt.xz" : ".txt.xz", "txt.bz2" : ".txt.bz2"}
+
+def get_filepaths(paths : list, command : str, station : int = None) -> list:
+    """
+    "sat" files to process: the given files, and the files of the given run
+    directories whose content the command processes.
+
+    Parameters
+    ----------
+    paths : list
+        ['runs/run_1', 'runs/run_2/Sat_SATELLITE_ECLIPSE.txt']
+    command : str
+        "passes"
+    station : int, optional
+        1, restricts passes to the visibilities of this station.
+
+    Raises
+    ------
+    FileNotFoundError
+        Every path must be an existing file or directory.
+
+    Returns
+    -------
+    list
+        ['runs/run_1/Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt', ...]
+
+    """
+    filepaths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for contents in get_sat_filepaths(path).values():
+                for user_defined_content, filepath in contents.items():
+                    content_type = CONTENT_REGISTRY.get(user_defined_content)
+                    if command in COMMAND_CONTENTS and content_type.name != COMMAND_CONTENTS[command]:
+                        continue
+                    if station is not None and content_type.get_station(user_defined_content) not in (None, station):
+                        continue
+                    filepaths.append(filepath)
+        elif os.path.isfile(path):
+            filepaths.append(path)
+        else:
+            raise FileNotFoundError(f"{path} is neither a file nor a directory.")
+    return filepaths
+
+def load_parser(filepath : str):
+    identity = CONTENT_REGISTRY.identify(filepath)
+    if identity is None:
+        raise ValueError(f"{filepath} is not a \"sat\" file of a registered content.")
+    return CONTENT_REGISTRY.get_parser_class(identity[1])(filepath)
+
+def set_epoch_to_str(epoch : int) -> str:
+    return f"{epoch // 86400000000} {epoch % 86400000000 / 1e6:.5f}"
+
+def format_intervals(interval_set : Interval_Set) -> list:
+    lines = [f"{start:%Y-%m-%dT%H:%M:%S.%f}  {stop:%Y-%m-%dT%H:%M:%S.%f}  {(stop - start).total_seconds():.3f} s"
+             for start, stop in interval_set]
+    lines.append(f"{len(interval_set)} intervals, {interval_set.get_coverage().total_seconds():.3f} s")
+    return lines
+
+def get_column_names(sat_file_parser) -> list:
+    return CONTENT_REGISTRY.get(sat_file_parser.get_user_defined_content()).column_names
+
+def get_info(sat_file_parser) -> list:
+    results = sat_file_parser.get_results()
+    time_axis = results.epochs
+    lines = [f"OBJECT_NAME {sat_file_parser.get_object_name()}, "
+             f"USER_DEFINED_CONTENT {sat_file_parser.get_user_defined_content()}",
+             f"START_TIME {sat_file_parser.get_start_time()}, STOP_TIME {sat_file_parser.get_stop_time()}",
+             f"columns {get_column_names(sat_file_parser)}"]
+    if len(time_axis):
+        lines.append(f"samples {set_epoch_to_str(time_axis[0])} to {set_epoch_to_str(time_axis[-1])}, "
+                     f"step {time_axis.get_step() / 1e6:g} s, {'regular' if time_axis.is_regular() else 'irregular'}")
+    return lines
+
+def get_stats(sat_file_parser) -> list:
+    lines = []
+    for name, column in zip(get_column_names(sat_file_parser), sat_file_parser.get_results().columns):
+        values = [value for value in column if value == value]
+        if values:
+            lines.append(f"{name}: count {len(values)}, nan {len(column) - len(values)}, min {min(values):g}, "
+                         f"max {max(values):g}, mean {math.fsum(values) / len(values):g}")
+        else:
+            lines.append(f"{name}: count 0, nan {len(column)}")
+    return lines
+
+def convert(sat_file_parser, output_format : str, output_dirpath : str = None) -> list:
+    basename = File(sat_file_parser.filepath).get_uncompressed_basename()
+    output_filepath = os.path.join(output_dirpath or sat_file_parser.get_dirname(),
+                                   Path(basename).stem + CONVERT_FORMATS[output_format])
+    if os.path.abspath(output_filepath) == os.path.abspath(sat_file_parser.filepath):
+        raise ValueError(f"{output_filepath} would overwrite its source file.")
+    if output_format == "columnar":
+        save_columnar(sat_file_parser, output_filepath)
+    elif output_format == "csv":
+        results = sat_file_parser.get_results()
+        with open(output_filepath, "w") as file:
+            file.write(",".join(["Date"] + get_column_names(sat_file_parser)) + "\n")
+            for index in range(len(results)):
+                file.write(",".join([f"{results.get_date(index):%Y-%m-%dT%H:%M:%S.%f}"] +
+                                    [repr(column[index]) for column in results.columns]) + "\n")
+    else:
+        write_sat_file(output_filepath, sat_file_parser)
+    return [f"-> {output_filepath}"]
+
+def run_task(command : str, filepath : str, options : dict) -> dict:
+    """
+    Processes one file, in a worker process.
+
+    Parameters
+    ----------
+    command : str
+        "stats"
+    filepath : str
+        runs/run_1/Sat_SATELLITE_ALTITUDE.txt
+    options : dict
+        {'format': 'columnar', 'output_dir': None, 'min_duration': 0.0,
+         'minimum': 100.0, 'maximum': 100.0}
+
+    Returns
+    -------
+    dict
+        {'filepath': 'runs/run_1/Sat_SATELLITE_ALTITUDE.txt', 'rows': 3, 'bytes': 600,
+         'elapsed': 0.0012, 'lines': ['altitude (km): count 3, ...'], 'error': None}
+
+    """
+    task = {"filepath" : filepath, "rows" : 0, "bytes" : 0, "elapsed" : 0.0, "lines" : [], "error" : None}
+    start = time.perf_counter()
+    try:
+        task["bytes"] = os.path.getsize(filepath)
+        sat_file_parser = load_parser(filepath)
+        task["rows"] = len(sat_file_parser.get_results())
+        if command == "info":
+            task["lines"] = get_info(sat_file_parser)
+        elif command == "stats":
+            task["lines"] = get_stats(sat_file_parser)
+        elif command == "convert":
+            task["lines"] = convert(sat_file_parser, options["format"], options["output_dir"])
+        else:
+            content_type = CONTENT_REGISTRY.get(sat_file_parser.get_user_defined_content())
+            if content_type.name != COMMAND_CONTENTS[command]:
+                raise ValueError(f"{command} requires a {COMMAND_CONTENTS[command]} file.")
+            if command == "passes":
+                interval_set = Interval_Set.from_sat_visibility(sat_file_parser)
+            else:
+                interval_set = Interval_Set.from_sat_eclipse(sat_file_parser, options["minimum"], options["maximum"])
+            task["lines"] = format_intervals(interval_set.filter(timedelta(seconds = options["min_duration"])))
+    except Exception as error:
+        # Any failure is reported with its file rather than aborting the whole pool.
+        task["error"] = f"{type(error).__name__}: {error}"
+    task["elapsed"] = time.perf_counter() - start
+    return task
+
+def run_tasks(command : str, filepaths : list, options : dict, workers : int):
+    """
+    Yields the results of run_task for the files, in their order, computed
+    by a pool of workers processes (in the current process for 1 worker).
+    """
+    if workers <= 1:
+        for filepath in filepaths:
+            yield run_task(command, filepath, options)
+        return
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        yield from executor.map(run_task, [command] * len(filepaths), filepaths, [options] * len(filepaths))
+
+def format_throughput(rows : int, size : int, elapsed : float) -> str:
+    speed = size / elapsed / 1e6 if elapsed > 0 else math.inf
+    return f"{rows} rows, {size / 1e6:.3f} MB in {elapsed * 1e3:.1f} ms ({speed:.1f} MB/s)"
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(prog = "simu-cic", description = __doc__.split("\n\n")[0].strip())
+    argument_parser.add_argument("-j", "--jobs", type = int, default = None,
+                                 help = "number of worker processes (default: number of processors, 1: no pool)")
+    argument_parser.add_argument("-q", "--quiet", action = "store_true", help = "do not print the per-file timings")
+    subparsers = argument_parser.add_subparsers(dest = "command", required = True)
+    subparsers.add_parser("info", help = "header, samples and step of each file")
+    convert_parser = subparsers.add_parser("convert", help = "convert each file to another format")
+    convert_parser.add_argument("-f", "--format", choices = list(CONVERT_FORMATS), default = "columnar")
+    convert_parser.add_argument("-o", "--output-dir", default = None,
+                                help = "directory of the converted files (default: next to the sources)")
+    passes_parser = subparsers.add_parser("passes", help = "ground station visibility windows")
+    passes_parser.add_argument("-s", "--station", type = int, default = None, help = "ground station number")
+    eclipses_parser = subparsers.add_parser("eclipses", help = "windows of sun eclipse ratio in [minimum, maximum]")
+    eclipses_parser.add_argument("--minimum", type = float, default = 100.0, help = "minimum ratio (%%, default 100)")
+    eclipses_parser.add_argument("--maximum", type = float, default = 100.0, help = "maximum ratio (%%, default 100)")
+    for subparser in (passes_parser, eclipses_parser):
+        subparser.add_argument("--min-duration", type = float, default = 0.0, help = "minimum duration (s)")
+    subparsers.add_parser("stats", help = "count, min, max and mean of each column")
+    for subparser in subparsers.choices.values():
+        subparser.add_argument("paths", nargs = "+", help = "run directories or \"sat\" files")
+    return argument_parser
+
+def main(argv : list = None) -> int:
+    """
+    Runs a command over the files of the given runs and prints, for each
+    file in the order of the paths, its timing and the command output, then
+    the totals.
+
+    Parameters
+    ----------
+    argv : list, optional
+        ['-j', '4', 'stats', 'runs/run_1', 'runs/run_2']. The default is sys.argv[1:].
+
+    Returns
+    -------
+    int
+        0, or 1 when a file could not be processed.
+
+    """
+    arguments = get_argument_parser().parse_args(argv)
+    options = {"format" : getattr(arguments, "format", None), "output_dir" : getattr(arguments, "output_dir", None),
+               "min_duration" : getattr(arguments, "min_duration", 0.0),
+               "minimum" : getattr(arguments, "minimum", None), "maximum" : getattr(arguments, "maximum", None)}
+    try:
+        filepaths = get_filepaths(arguments.paths, arguments.command, getattr(arguments, "station", None))
+    except FileNotFoundError as error:
+        print(error, file = sys.stderr)
+        return 1
+    if options["output_dir"]:
+        os.makedirs(options["output_dir"], exist_ok = True)
+    workers = min(arguments.jobs or os.cpu_count() or 1, max(len(filepaths), 1))
+    start = time.perf_counter()
+    status, rows, size = 0, 0, 0
+    for task in run_tasks(arguments.command, filepaths, options, workers):
+        if task["error"] is not None:
+            print(f"{task['filepath']}: {task['error']}", file = sys.stderr)
+            status = 1
+            continue
+        rows += task["rows"]
+        size += task["bytes"]
+        print(task["filepath"] if arguments.quiet else
+              f"{task['filepath']}: {format_throughput(task['rows'], task['bytes'], task['elapsed'])}")
+        for line in task["lines"]:
+            print("  " + line)
+    if not arguments.quiet:
+        print(f"{len(filepaths)} files, {format_throughput(rows, size, time.perf_counter() - start)}, "
+              f"{workers} processes")
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Binary columnar copies of the "sat" files and of tables of results, read
+back without parsing any text: a JSON header line followed by the raw typed
+arrays.
+"""
+import json
+import os
+import sys
+from array import array
+
+from simu_cic_file_manager import CONTENT_REGISTRY, Sat_File_Parser, Simulation_Results, Time_Axis
+from simu_cic_writer import get_header
+
+COLUMNAR_SUFFIX = ".cols"
+COLUMNAR_VERSION = 1
+
+def save_columnar(sat_file_parser : Sat_File_Parser, filepath : str = None) -> str:
+    """
+    Writes the header and the simulation results of a parser in a binary
+    columnar file: the epochs (only when the time axis is not regular) and
+    every value column with its own typecode.
+
+    Parameters
+    ----------
+    sat_file_parser : Sat_File_Parser
+        Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+    filepath : str, optional
+        The default is the filepath of the parser followed by COLUMNAR_SUFFIX
+        (Sat_SATELLITE_ALTITUDE.txt.cols).
+
+    Returns
+    -------
+    str
+        Sat_SATELLITE_ALTITUDE.txt.cols
+
+    """
+    if filepath is None:
+        filepath = sat_file_parser.filepath + COLUMNAR_SUFFIX
+    results = sat_file_parser.get_results()
+    time_axis = results.epochs
+    epochs = array('q') if time_axis.is_regular() else time_axis.epochs
+    arrays = [epochs] + results.columns
+    header = {"version" : COLUMNAR_VERSION, "byteorder" : sys.byteorder,
+              "source" : os.path.basename(sat_file_parser.filepath), "precision" : sat_file_parser.precision,
+              "header" : get_header(sat_file_parser.simulation_data),
+              "time_axis" : [time_axis.start, time_axis.step, len(time_axis)],
+              "typecodes" : [values.typecode for values in arrays], "lengths" : [len(values) for values in arrays]}
+    temporary_filepath = filepath + ".tmp"
+    with open(temporary_filepath, "wb") as file:
+        file.write(json.dumps(header).encode() + b"\n")
+        for values in arrays:
+            values.tofile(file)
+    os.replace(temporary_filepath, filepath)
+    return filepath
+
+def load_columnar(filepath : str) -> Sat_File_Parser:
+    """
+    Reads a file written by save_columnar.
+
+    Parameters
+    ----------
+    filepath : str
+        Sat_SATELLITE_ALTITUDE.txt.cols
+
+    Raises
+    ------
+    ValueError
+        The file must be a "sat" file of COLUMNAR_VERSION (not a table), and
+        its USER_DEFINED_CONTENT registered in CONTENT_REGISTRY.
+
+    Returns
+    -------
+    Sat_File_Parser
+        Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt), the parser of the content
+        of the file (see Sat_File_Parser.from_simulation_data), with the
+        results and the header of the source file.
+
+    """
+    with open(filepath, "rb") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != COLUMNAR_VERSION or "columns" in header:
+            raise ValueError(f"{filepath} is not a version {COLUMNAR_VERSION} columnar file.")
+        arrays = []
+        for typecode, length in zip(header["typecodes"], header["lengths"]):
+            values = array(typecode)
+            values.fromfile(file, length)
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            arrays.append(values)
+    simulation_informations = header["header"]
+    parser_class = CONTENT_REGISTRY.get_parser_class(simulation_informations['USER_DEFINED_CONTENT'])
+    sat_file_parser = parser_class.from_simulation_data(os.path.join(os.path.dirname(filepath), header["source"]),
+                                                        simulation_informations, header["precision"])
+    simulation_results = Simulation_Results([values.typecode for values in arrays[1:]])
+    simulation_results.epochs = Time_Axis()
+    simulation_results.epochs.start, simulation_results.epochs.step, simulation_results.epochs.count = header["time_axis"]
+    if arrays[0]:
+        simulation_results.epochs.epochs = arrays[0]
+    simulation_results.columns = arrays[1:]
+    simulation_data = sat_file_parser.format_simulation_informations(dict(simulation_informations))
+    simulation_data['SIMULATION_RESULTS'] = simulation_results
+    sat_file_parser.simulation_data = simulation_data
+    return sat_file_parser
+
+def save_columnar_table(table : dict, filepath : str) -> str:
+    """
+    Writes a table of named columns in a binary columnar file: the arrays
+    with their own typecode, and the columns of strings in the JSON header.
+
+    Parameters
+    ----------
+    table : dict
+        {'run': ['run_1', 'run_2'], 'min altitude (km)': array('d', [601.6, 598.2])}
+    filepath : str
+        sweep.cols
+
+    Returns
+    -------
+    str
+        sweep.cols
+
+    """
+    arrays = [values for values in table.values() if isinstance(values, array)]
+    header = {"version" : COLUMNAR_VERSION, "byteorder" : sys.byteorder, "columns" : list(table),
+              "typecodes" : [values.typecode if isinstance(values, array) else None for values in table.values()],
+              "lengths" : [len(values) for values in arrays],
+              "strings" : {name : list(values) for name, values in table.items() if not isinstance(values, array)}}
+    temporary_filepath = filepath + ".tmp"
+    with open(temporary_filepath, "wb") as file:
+        file.write(json.dumps(header).encode() + b"\n")
+        for values in arrays:
+            values.tofile(file)
+    os.replace(temporary_filepath, filepath)
+    return filepath
+
+def load_columnar_table(filepath : str) -> dict:
+    """
+    Reads a file written by save_columnar_table.
+
+    Parameters
+    ----------
+    filepath : str
+        sweep.cols
+
+    Raises
+    ------
+    ValueError
+        The file must be a table of COLUMNAR_VERSION.
+
+    Returns
+    -------
+    dict
+        {'run': ['run_1', 'run_2'], 'min altitude (km)': array('d', [601.6, 598.2])}
+
+    """
+    with open(filepath, "rb") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != COLUMNAR_VERSION or "columns" not in header:
+            raise ValueError(f"{filepath} is not a version {COLUMNAR_VERSION} columnar table.")
+        table = {}
+        lengths = iter(header["lengths"])
+        for name, typecode in zip(header["columns"], header["typecodes"]):
+            if typecode is None:
+                table[name] = header["strings"][name]
+                continue
+            values = array(typecode)
+            values.fromfile(file, next(lengths))
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            table[name] = values
+    return table
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Constellations: the "sat" files of many satellites of one simu-cic run,
+loaded in parallel and stacked on a shared time axis.
+"""
+import datetime as dt
+import heapq
+import math
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from simu_cic_file_manager import CONTENT_REGISTRY, Simulation_Run, Simu_Cic_Info_File_Parser, \
+    Time_Axis, get_sat_filepaths, set_datetime_to_epoch
+
+def load_parser(parser_class : type, filepath : str):
+    return parser_class(filepath)
+
+def get_time_axis_signature(time_axis : Time_Axis) -> tuple:
+    if time_axis.is_regular():
+        return (time_axis.start, time_axis.step, len(time_axis))
+    return (time_axis.epochs.tobytes(),)
+
+class Stacked_Column():
+    
+    def __init__(self, object_names : list, time_axis : Time_Axis, values : array) -> None:
+        """
+        One column of every satellite of a constellation on a shared time
+        axis, stored time-major in one flat typed array: the values of all
+        the satellites at the i-th date are values[i * n : (i + 1) * n].
+        Dates where a satellite has no sample hold NaN.
+
+        Parameters
+        ----------
+        object_names : list
+            ['Sat_1', 'Sat_2']
+        time_axis : Time_Axis
+            Time_Axis shared by the satellites.
+        values : array
+            array('B', [1, 0, 1, 1, ...])
+
+        Returns
+        -------
+        None
+
+        """
+        self.object_names = list(object_names)
+        self.time_axis = time_axis
+        self.values = values
+    
+    def get_index(self, date : dt.datetime) -> int:
+        index = self.time_axis.find(set_datetime_to_epoch(date))
+        if index < 0:
+            raise ValueError(f"There is no simulation result at {date}.")
+        return index
+    
+    def get_values_at(self, date : dt.datetime) -> array:
+        count = len(self.object_names)
+        index = self.get_index(date)
+        return self.values[index * count:(index + 1) * count]
+    
+    def get_series(self, object_name : str) -> array:
+        return self.values[self.object_names.index(object_name)::len(self.object_names)]
+    
+    def get_object_names_where(self, date : dt.datetime, function = bool) -> list:
+        """
+        Satellites whose value at the given date satisfies function.
+
+        Parameters
+        ----------
+        date : dt.datetime
+            dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)
+        function : callable, optional
+            lambda elevation : elevation > 10. The default is bool, NaN
+            (no sample) being always excluded.
+
+        Returns
+        -------
+        list
+            ['Sat_1']
+
+        """
+        return [object_name for object_name, value in zip(self.object_names, self.get_values_at(date))
+                if value == value and function(value)]
+
+class Constellation():
+    
+    def __init__(self, dirpath : str, object_names : list = None) -> None:
+        """
+        This class aims at processing the outputs of a simu-cic run with many
+        satellites, named <OBJECT_NAME>_<content>.txt. Each satellite is a
+        Simulation_Run; a content is loaded for all the satellites at once in
+        a process pool, and their identical time axes are deduplicated.
+
+        Parameters
+        ----------
+        dirpath : str
+            constellation
+        object_names : list, optional
+            ['Sat_1', 'Sat_2']. The default is every satellite found in dirpath.
+
+        Raises
+        ------
+        FileNotFoundError
+            dirpath should be an existing directory.
+
+        Returns
+        -------
+        None
+
+        """
+        if not os.path.isdir(dirpath):
+            raise FileNotFoundError(f"{dirpath} is not a directory.")
+        self.dirpath = str(dirpath)
+        filepaths = get_sat_filepaths(dirpath)
+        if object_names is None:
+            object_names = sorted(filepaths)
+        self.simulation_runs = {object_name : Simulation_Run(dirpath, object_name, filepaths.get(object_name, {}))
+                                for object_name in object_names}
+        self.stacked_columns = {}
+        self.ground_stations = None
+        self.lock = threading.Lock()
+    
+    def get_object_names(self) -> list:
+        return list(self.simulation_runs)
+    
+    def get_simulation_run(self, object_name : str) -> Simulation_Run:
+        return self.simulation_runs[object_name]
+    
+    def load(self, content : str, max_workers : int = None) -> dict:
+        """
+        Parses the given content for every satellite, the files not parsed
+        yet being dispatched to a pool of max_workers processes.
+
+        Parameters
+        ----------
+        content : str
+            GEOMETRICAL_VISIBILITY_GROUND_STATION_1
+        max_workers : int, optional
+            4. The default is the number of processors, 1 parses the files in
+            the current process.
+
+        Returns
+        -------
+        dict
+            {'Sat_1': Sat_Visibility(...), 'Sat_2': Sat_Visibility(...)}
+
+        """
+        parser_class = CONTENT_REGISTRY.get_parser_class(content)
+        parsers = {}
+        pending = {}
+        for object_name, simulation_run in self.simulation_runs.items():
+            with simulation_run.lock:
+                parser = simulation_run.parsers.get((content, None, None))
+            if parser is not None:
+                parsers[object_name] = parser
+            else:
+                pending[object_name] = simulation_run.get_filepath(content)
+        if max_workers == 1 or len(pending) <= 1:
+            loaded = {object_name : load_parser(parser_class, filepath) for object_name, filepath in pending.items()}
+        else:
+            with ProcessPoolExecutor(max_workers = max_workers) as executor:
+                futures = {object_name : executor.submit(load_parser, parser_class, filepath)
+                           for object_name, filepath in pending.items()}
+                loaded = {object_name : future.result() for object_name, future in futures.items()}
+        for object_name, parser in loaded.items():
+            simulation_run = self.simulation_runs[object_name]
+            with simulation_run.lock:
+                parsers[object_name] = simulation_run.parsers.setdefault((content, None, None), parser)
+        self.share_time_axes(parsers.values())
+        return {object_name : parsers[object_name] for object_name in self.simulation_runs}
+    
+    def share_time_axes(self, parsers) -> int:
+        """
+        Makes the parsers with identical time axes share one Time_Axis object.
+        The frozen results keep their own axis, which cannot be replaced.
+
+        Returns
+        -------
+        int
+            1, the number of distinct time axes.
+
+        """
+        time_axes = {}
+        for parser in parsers:
+            results = parser.get_results()
+            if results.is_frozen():
+                time_axes.setdefault(get_time_axis_signature(results.epochs), results.epochs)
+                continue
+            results.epochs = time_axes.setdefault(get_time_axis_signature(results.epochs), results.epochs)
+        return len(time_axes)
+    
+    def get_stacked_column(self, content : str, index : int = 1, max_workers : int = None) -> Stacked_Column:
+        """
+        Stacks a column of every satellite on a shared time axis, once per
+        content and index: the stack is kept like the parsers it is built from.
+
+        Parameters
+        ----------
+        content : str
+            GEOMETRICAL_VISIBILITY_GROUND_STATION_1
+        index : int, optional
+            1, the column index as in get_results()[i][1].
+        max_workers : int, optional
+            See load.
+
+        Returns
+        -------
+        Stacked_Column
+            ['Sat_1', 'Sat_2'], their shared Time_Axis and array('B', [1, 0, 1, 1, 1, 1]),
+            the values of the satellites at each date in turn.
+
+        """
+        key = (content, index)
+        with self.lock:
+            if key in self.stacked_columns:
+                return self.stacked_columns[key]
+        stacked_column = self.stack_column(self.load(content, max_workers), index)
+        with self.lock:
+            return self.stacked_columns.setdefault(key, stacked_column)
+    
+    def stack_column(self, parsers : dict, index : int) -> Stacked_Column:
+        object_names = list(parsers)
+        results = [parsers[object_name].get_results() for object_name in object_names]
+        columns = [result.get_column(index) for result in results]
+        count = len(object_names)
+        first = results[0].epochs
+        if all(result.epochs is first for result in results):
+            # The widest typecode, a column widened to doubles while parsing
+            # (see Simulation_Results.append_integer) turning the others to doubles.
+            typecodes = {column.typecode for column in columns}
+            typecode = typecodes.pop() if len(typecodes) == 1 else 'd'
+            values = array(typecode, bytes(array(typecode).itemsize * count * len(first)))
+            for position, column in enumerate(columns):
+                if column.typecode != values.typecode:
+                    column = array(values.typecode, column)
+                values[position::count] = column
+            return Stacked_Column(object_names, first, values)
+        time_axis = Time_Axis()
+        for epoch in heapq.merge(*[result.epochs for result in results]):
+            if not len(time_axis) or epoch != time_axis[-1]:
+                time_axis.append(epoch)
+        values = array('d', [math.nan]) * (count * len(time_axis))
+        for position, (result, column) in enumerate(zip(results, columns)):
+            for epoch, value in zip(result.epochs, column):
+                values[time_axis.find(epoch) * count + position] = value
+        return Stacked_Column(object_names, time_axis, values)
+    
+    def get_ground_stations(self) -> dict:
+        """
+        Ground stations of simu_cic_info.txt, parsed on first access.
+
+        Returns
+        -------
+        dict
+            {'1': 'Grasse', '2': 'Paris'}
+
+        """
+        if self.ground_stations is None:
+            filepath = os.path.join(self.dirpath, "simu_cic_info.txt")
+            self.ground_stations = Simu_Cic_Info_File_Parser(filepath).get_ground_stations()
+        return self.ground_stations
+    
+    def get_station_number(self, station) -> int:
+        if isinstance(station, int):
+            return station
+        stations = self.get_ground_stations()
+        for number, name in stations.items():
+            if name.lower() == station.lower():
+                return int(number)
+        raise ValueError(f"{station} is not a station of the run ({list(stations.values())}).")
+    
+    def get_visible_object_names(self, date : dt.datetime, station = 1, max_workers : int = None) -> list:
+        """
+        Satellites visible from a ground station at the given date.
+
+        Parameters
+        ----------
+        date : dt.datetime
+            dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)
+        station : int or str, optional
+            1 or "Grasse", a station name being looked up in simu_cic_info.txt.
+        max_workers : int, optional
+            See load.
+
+        Returns
+        -------
+        list
+            ['Sat_1', 'Sat_2']
+
+        """
+        content = f"GEOMETRICAL_VISIBILITY_GROUND_STATION_{self.get_station_number(station)}"
+        return self.get_stacked_column(content, max_workers = max_workers).get_object_names_where(date)
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Run-to-run differences of "sat" files of the same content, aligned on time
+and streamed by chunks, with summary metrics for parameter sweeps.
+"""
+import math
+import operator
+from array import array
+from collections import Counter
+from datetime import timedelta
+
+from simu_cic_file_manager import CONTENT_REGISTRY, MJD_EPOCH, File, Sat_File_Parser, Simulation_Results
+from simu_cic_integrity import read_header
+from simu_cic_interpolation import COLUMN_PERIODS
+
+CHUNK_SIZE = 65536
+
+# Length of the first block of epochs compared at once after a mismatch,
+# doubled after each identical block.
+MIN_BLOCK_SIZE = 64
+
+def iter_parser_chunks(sat_file_parser : Sat_File_Parser, chunk_size : int = CHUNK_SIZE):
+    """
+    Yields the epochs and the value columns of a parsed file by chunks of
+    chunk_size rows.
+    """
+    results = sat_file_parser.get_results()
+    for first in range(0, len(results), chunk_size):
+        last = first + chunk_size
+        yield results.epochs[first:last], [column[first:last] for column in results.columns]
+
+def iter_file_chunks(filepath : str, chunk_size : int = CHUNK_SIZE):
+    """
+    Reads a "sat" file by chunks of chunk_size rows, so that only one chunk
+    is held in memory.
+
+    Parameters
+    ----------
+    filepath : str
+        Sat_SATELLITE_ALTITUDE.txt, optionally compressed.
+    chunk_size : int, optional
+        65536
+
+    Yields
+    ------
+    tuple
+        (array('q', [5132938620000000, ...]), [array('d', [601.674, ...])])
+
+    """
+    with File(filepath).open_text() as file:
+        content_type = CONTENT_REGISTRY.get(read_header(file).get('USER_DEFINED_CONTENT', ''))
+        typecodes = content_type.get_typecodes() if content_type is not None else None
+        simulation_results = Simulation_Results(typecodes)
+        for line in file:
+            simulation_result = line.split()
+            if simulation_result:
+                simulation_results.append(simulation_result)
+                if len(simulation_results) >= chunk_size:
+                    yield simulation_results.epochs[:], simulation_results.columns
+                    simulation_results = Simulation_Results(typecodes)
+        if len(simulation_results):
+            yield simulation_results.epochs[:], simulation_results.columns
+
+def get_extended(column : array, values : array) -> array:
+    """
+    Extends a column with values, both being widened to doubles when their
+    typecodes differ (an integer column widened in a later chunk).
+    """
+    if column.typecode != values.typecode:
+        column, values = array('d', column), array('d', values)
+    column.extend(values)
+    return column
+
+class Chunk_Cursor():
+    
+    def __init__(self, chunks) -> None:
+        """
+        Position in a stream of (epochs, columns) chunks.
+        """
+        self.chunks = iter(chunks)
+        self.epochs = array('q')
+        self.columns = []
+        self.index = 0
+        self.load()
+    
+    def load(self) -> bool:
+        while self.index >= len(self.epochs):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                return False
+            self.epochs, self.columns = chunk
+            self.index = 0
+        return True
+    
+    def get_remaining(self) -> int:
+        count = len(self.epochs) - self.index
+        for epochs, _ in self.chunks:
+            count += len(epochs)
+        self.index = len(self.epochs)
+        return count
+
+class Column_Difference():
+    
+    def __init__(self, name : str, period : float = None) -> None:
+        """
+        Running summary of the differences b - a of one column, the
+        differences of periodic columns (see COLUMN_PERIODS) being wrapped
+        into [-period / 2, period / 2).
+        """
+        self.name = name
+        self.period = period
+        self.count = 0
+        self.sum = 0.0
+        self.sum_absolute = 0.0
+        self.sum_squares = 0.0
+        self.sum_a = 0.0
+        self.sum_b = 0.0
+        self.max_absolute = -math.inf
+        self.max_absolute_epoch = None
+    
+    def update(self, epochs : array, values_a : array, values_b : array) -> array:
+        differences = array('d', map(operator.sub, values_b, values_a))
+        if self.period:
+            period, half_period = self.period, self.period / 2
+            differences = array('d', [(difference + half_period) % period - half_period for difference in differences])
+        absolutes = array('d', map(abs, differences))
+        if absolutes:
+            maximum = max(absolutes)
+            if maximum > self.max_absolute:
+                self.max_absolute = maximum
+                self.max_absolute_epoch = epochs[absolutes.index(maximum)]
+        self.count += len(differences)
+        self.sum += math.fsum(differences)
+        self.sum_absolute += math.fsum(absolutes)
+        self.sum_squares += math.fsum(map(operator.mul, differences, differences))
+        self.sum_a += math.fsum(values_a)
+        self.sum_b += math.fsum(values_b)
+        return differences
+    
+    def get_metrics(self, step : int) -> dict:
+        """
+        Summary metrics, the integral of the differences over time being
+        their sum times the sampling step.
+
+        Parameters
+        ----------
+        step : int
+            10000000, the sampling step in microseconds.
+
+        Returns
+        -------
+        dict
+            {'count': 3, 'mean': 0.01, 'mean_absolute': 0.01, 'rms': 0.01, 'max_absolute': 0.02,
+             'max_absolute_date': dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc),
+             'mean_a': 601.74, 'mean_b': 601.75, 'integral_difference': 0.3}, the
+            integral being in value x seconds (seconds of visibility gained
+            for station_visibility).
+
+        """
+        count = self.count or math.nan
+        return {"count" : self.count, "mean" : self.sum / count, "mean_absolute" : self.sum_absolute / count,
+                "rms" : math.sqrt(self.sum_squares / count), "max_absolute" : self.max_absolute if self.count else math.nan,
+                "max_absolute_date" : None if self.max_absolute_epoch is None else
+                    MJD_EPOCH + timedelta(microseconds = self.max_absolute_epoch),
+                "mean_a" : self.sum_a / count, "mean_b" : self.sum_b / count,
+                "integral_difference" : self.sum * step / 1e6}
+
+class Run_Difference():
+    
+    def __init__(self, source_a, source_b, chunk_size : int = CHUNK_SIZE) -> None:
+        """
+        This class aims at comparing the outputs of two simu-cic runs, such
+        as two points of a parameter sweep. The samples of the two sources
+        are aligned on their common epochs by a merge of their time axes,
+        comparing whole blocks of epochs at once while they are identical,
+        and the differences b - a are computed chunk by chunk: files given by
+        their path are streamed and never held entirely in memory.
+
+        Parameters
+        ----------
+        source_a : Sat_File_Parser or str
+            Sat_Altitude(run_1/Sat_SATELLITE_ALTITUDE.txt) or run_1/Sat_SATELLITE_ALTITUDE.txt
+        source_b : Sat_File_Parser or str
+            run_2/Sat_SATELLITE_ALTITUDE.txt.gz
+        chunk_size : int, optional
+            65536, the number of rows of the chunks read and yielded.
+
+        Raises
+        ------
+        ValueError
+            The sources must be of the same registered USER_DEFINED_CONTENT.
+
+        Returns
+        -------
+        None
+
+        """
+        contents = [self.get_user_defined_content(source) for source in (source_a, source_b)]
+        if contents[0] != contents[1]:
+            raise ValueError(f"Cannot compare {contents[0]} with {contents[1]}.")
+        content_type = CONTENT_REGISTRY.get(contents[0])
+        if content_type is None:
+            raise ValueError(f"USER_DEFINED_CONTENT {contents[0]!r} must be one of {CONTENT_REGISTRY.get_names()}.")
+        self.user_defined_content = contents[0]
+        self.sources = (source_a, source_b)
+        self.chunk_size = chunk_size
+        self.column_differences = [Column_Difference(name, COLUMN_PERIODS.get(name)) for name in content_type.column_names]
+        self.only_a = 0
+        self.only_b = 0
+        self.deltas = Counter()
+        self.done = False
+    
+    def get_user_defined_content(self, source) -> str:
+        if isinstance(source, Sat_File_Parser):
+            return source.get_user_defined_content()
+        identity = CONTENT_REGISTRY.identify(source)
+        return identity[1] if identity is not None else None
+    
+    def iter_chunks(self, source):
+        if isinstance(source, Sat_File_Parser):
+            return iter_parser_chunks(source, self.chunk_size)
+        return iter_file_chunks(source, self.chunk_size)
+    
+    def iter_aligned(self):
+        """
+        Yields the samples of the epochs of both sources by chunks of about
+        chunk_size rows, counting the samples of a single source.
+
+        Yields
+        ------
+        tuple
+            (array('q', epochs), [array columns of a], [array columns of b])
+
+        """
+        cursor_a, cursor_b = Chunk_Cursor(self.iter_chunks(self.sources[0])), Chunk_Cursor(self.iter_chunks(self.sources[1]))
+        epochs = array('q')
+        columns_a = [array(column.typecode) for column in cursor_a.columns]
+        columns_b = [array(column.typecode) for column in cursor_b.columns]
+        block_size = MIN_BLOCK_SIZE
+        while cursor_a.load() and cursor_b.load():
+            epochs_a, epochs_b, index_a, index_b = cursor_a.epochs, cursor_b.epochs, cursor_a.index, cursor_b.index
+            count = min(len(epochs_a) - index_a, len(epochs_b) - index_b, block_size)
+            block = epochs_a[index_a:index_a + count]
+            if block == epochs_b[index_b:index_b + count]:
+                epochs.extend(block)
+                columns_a = [get_extended(column, values[index_a:index_a + count])
+                             for column, values in zip(columns_a, cursor_a.columns)]
+                columns_b = [get_extended(column, values[index_b:index_b + count])
+                             for column, values in zip(columns_b, cursor_b.columns)]
+                cursor_a.index += count
+                cursor_b.index += count
+                block_size = min(2 * block_size, self.chunk_size)
+            else:
+                block_size = MIN_BLOCK_SIZE
+                indexes_a, indexes_b = [], []
+                last_a, last_b = index_a + count, index_b + count
+                while index_a < last_a and index_b < last_b:
+                    epoch_a, epoch_b = epochs_a[index_a], epochs_b[index_b]
+                    if epoch_a == epoch_b:
+                        indexes_a.append(index_a)
+                        indexes_b.append(index_b)
+                        index_a += 1
+                        index_b += 1
+                    elif epoch_a < epoch_b:
+                        self.only_a += 1
+                        index_a += 1
+                    else:
+                        self.only_b += 1
+                        index_b += 1
+                epochs.extend([epochs_a[index] for index in indexes_a])
+                columns_a = [get_extended(column, array(values.typecode, [values[index] for index in indexes_a]))
+                             for column, values in zip(columns_a, cursor_a.columns)]
+                columns_b = [get_extended(column, array(values.typecode, [values[index] for index in indexes_b]))
+                             for column, values in zip(columns_b, cursor_b.columns)]
+                cursor_a.index, cursor_b.index = index_a, index_b
+            if len(epochs) >= self.chunk_size:
+                yield epochs, columns_a, columns_b
+                epochs = array('q')
+                columns_a = [array(column.typecode) for column in columns_a]
+                columns_b = [array(column.typecode) for column in columns_b]
+        self.only_a += cursor_a.get_remaining()
+        self.only_b += cursor_b.get_remaining()
+        if epochs:
+            yield epochs, columns_a, columns_b
+    
+    def iter_differences(self):
+        """
+        Yields the differences b - a of every column on the common epochs,
+        chunk by chunk, while updating the summary metrics.
+
+        Yields
+        ------
+        tuple
+            (array('q', [5132938620000000, ...]), [array('d', [0.012, ...])])
+
+        """
+        if self.done:
+            raise ValueError("The differences were already computed, see get_summary.")
+        self.done = True
+        previous_epoch = None
+        for epochs, columns_a, columns_b in self.iter_aligned():
+            if previous_epoch is not None:
+                self.deltas[epochs[0] - previous_epoch] += 1
+            self.deltas.update(map(operator.sub, epochs[1:], epochs[:-1]))
+            previous_epoch = epochs[-1]
+            yield epochs, [column_difference.update(epochs, values_a, values_b) for column_difference, values_a, values_b
+                           in zip(self.column_differences, columns_a, columns_b)]
+    
+    def get_step(self) -> int:
+        if not self.deltas:
+            return 0
+        return min(self.deltas, key = lambda delta : (-self.deltas[delta], delta))
+    
+    def get_summary(self) -> dict:
+        """
+        Summary of the comparison, computing the differences first if they
+        were not iterated over.
+
+        Returns
+        -------
+        dict
+            {'user_defined_content': 'SATELLITE_ALTITUDE', 'aligned': 3, 'only_a': 0, 'only_b': 1,
+             'step': 10000000, 'columns': {'altitude (km)': {'count': 3, 'mean': 0.01, ...}}},
+            see Column_Difference.get_metrics.
+
+        """
+        if not self.done:
+            for _ in self.iter_differences():
+                pass
+        step = self.get_step()
+        return {"user_defined_content" : self.user_defined_content,
+                "aligned" : self.column_differences[0].count if self.column_differences else 0,
+                "only_a" : self.only_a, "only_b" : self.only_b, "step" : step,
+                "columns" : {column_difference.name : column_difference.get_metrics(step)
+                             for column_difference in self.column_differences}}
+
+def diff(source_a, source_b, chunk_size : int = CHUNK_SIZE) -> dict:
+    """
+    Summary of the differences b - a of two sources, see Run_Difference.
+
+    Parameters
+    ----------
+    source_a : Sat_File_Parser or str
+        run_1/Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt
+    source_b : Sat_File_Parser or str
+        run_2/Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt
+
+    Returns
+    -------
+    dict
+        {'user_defined_content': 'GEOMETRICAL_VISIBILITY_GROUND_STATION_1', ...,
+         'columns': {'station_visibility': {..., 'integral_difference': 120.0}}},
+        two more minutes of visibility in run_2.
+
+    """
+    return Run_Difference(source_a, source_b, chunk_size).get_summary()
@@ -5,19 +5,33 @@ Created on Wed Mar  8 14:02:29 2023
 @author: Sacha
 """
 import _io
+import bz2
 import datetime as dt
+import gzip
+import io
+import lzma
 import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import compress
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from types import MappingProxyType
 
 from datetime import datetime, timedelta, timezone
 
+COMPRESSION_SUFFIXES = [".gz", ".xz", ".bz2", ".zst"]
+
 class File():
     
     def __init__(self, filepath : str) -> None:
         """
         This class aims at ensuring the validity of a given filepath as while
-        enabling one to easily extract information related to the said filepath
+        enabling one to easily extract information related to the said filepath.
+        Files compressed with gzip, xz, bzip2 or zstandard are accepted as well
+        (Sat_ORBIT_NUMBER.txt.gz) and are decompressed on the fly when read.
 
         Parameters
         ----------
@@ -31,7 +45,8 @@ class File():
             - filepath cannot be empty or consist only of whitespace characters.
         TypeError
             - filepath must be a string.
-            - extension must be '.txt'.
+            - extension must be '.txt', optionally followed by a compression
+              suffix in {COMPRESSION_SUFFIXES}.
         FileNotFoundError
             - filepath should exists
 
@@ -48,8 +63,9 @@ class File():
             raise ValueError("filepath cannot consist only of whitespace characters.")
         elif any(ord(character) >= 128 for character in filepath):
             raise TypeError("filepath cannot contain non-ASCII characters.")
-        elif Path(filepath).suffix != ".txt":
-            raise ValueError("filepath extension must be '.txt'.")
+        elif Path(filepath).suffix.lower() != ".txt" and \
+            not (Path(filepath).suffix in COMPRESSION_SUFFIXES and Path(Path(filepath).stem).suffix.lower() == ".txt"):
+            raise ValueError(f"filepath extension must be '.txt' or '.txt' followed by one of {COMPRESSION_SUFFIXES}.")
         elif not os.path.exists(filepath):
             raise FileNotFoundError(f"{filepath} is missing from {os.getcwd()}.")
         self.filepath = str(filepath)
@@ -63,6 +79,82 @@ class File():
     def get_extension(self) -> str:
         return Path(self.filepath).suffix
 
+    def get_compression(self) -> str:
+        """
+        Returns the compression suffix of the file, if any.
+
+        Returns
+        -------
+        str
+            '.gz' for Sat_ORBIT_NUMBER.txt.gz, None for Sat_ORBIT_NUMBER.txt
+
+        """
+        extension = self.get_extension()
+        return extension if extension in COMPRESSION_SUFFIXES else None
+    
+    def get_uncompressed_basename(self) -> str:
+        """
+        Returns the basename of the file without its compression suffix.
+
+        Returns
+        -------
+        str
+            'Sat_ORBIT_NUMBER.txt' for Sat_ORBIT_NUMBER.txt.gz
+
+        """
+        basename = self.get_basename()
+        if self.get_compression() is not None:
+            basename = Path(basename).stem
+        return basename
+    
+    def open_text(self, encoding : str = None) -> io.TextIOBase:
+        """
+        Opens the file as a text stream. Compressed files are decompressed in
+        a streaming fashion while being read, so that only the compressed
+        bytes are transferred from the storage.
+
+        Parameters
+        ----------
+        encoding : str, optional
+            "latin-1". The default is the locale encoding.
+
+        Raises
+        ------
+        ImportError
+            Reading '.zst' files requires the zstandard package (or Python 3.14+).
+
+        Returns
+        -------
+        io.TextIOBase
+            Text stream over the (decompressed) content of the file.
+
+        """
+        compression = self.get_compression()
+        if compression == ".gz":
+            return gzip.open(self.filepath, "rt", encoding = encoding)
+        if compression == ".xz":
+            return lzma.open(self.filepath, "rt", encoding = encoding)
+        if compression == ".bz2":
+            return bz2.open(self.filepath, "rt", encoding = encoding)
+        if compression == ".zst":
+            try:
+                from compression import zstd
+                return zstd.open(self.filepath, "rt", encoding = encoding)
+            except ImportError:
+                pass
+            try:
+                import zstandard
+            except ImportError as error:
+                raise ImportError("Reading '.zst' files requires the zstandard package.") from error
+            binary_file = open(self.filepath, "rb")
+            try:
+                return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(binary_file, read_across_frames = True, closefd = True), 
+                                        encoding = encoding)
+            except BaseException:
+                binary_file.close()
+                raise
+        return open(self.filepath, encoding = encoding)
+
 VALID_FILENAMES = ["Sat_DISTANCE_GROUND_STATION_1.txt", "Sat_DISTANCE_GROUND_STATION_2.txt",
                    "Sat_ORBIT_NUMBER.txt", "Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt",
                    "Sat_SATELLITE_DIRECTION-GROUND_STATION_2_FRAME.txt",
@@ -71,6 +163,36 @@ VALID_FILENAMES = ["Sat_DISTANCE_GROUND_STATION_1.txt", "Sat_DISTANCE_GROUND_STA
                    "Sat_GEOGRAPHICAL_COORDINATES.txt",
                    "Sat_SATELLITE_ALTITUDE.txt"]
 
+def sniff_header(filepath : str, max_lines : int = 64) -> dict:
+    """
+    Reads the "KEY = VALUE" lines of the header of a file, up to META_STOP
+    and at most max_lines lines, without reading the simulation results.
+
+    Parameters
+    ----------
+    filepath : str
+        renamed.txt.gz
+    max_lines : int, optional
+        64, so that sniffing a file which is not a "sat" file stays cheap.
+
+    Returns
+    -------
+    dict
+        {'CIC_MEM_VERS': '2.0', ..., 'OBJECT_NAME': 'Sat', 
+         'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_1', ...}
+
+    """
+    header = {}
+    with File(filepath).open_text(encoding = "latin-1") as file:
+        for _, line in zip(range(max_lines), file):
+            line = line.strip()
+            if line == 'META_STOP':
+                break
+            key, separator, value = line.partition(' = ')
+            if separator:
+                header[key.strip()] = value.strip()
+    return header
+
 class Stations_Ref_File_Parser(File): 
     
     def __init__(self, filepath : str) -> None:
@@ -94,40 +216,143 @@ class Stations_Ref_File_Parser(File):
 
         """
         super().__init__(filepath)
-        if self.get_basename() != "Stations_ref.txt":
+        if self.get_uncompressed_basename() != "Stations_ref.txt":
             raise ValueError("The filename must be Stations_ref.txt.")
+        with self.open_text(encoding = "latin-1") as file:
+            self.ground_stations_records = self.get_ground_stations_records(file)
         self.ground_stations_data = self.get_ground_stations_data()
+        self.ground_stations_keys = self.get_ground_stations_keys()
+        self.station_table = None
+    
+    def get_ground_stations_records(self, file : _io.TextIOWrapper) -> list:
+        """
+        Extracts every field of the stations of the file, blank lines and
+        lines starting with '#' being ignored. The optional fields absent
+        from a line (or given as %nan) are "" for the mnemonic, 0.0 for the
+        minimum elevation and NaN for the others.
+
+        Parameters
+        ----------
+        file : _io.TextIOWrapper
+            Stations_ref.txt, opened with the latin-1 encoding.
+
+        Returns
+        -------
+        list
+            [{'name': 'Paris', 'longitude': 2.351, 'latitude': 48.856, 'altitude': 30.0,
+              'mnemonic': 'PAR', 'min_elevation': 0.0, 'reconfiguration_time': nan,
+              'conjunction_angle': nan}]
+
+        """
+        ground_stations_records = []
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) < 5:
+                continue
+            fields += [""] * (8 - len(fields))
+            optional = [float("nan") if field in ("", "%nan") else float(field) for field in fields[6:8]]
+            ground_stations_records.append({"name" : fields[0],
+                                            "longitude" : float(fields[1]),
+                                            "latitude" : float(fields[2]),
+                                            "altitude" : float(fields[3]),
+                                            "mnemonic" : fields[4],
+                                            "min_elevation" : float(fields[5]) if fields[5] else 0.0,
+                                            "reconfiguration_time" : optional[0],
+                                            "conjunction_angle" : optional[1]})
+        return ground_stations_records
             
     def get_ground_stations_informations(self, file : _io.TextIOWrapper) -> dict:
+        return self.set_records_to_informations(self.get_ground_stations_records(file))
+    
+    def set_records_to_informations(self, ground_stations_records : list) -> dict:
         ground_stations_informations = {}
-        line = file.readline()
-        while len(line) > 0:
-            line = line.strip()
-            line = line.split(', ')
-            if len(line) >= 5:
-                ground_stations_informations[line[0]] = {"name" : line[0],
-                                                        "longitude" : float(line[1]),
-                                                        "latitude" : float(line[2]),
-                                                        "altitude" : float(line[3])}
-            line = file.readline()
+        for record in ground_stations_records:
+            ground_stations_informations[record["name"]] = {"name" : record["name"],
+                                                            "longitude" : record["longitude"],
+                                                            "latitude" : record["latitude"],
+                                                            "altitude" : record["altitude"]}
         return ground_stations_informations
             
     def get_ground_stations_data(self):
-        with open(self.filepath) as file:   
-            ground_stations_data = self.get_ground_stations_informations(file)
-        return ground_stations_data
+        return self.set_records_to_informations(self.ground_stations_records)
+    
+    def get_ground_stations_keys(self) -> dict:
+        """
+        Case-insensitive index of the stations by name, then by mnemonic.
+
+        Returns
+        -------
+        dict
+            {'grasse': 'Grasse', 'paris': 'Paris', 'par': 'Paris'}
+
+        """
+        keys = {record["name"].casefold() : record["name"] for record in self.ground_stations_records}
+        for record in self.ground_stations_records:
+            if record["mnemonic"]:
+                keys.setdefault(record["mnemonic"].casefold(), record["name"])
+        return keys
+    
+    def get_ground_station_name(self, name : str) -> str:
+        """
+        Name of a station given its name or mnemonic, whatever the case.
+
+        Parameters
+        ----------
+        name : str
+            par
+
+        Raises
+        ------
+        KeyError
+            The station must be in the file.
+
+        Returns
+        -------
+        str
+            Paris
+
+        """
+        if name in self.ground_stations_data:
+            return name
+        try:
+            return self.ground_stations_keys[name.casefold()]
+        except KeyError:
+            raise KeyError(f"{name} is not a station of {self.filepath}.") from None
+    
+    def get_station_table(self):
+        """
+        Array-backed table of every field of the stations, with their ECEF
+        positions and ENU rotations (see simu_cic_geometry.Station_Table),
+        built on first call.
+
+        Returns
+        -------
+        Station_Table
+            Station_Table(2 stations)
+
+        """
+        if self.station_table is None:
+            from simu_cic_geometry import Station_Table
+            self.station_table = Station_Table(self.ground_stations_records)
+        return self.station_table
         
     def get_ground_station(self, name):
-        return self.ground_stations_data[name]
+        return self.ground_stations_data[self.get_ground_station_name(name)]
     
     def get_ground_station_longitude(self, name):
-        return self.ground_stations_data[name]["longitude"]
+        return self.get_ground_station(name)["longitude"]
     
     def get_ground_station_latitude(self, name):
-        return self.ground_stations_data[name]["latitude"]
+        return self.get_ground_station(name)["latitude"]
     
     def get_ground_station_altitude(self, name):
-        return self.ground_stations_data[name]["altitude"]
+        return self.get_ground_station(name)["altitude"]
+    
+    def get_ground_station_min_elevation(self, name):
+        return self.get_station_table().get_station(name)["min_elevation"]
 
 class Simu_Cic_Info_File_Parser(File):
     
@@ -152,12 +377,12 @@ class Simu_Cic_Info_File_Parser(File):
 
         """
         super().__init__(filepath)
-        if self.get_basename() != "simu_cic_info.txt":
+        if self.get_uncompressed_basename() != "simu_cic_info.txt":
             raise ValueError("The filename must be simu_cic_info.txt.")
         self.simulation_data = self.get_simulation_data()
     
     def get_simulation_data(self) -> dict:
-        with open(self.filepath) as file:            
+        with self.open_text() as file:            
             simulation_informations = self.get_simulation_informations(file)
             simulation_data = self.format_simulation_informations(simulation_informations)
             simulation_data["Initial conditions"]["Altitude (km)"] = float(simulation_data["Initial conditions"]["Altitude (km)"])
@@ -204,60 +429,937 @@ class Simu_Cic_Info_File_Parser(File):
 
         Returns
         -------
-        dt.datetime
-            dt.datetime(2021, 6, 22, 0, 0)
+        dt.datetime
+            dt.datetime(2021, 6, 22, 0, 0)
+
+        """
+        return dt.datetime.strptime(str_date, '%Y/%m/%d %H:%M:%S.%f')
+    
+    def get_simulation_synthesis(self):
+        return self.simulation_data["Simulation synthesis"]
+    
+    def get_simulation_name(self):
+        return self.simulation_data["Simulation synthesis"]["Simulation name"]
+    
+    def get_simulation_start(self):
+        return self.simulation_data["Simulation synthesis"]["Start (UTC)"]
+    
+    def get_simulation_stop(self):
+        return self.simulation_data["Simulation synthesis"]["End (UTC)"]
+    
+    def get_satellite_name(self):
+        return self.simulation_data["Satellite 1"]["Name"]
+    
+    def get_initial_conditions(self):
+        return self.simulation_data["Initial conditions"]
+    
+    def get_initial_conditions_date(self):
+        return self.simulation_data["Initial conditions"]["Date (UTC)"]
+    
+    def get_initial_conditions_altitude(self):
+        return float(self.simulation_data["Initial conditions"]["Altitude (km)"])
+    
+    def get_initial_conditions_eccentricity(self):
+        return float(self.simulation_data["Initial conditions"]["Eccentricity"])
+    
+    def get_initial_conditions_inclination(self):
+        return float(self.simulation_data["Initial conditions"]["Inclination (deg)"])
+    
+    def get_initial_conditions_argument_of_perigee(self):
+        return float(self.simulation_data["Initial conditions"]["Argument of perigee (deg)"])
+    
+    def get_initial_conditions_mltan(self):
+        return float(self.simulation_data["Initial conditions"]["Mean local time of ascending node (h)"])
+    
+    def get_initial_conditions_argument_of_latitude(self):
+        return float(self.simulation_data["Initial conditions"]["Argument of latitude (deg)"])
+    
+    def get_initial_conditions_mean_j2_orbital_period(self):
+        return float(self.simulation_data["Initial conditions"]["Mean J2 orbital period (h)"])
+    
+    def get_ground_stations(self):
+        return self.simulation_data["Stations"]
+
+MJD_EPOCH = datetime(1858, 11, 17, tzinfo = timezone.utc)
+
+# Column names and array typecodes of each USER_DEFINED_CONTENT, the station
+# number being removed from the content (see get_content_type). Integer valued
+# contents are narrowed losslessly: 'B' (uint8) for visibilities and 'i'
+# (int32) for orbit numbers. Angles stay 'd' under the default precision: the
+# files give them with 5 decimals, and float32 spacing reaches 3.1e-5 deg
+# above 256 deg, so the written decimals could not be read back exactly.
+# precision = "single" stores them as float32 (see PRECISIONS).
+CONTENT_SCHEMAS = {"DISTANCE_GROUND_STATION" : [("distance (km)", 'd')],
+                   "ORBIT_NUMBER" : [("orbit number", 'i')],
+                   "SATELLITE_DIRECTION-GROUND_STATION_FRAME" : [("azimut (deg)", 'd'), ("elevation (deg)", 'd')],
+                   "SATELLITE_ALTITUDE" : [("altitude (km)", 'd')],
+                   "SATELLITE_ECLIPSE" : [("sun_eclipse_ratio (%)", 'd')],
+                   "GEOMETRICAL_VISIBILITY_GROUND_STATION" : [("station_visibility", 'B')],
+                   "GEOGRAPHICAL_COORDINATES" : [("longitude (deg)", 'd'), ("latitude (deg)", 'd')]}
+
+# "double" keeps the decimals of the files exactly. "single" stores the
+# floating point columns as float32, whose relative rounding error is below
+# 2**-24 (6e-8): at most 2.2e-5 deg on angles, 6e-6 % on eclipse ratios and
+# 3e-3 km on distances up to 50000 km.
+PRECISIONS = {"double" : 'd', "single" : 'f'}
+
+INTEGER_TYPECODES = "bBhHiIlLqQ"
+
+def get_content_type(user_defined_content : str) -> str:
+    """
+    Removes the station number from a USER_DEFINED_CONTENT.
+
+    Parameters
+    ----------
+    user_defined_content : str
+        SATELLITE_DIRECTION-GROUND_STATION_1_FRAME
+
+    Returns
+    -------
+    str
+        SATELLITE_DIRECTION-GROUND_STATION_FRAME
+
+    """
+    return re.sub(r'GROUND_STATION_\d+', 'GROUND_STATION', user_defined_content)
+
+class Content_Type():
+    
+    def __init__(self, name : str, schema : list, parser_class : type = None) -> None:
+        """
+        A USER_DEFINED_CONTENT of the "sat" files, GROUND_STATION standing for
+        GROUND_STATION_<number> in its name. The typecodes of each precision
+        and the pattern of the contents are compiled once at registration.
+
+        Parameters
+        ----------
+        name : str
+            SATELLITE_DIRECTION-GROUND_STATION_FRAME
+        schema : list
+            [("azimut (deg)", 'd'), ("elevation (deg)", 'd')]
+        parser_class : type, optional
+            Sat_Position
+
+        Returns
+        -------
+        None
+
+        """
+        self.name = name
+        self.schema = list(schema)
+        self.parser_class = parser_class
+        self.column_names = [column_name for column_name, _ in self.schema]
+        self.typecodes = {precision : [float_typecode if typecode == 'd' else typecode for _, typecode in self.schema]
+                          for precision, float_typecode in PRECISIONS.items()}
+        self.pattern = re.compile(re.escape(name).replace("GROUND_STATION", r"GROUND_STATION_(\d+)"), re.IGNORECASE)
+    
+    def match(self, user_defined_content : str) -> bool:
+        return self.pattern.fullmatch(user_defined_content) is not None
+    
+    def get_station(self, user_defined_content : str) -> int:
+        """
+        Ground station number of a content of this type.
+
+        Parameters
+        ----------
+        user_defined_content : str
+            SATELLITE_DIRECTION-GROUND_STATION_3_FRAME
+
+        Returns
+        -------
+        int
+            3, None for the contents without station.
+
+        """
+        match = self.pattern.fullmatch(user_defined_content)
+        if match is None or not match.groups():
+            return None
+        return int(match.group(1))
+    
+    def get_typecodes(self, precision : str = "double") -> list:
+        return list(self.typecodes[precision])
+    
+    def __repr__(self) -> str:
+        return f"Content_Type({self.name!r})"
+
+class Content_Registry():
+    
+    def __init__(self) -> None:
+        """
+        Registry of the USER_DEFINED_CONTENT of the "sat" files, which
+        dispatches a file to its Content_Type, and thus to its column schema
+        and parser class, from the content declared in its header rather than
+        from its filename. Any station number is accepted.
+
+        Returns
+        -------
+        None
+
+        """
+        self.content_types = {}
+    
+    def register(self, name : str, schema : list, parser_class : type = None) -> Content_Type:
+        """
+        Registers a content type, replacing any previous one of the same name.
+
+        Parameters
+        ----------
+        name : str
+            SATELLITE_DIRECTION-GROUND_STATION_FRAME
+        schema : list
+            [("azimut (deg)", 'd'), ("elevation (deg)", 'd')]
+        parser_class : type, optional
+            Sat_Position. The default is Sat_File_Parser.
+
+        Returns
+        -------
+        Content_Type
+            Content_Type('SATELLITE_DIRECTION-GROUND_STATION_FRAME')
+
+        """
+        content_type = Content_Type(name, schema, parser_class)
+        self.content_types[name] = content_type
+        return content_type
+    
+    def get(self, user_defined_content : str) -> Content_Type:
+        """
+        Content type of a USER_DEFINED_CONTENT.
+
+        Parameters
+        ----------
+        user_defined_content : str
+            DISTANCE_GROUND_STATION_3
+
+        Returns
+        -------
+        Content_Type
+            Content_Type('DISTANCE_GROUND_STATION'), None for an unknown content.
+
+        """
+        content_type = self.content_types.get(get_content_type(user_defined_content.upper()))
+        if content_type is None or not content_type.match(user_defined_content):
+            return None
+        return content_type
+    
+    def get_parser_class(self, user_defined_content : str) -> type:
+        content_type = self.get(user_defined_content)
+        if content_type is None:
+            raise KeyError(f"{user_defined_content} is not a registered content ({self.get_names()}).")
+        return content_type.parser_class or Sat_File_Parser
+    
+    def get_names(self) -> list:
+        return list(self.content_types)
+    
+    def identify(self, filepath : str) -> tuple:
+        """
+        OBJECT_NAME and USER_DEFINED_CONTENT of a "sat" file, sniffed from
+        its header. The object name is the filename prefix when the file is
+        named after its content, else the OBJECT_NAME of the header.
+
+        Parameters
+        ----------
+        filepath : str
+            simu/renamed.txt
+
+        Returns
+        -------
+        tuple
+            ('Sat', 'ORBIT_NUMBER'), None when the file is not a "sat" file
+            of a registered content.
+
+        """
+        header = sniff_header(filepath)
+        user_defined_content = header.get('USER_DEFINED_CONTENT', '')
+        if self.get(user_defined_content) is None:
+            return None
+        basename = File(filepath).get_uncompressed_basename()
+        suffix = "_" + user_defined_content + ".txt"
+        if basename.lower().endswith(suffix.lower()) and len(basename) > len(suffix):
+            return basename[:-len(suffix)], user_defined_content
+        return header.get('OBJECT_NAME'), user_defined_content
+    
+    def __contains__(self, user_defined_content : str) -> bool:
+        return self.get(user_defined_content) is not None
+    
+    def __len__(self) -> int:
+        return len(self.content_types)
+
+def set_datetime_to_epoch(date : dt.datetime) -> int:
+    """
+    Convert a datetime to microseconds since the MJD epoch, naive datetimes
+    being considered as UTC.
+
+    Parameters
+    ----------
+    date : dt.datetime
+        dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc)
+
+    Returns
+    -------
+    int
+        5132938620000000
+
+    """
+    if date.tzinfo is None:
+        date = date.replace(tzinfo = timezone.utc)
+    return (date - MJD_EPOCH) // timedelta(microseconds = 1)
+
+class Frozen_Array(array):
+    """
+    Read-only typed array of a frozen Simulation_Results: reading, slicing
+    and iterating run at the speed of array, while the methods and operators
+    modifying the array in place raise TypeError. Slices and copies are
+    plain arrays.
+    """
+    
+    def set_read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only.")
+    
+    append = extend = insert = pop = remove = reverse = byteswap = set_read_only
+    frombytes = fromfile = fromlist = fromunicode = set_read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = set_read_only
+
+class Derived_Cache():
+    
+    def __init__(self) -> None:
+        """
+        Values derived from frozen data, each computed once on first request.
+        Looking up a computed value takes no lock, so that many threads read
+        concurrently; a missing value is computed under the lock, the other
+        threads requesting it waiting for the first one.
+
+        Returns
+        -------
+        None
+
+        """
+        self.values = {}
+        self.lock = threading.RLock()
+    
+    def get(self, key, function):
+        """
+        Value of function() for the given key, computed on first request.
+
+        Parameters
+        ----------
+        key : hashable
+            ("interpolator", 1, "linear")
+        function : callable
+            lambda : Interpolator(sat_altitude)
+
+        Returns
+        -------
+        object
+            Interpolator(Sat_SATELLITE_ALTITUDE.txt)
+
+        """
+        try:
+            return self.values[key]
+        except KeyError:
+            pass
+        with self.lock:
+            if key not in self.values:
+                self.values[key] = function()
+            return self.values[key]
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __reduce__(self):
+        return (type(self), ())
+
+class Time_Axis():
+    
+    typecode = 'q'
+    itemsize = 8
+    
+    def __init__(self) -> None:
+        """
+        Time axis of a "sat" file, in microseconds since the MJD epoch. While
+        the dates are appended on a regular grid, only (start, step, count)
+        is stored and the epochs are implicit, so that the axis takes no
+        memory and date to index lookups are O(1). The first gap, duplicate
+        or backward date switches the axis to an explicit array('q') of
+        epochs, searched by bisection.
+
+        Returns
+        -------
+        None
+
+        """
+        self.start = None
+        self.step = None
+        self.count = 0
+        self.epochs = None
+    
+    def append(self, epoch : int) -> None:
+        if self.epochs is not None:
+            self.epochs.append(epoch)
+        elif self.count == 0:
+            self.start = epoch
+        elif self.count == 1 and epoch > self.start:
+            self.step = epoch - self.start
+        elif self.step is None or epoch != self.start + self.count * self.step:
+            self.epochs = array('q', iter(self))
+            self.epochs.append(epoch)
+        self.count += 1
+    
+    def is_regular(self) -> bool:
+        return self.epochs is None
+    
+    def get_nbytes(self) -> int:
+        return 0 if self.epochs is None else self.itemsize * len(self.epochs)
+    
+    def get_step(self) -> int:
+        """
+        Sampling step of the axis: the grid step of a regular axis, the
+        smallest positive difference between two consecutive epochs of an
+        explicit one (0 when there is none).
+
+        Returns
+        -------
+        int
+            10000000 (microseconds)
+
+        """
+        if self.epochs is None:
+            return self.step or 0
+        return min((b - a for a, b in zip(self.epochs, self.epochs[1:]) if b > a), default = 0)
+    
+    def find(self, epoch : int) -> int:
+        """
+        Index of the given epoch.
+
+        Parameters
+        ----------
+        epoch : int
+            5132938630000000
+
+        Returns
+        -------
+        int
+            1, or -1 when the epoch is not on the axis.
+
+        """
+        index = self.search(epoch)
+        if index < self.count and self[index] == epoch:
+            return index
+        return -1
+    
+    def search(self, epoch : int) -> int:
+        """
+        Index of the first epoch greater than or equal to the given one, as
+        bisect.bisect_left.
+
+        Parameters
+        ----------
+        epoch : int
+            5132938625000000
+
+        Returns
+        -------
+        int
+            1
+
+        """
+        if self.epochs is not None:
+            return bisect_left(self.epochs, epoch)
+        if self.count == 0 or epoch <= self.start:
+            return 0
+        if self.step is None:
+            return 1
+        return min(-((self.start - epoch) // self.step), self.count)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, key):
+        if self.epochs is not None:
+            return self.epochs[key]
+        if isinstance(key, slice):
+            return array('q', [self.start + index * (self.step or 0) for index in range(*key.indices(self.count))])
+        if key < 0:
+            key += self.count
+        if not 0 <= key < self.count:
+            raise IndexError("time axis index out of range")
+        return self.start + key * (self.step or 0)
+    
+    def __iter__(self):
+        if self.epochs is not None:
+            return iter(self.epochs)
+        return iter(range(self.start or 0, (self.start or 0) + self.count * (self.step or 1), self.step or 1))
+
+class Frozen_Time_Axis(Time_Axis):
+    
+    def __init__(self, time_axis : Time_Axis) -> None:
+        """
+        Read-only copy of a Time_Axis: the epochs of an explicit axis are a
+        Frozen_Array, appending or setting an attribute raises, and the step
+        of an explicit axis is computed once.
+
+        Parameters
+        ----------
+        time_axis : Time_Axis
+            Time_Axis of 3 epochs [5132938620000000, 5132938630000000, 5132938640000000]
+
+        Returns
+        -------
+        None
+
+        """
+        epochs = None if time_axis.epochs is None else Frozen_Array(self.typecode, time_axis.epochs)
+        for name, value in (("start", time_axis.start), ("step", time_axis.step), ("count", time_axis.count),
+                            ("epochs", epochs), ("derived", Derived_Cache())):
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name : str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only.")
+    
+    def append(self, epoch : int) -> None:
+        raise TypeError(f"{type(self).__name__} is read-only.")
+    
+    def get_step(self) -> int:
+        return self.derived.get("step", super().get_step)
+
+class Simulation_Result():
+    
+    __slots__ = ("simulation_results", "index")
+    
+    def __init__(self, simulation_results, index : int) -> None:
+        """
+        Lightweight read-only view over one row of a Simulation_Results
+        object. Nothing is copied: the date and the values are read from the
+        shared typed arrays on access, so result[0] is the date and
+        result[1:] are the values of the row.
+
+        Parameters
+        ----------
+        simulation_results : Simulation_Results
+            Simulation_Results holding the row.
+        index : int
+            0
+
+        Returns
+        -------
+        None
+
+        """
+        self.simulation_results = simulation_results
+        self.index = index
+    
+    def __len__(self) -> int:
+        return len(self.simulation_results.columns) + 1
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self)[key]
+        length = len(self)
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("simulation result index out of range")
+        if key == 0:
+            return self.simulation_results.get_date(self.index)
+        return self.simulation_results.columns[key - 1][self.index]
+    
+    def __iter__(self):
+        yield self.simulation_results.get_date(self.index)
+        for column in self.simulation_results.columns:
+            yield column[self.index]
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, Simulation_Result)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+class Simulation_Results():
+    
+    def __init__(self, typecodes : list = None) -> None:
+        """
+        Compact column oriented storage of the simulation results of a "sat"
+        file. The dates are held by a Time_Axis, implicit on regular grids,
+        and every value column is a typed array (doubles by default),
+        which costs a few bytes per value instead of a list of Python objects
+        per row. Indexing returns Simulation_Result views, so results[i][1]
+        keeps working as with the former list of lists.
+
+        Parameters
+        ----------
+        typecodes : list, optional
+            ['d', 'd']. The array typecode of each value column, the default
+            is 'd' for every column. An integer column whose values turn out
+            not to fit is widened to 'd'.
+
+        Returns
+        -------
+        None
+
+        """
+        self.typecodes = typecodes
+        self.epochs = Time_Axis()
+        self.columns = []
+    
+    def __setattr__(self, name : str, value) -> None:
+        if self.__dict__.get("frozen", False):
+            raise AttributeError(f"Frozen {type(self).__name__} are read-only.")
+        super().__setattr__(name, value)
+    
+    def freeze(self) -> "Simulation_Results":
+        """
+        Makes the simulation results read-only in place: the epochs become a
+        Frozen_Time_Axis and the columns a tuple of Frozen_Array, so that
+        they can be shared between threads without locks. The arrays are
+        copied once.
+
+        Returns
+        -------
+        Simulation_Results
+            The frozen simulation results (self).
+
+        """
+        if not self.is_frozen():
+            self.epochs = Frozen_Time_Axis(self.epochs)
+            self.columns = tuple(Frozen_Array(column.typecode, column) for column in self.columns)
+            self.frozen = True
+        return self
+    
+    def is_frozen(self) -> bool:
+        return self.__dict__.get("frozen", False)
+    
+    def append(self, simulation_result : list, epoch : int = None) -> None:
+        """
+        Append one tokenized row of a "sat" file.
+
+        Parameters
+        ----------
+        simulation_result : list
+            ['59409', '1020.00000', '1096.411']
+        epoch : int, optional
+            5132938620000000, the date of the row when already converted.
+
+        Raises
+        ------
+        ValueError
+            The row must have as many values as the previous ones.
+
+        Returns
+        -------
+        None
+
+        """
+        values = simulation_result[2:]
+        if not self.epochs and not self.columns:
+            typecodes = self.typecodes if self.typecodes is not None else ['d'] * len(values)
+            if len(typecodes) != len(values):
+                raise ValueError(f"Expected {len(typecodes)} values per row, got {len(values)}.")
+            self.columns = [array(typecode) for typecode in typecodes]
+        elif len(values) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values per row, got {len(values)}.")
+        if epoch is None:
+            epoch = self.set_mjd_to_epoch(float(simulation_result[0]), float(simulation_result[1]))
+        self.epochs.append(epoch)
+        for index, (column, value) in enumerate(zip(self.columns, values)):
+            if column.typecode in INTEGER_TYPECODES:
+                self.append_integer(index, value)
+            else:
+                column.append(float(value))
+    
+    def append_integer(self, index : int, value : str) -> None:
+        """
+        Append a value to an integer column, widening the column to doubles
+        when the value is not an integer or does not fit in its typecode.
+
+        Parameters
+        ----------
+        index : int
+            0 (the index of the value column)
+        value : str
+            '329'
+
+        Returns
+        -------
+        None
+
+        """
+        column = self.columns[index]
+        try:
+            column.append(int(value))
+            return
+        except (ValueError, OverflowError):
+            number = float(value)
+        if number.is_integer():
+            try:
+                column.append(int(number))
+                return
+            except OverflowError:
+                pass
+        self.columns[index] = array('d', column)
+        self.columns[index].append(number)
+    
+    def set_mjd_to_epoch(self, days : float, sec : float) -> int:
+        """
+        Convert a date given in Modified Julian Day (mjd) and seconds of day
+        to microseconds since the MJD epoch.
+
+        Parameters
+        ----------
+        days : float
+            59409
+        sec : float
+            1020.0
+
+        Returns
+        -------
+        int
+            5132938620000000
+
+        """
+        return round(days * 86400000000) + round(sec * 1000000)
+    
+    def get_date(self, index : int) -> dt.datetime:
+        return MJD_EPOCH + timedelta(microseconds = self.epochs[index])
+    
+    def get_column(self, index : int) -> array:
+        return self.columns[index - 1]
+    
+    def select(self, values : array, selection = None) -> array:
+        """
+        Select values of a typed array with a batch selection.
+
+        Parameters
+        ----------
+        values : array
+            array('d', [1096.411, 1052.271, 1010.944])
+        selection : None, slice, sequence of int or sequence of bool, optional
+            - None selects every value.
+            - slice(0, 2) selects the values as values[0:2].
+            - [0, 2] selects the values at the given indexes.
+            - [True, False, True] is a boolean mask of len(self) values, as
+              are bytearray(b'\\x01\\x00\\x01') and array('B', [1, 0, 1]) (see
+              Query.get_mask and the visibility columns).
+
+        Raises
+        ------
+        ValueError
+            A boolean mask must have one flag per simulation result.
+
+        Returns
+        -------
+        array
+            array('d', [1096.411, 1010.944])
+
+        """
+        if selection is None:
+            return values[:]
+        if isinstance(selection, slice):
+            return values[selection]
+        if isinstance(selection, (bytes, bytearray)) or (isinstance(selection, array) and selection.typecode in "Bb") or \
+                (len(selection) > 0 and all(isinstance(flag, bool) for flag in selection)):
+            if len(selection) != len(values):
+                raise ValueError(f"The boolean mask must have {len(values)} flags, got {len(selection)}.")
+            return array(values.typecode, compress(values, selection))
+        return array(values.typecode, [values[index] for index in selection])
+    
+    def get_values(self, index : int, selection = None) -> array:
+        return self.select(self.get_column(index), selection)
+    
+    def get_epochs(self, selection = None) -> array:
+        return self.select(self.epochs, selection)
+    
+    def get_index(self, date : dt.datetime) -> int:
+        """
+        Index of the simulation result at the given date.
+
+        Parameters
+        ----------
+        date : dt.datetime
+            dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)
+
+        Raises
+        ------
+        ValueError
+            There must be a simulation result at the given date.
+
+        Returns
+        -------
+        int
+            1
+
+        """
+        index = self.epochs.find(set_datetime_to_epoch(date))
+        if index < 0:
+            raise ValueError(f"There is no simulation result at {date}.")
+        return index
+    
+    def get_dates(self, selection = None) -> list:
+        return [MJD_EPOCH + timedelta(microseconds = epoch) for epoch in self.get_epochs(selection)]
+    
+    def get_nbytes(self) -> int:
+        return self.epochs.get_nbytes() + sum(column.itemsize * len(column) for column in self.columns)
+    
+    def __len__(self) -> int:
+        return len(self.epochs)
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [Simulation_Result(self, index) for index in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("simulation results index out of range")
+        return Simulation_Result(self, key)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Simulation_Result(self, index)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, Simulation_Results)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+class Parser_Cache():
+    
+    def __init__(self, max_bytes : int = 256 * 2**20) -> None:
+        """
+        Process-wide least recently used cache of parsed "sat" files. Entries
+        are keyed by parser class, real path, modification time and size, so
+        a rewritten file is parsed again. Once the memory held by the cached
+        simulation results exceeds max_bytes, the least recently used
+        entries are evicted. All the methods are thread-safe.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            268435456. The default is 256 MiB.
+
+        Raises
+        ------
+        ValueError
+            max_bytes cannot be negative.
+
+        Returns
+        -------
+        None
+
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.entries = OrderedDict()
+        self.keys = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+    
+    def get_key(self, parser_class : type, filepath : str, **kwargs) -> tuple:
+        stat = os.stat(filepath)
+        options = tuple(sorted((key, tuple(value) if isinstance(value, list) else value) 
+                               for key, value in kwargs.items()))
+        return (parser_class, os.path.realpath(filepath), options, stat.st_mtime_ns, stat.st_size)
+    
+    def get(self, parser_class : type, filepath : str, **kwargs):
+        """
+        Returns the parsed file from the cache, parsing it on a miss. The
+        parsing itself runs outside of the lock, so that different files are
+        parsed concurrently.
+
+        Parameters
+        ----------
+        parser_class : type
+            Sat_Altitude
+        filepath : str
+            Sat_SATELLITE_ALTITUDE.txt
+        **kwargs
+            precision = "single", passed to the constructor and part of the key.
+
+        Returns
+        -------
+        Sat_File_Parser
+            Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+
+        """
+        key = self.get_key(parser_class, filepath, **kwargs)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        parser = parser_class(filepath, **kwargs)
+        nbytes = parser.get_nbytes()
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key][0]
+            stale_key = self.keys.pop(key[:3], None)
+            if stale_key is not None:
+                self.nbytes -= self.entries.pop(stale_key)[1]
+            if nbytes <= self.max_bytes:
+                self.entries[key] = (parser, nbytes)
+                self.keys[key[:3]] = key
+                self.nbytes += nbytes
+                self.evict()
+        return parser
+    
+    def evict(self) -> None:
+        while self.nbytes > self.max_bytes:
+            key, (parser, nbytes) = self.entries.popitem(last = False)
+            del self.keys[key[:3]]
+            self.nbytes -= nbytes
+            self.evictions += 1
+    
+    def set_max_bytes(self, max_bytes : int) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.keys.clear()
+            self.nbytes = 0
+    
+    def get_statistics(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns
+        -------
+        dict
+            {'hits': 3, 'misses': 1, 'evictions': 0, 'entries': 1, 
+             'nbytes': 64, 'max_bytes': 268435456}
 
         """
-        return dt.datetime.strptime(str_date, '%Y/%m/%d %H:%M:%S.%f')
-    
-    def get_simulation_synthesis(self):
-        return self.simulation_data["Simulation synthesis"]
-    
-    def get_simulation_name(self):
-        return self.simulation_data["Simulation synthesis"]["Simulation name"]
-    
-    def get_simulation_start(self):
-        return self.simulation_data["Simulation synthesis"]["Start (UTC)"]
-    
-    def get_simulation_stop(self):
-        return self.simulation_data["Simulation synthesis"]["End (UTC)"]
-    
-    def get_satellite_name(self):
-        return self.simulation_data["Satellite 1"]["Name"]
-    
-    def get_initial_conditions(self):
-        return self.simulation_data["Initial conditions"]
-    
-    def get_initial_conditions_date(self):
-        return self.simulation_data["Initial conditions"]["Date (UTC)"]
-    
-    def get_initial_conditions_altitude(self):
-        return float(self.simulation_data["Initial conditions"]["Altitude (km)"])
-    
-    def get_initial_conditions_eccentricity(self):
-        return float(self.simulation_data["Initial conditions"]["Eccentricity"])
-    
-    def get_initial_conditions_inclination(self):
-        return float(self.simulation_data["Initial conditions"]["Inclination (deg)"])
-    
-    def get_initial_conditions_argument_of_perigee(self):
-        return float(self.simulation_data["Initial conditions"]["Argument of perigee (deg)"])
-    
-    def get_initial_conditions_mltan(self):
-        return float(self.simulation_data["Initial conditions"]["Mean local time of ascending node (h)"])
+        with self.lock:
+            return {"hits" : self.hits, "misses" : self.misses, "evictions" : self.evictions, 
+                    "entries" : len(self.entries), "nbytes" : self.nbytes, "max_bytes" : self.max_bytes}
     
-    def get_initial_conditions_argument_of_latitude(self):
-        return float(self.simulation_data["Initial conditions"]["Argument of latitude (deg)"])
-    
-    def get_initial_conditions_mean_j2_orbital_period(self):
-        return float(self.simulation_data["Initial conditions"]["Mean J2 orbital period (h)"])
-    
-    def get_ground_stations(self):
-        return self.simulation_data["Stations"]
+    def __len__(self) -> int:
+        return len(self.entries)
+
+PARSER_CACHE = Parser_Cache()
 
 class Sat_File_Parser(File):
     
-    def __init__(self, filepath : str) -> None:
+    # USER_DEFINED_CONTENT type the subclasses are restricted to.
+    CONTENT_TYPE = None
+    
+    def __init__(self, filepath : str, precision : str = "double", typecodes : list = None, 
+                 start : dt.datetime = None, stop : dt.datetime = None, check_integrity : bool = False, 
+                 frozen : bool = False) -> None:
         """
         This class aims at processing the "sat" files generated by the simu-cic
         software (https://www.connectbycnes.fr/simu-cic).
@@ -266,11 +1368,32 @@ class Sat_File_Parser(File):
         ----------
         filepath : str
             Sat_DISTANCE_GROUND_STATION_1.txt
+        precision : str, optional
+            "double" (default) or "single", the storage of the floating point
+            columns of CONTENT_SCHEMAS (see PRECISIONS for the error bounds).
+        typecodes : list, optional
+            ['f']. Overrides the array typecode of each value column.
+        start : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 0, 17). Only the simulation results from
+            this date are loaded.
+        stop : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 1, 0). Only the simulation results up to
+            this date are loaded.
+        check_integrity : bool, optional
+            False. When True, every row is checked while being read (see
+            simu_cic_integrity.Integrity_Checker): the rows that cannot be
+            parsed are skipped instead of raising, and the issues are
+            summarized in get_integrity_report().
+        frozen : bool, optional
+            False. When True, the parser is frozen once parsed (see freeze).
 
         Raises
         ------
         ValueError
-            The filename must be in {VALID_FILENAMES} (see SIMU-CIC_User_Manual).
+            - The USER_DEFINED_CONTENT of the header must be registered in
+              CONTENT_REGISTRY (see SIMU-CIC_User_Manual), and be of the
+              CONTENT_TYPE of the class.
+            - precision must be in {PRECISIONS}.
 
         Returns
         -------
@@ -278,9 +1401,160 @@ class Sat_File_Parser(File):
 
         """
         super().__init__(filepath)
-        if self.get_basename() not in VALID_FILENAMES:
-            raise ValueError(f"The filename must be in {VALID_FILENAMES}.")
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be in {list(PRECISIONS)}.")
+        self.precision = precision
+        self.typecodes = typecodes
+        self.start = start
+        self.stop = stop
+        self.check_integrity = check_integrity
+        self.integrity_report = None
         self.simulation_data = self.get_simulation_data()
+        if frozen:
+            self.freeze()
+    
+    def __setattr__(self, name : str, value) -> None:
+        if self.__dict__.get("frozen", False):
+            raise AttributeError(f"Frozen {type(self).__name__} are read-only.")
+        super().__setattr__(name, value)
+    
+    def freeze(self):
+        """
+        Makes the parser read-only in place, so that one parsed file can be
+        shared by many threads with no lock on the read path: the simulation
+        results are frozen (see Simulation_Results.freeze), simulation_data
+        becomes a read-only mapping whose COMMENT is a tuple, and setting an
+        attribute raises AttributeError. The structures derived from the
+        results are then computed once, on first request (see get_derived).
+
+        Returns
+        -------
+        Sat_File_Parser
+            The frozen parser (self).
+
+        """
+        if self.is_frozen():
+            return self
+        simulation_data = dict(self.simulation_data)
+        if isinstance(simulation_data.get('COMMENT'), list):
+            simulation_data['COMMENT'] = tuple(simulation_data['COMMENT'])
+        simulation_data['SIMULATION_RESULTS'] = simulation_data['SIMULATION_RESULTS'].freeze()
+        self.simulation_data = MappingProxyType(simulation_data)
+        self.derived = Derived_Cache()
+        self.frozen = True
+        return self
+    
+    def is_frozen(self) -> bool:
+        return self.__dict__.get("frozen", False)
+    
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        if self.is_frozen():
+            state['simulation_data'] = dict(self.simulation_data)
+        return state
+    
+    def __setstate__(self, state : dict) -> None:
+        if state.get("frozen", False):
+            state['simulation_data'] = MappingProxyType(state['simulation_data'])
+        self.__dict__.update(state)
+    
+    def get_derived(self, key, function):
+        """
+        Structure derived from the simulation results of a frozen parser,
+        such as an interpolator or a set of intervals, computed once on
+        first request whatever the number of threads requesting it.
+
+        Parameters
+        ----------
+        key : hashable
+            ("passes",)
+        function : callable
+            lambda : Interval_Set.from_sat_visibility(sat_visibility)
+
+        Raises
+        ------
+        ValueError
+            The parser must be frozen, the results of the others being
+            allowed to change.
+
+        Returns
+        -------
+        object
+            Interval_Set([...])
+
+        """
+        if not self.is_frozen():
+            raise ValueError(f"{self.get_basename()} is not frozen, see freeze.")
+        return self.derived.get(key, function)
+    
+    @classmethod
+    def open(cls, filepath : str, cache : Parser_Cache = None, **kwargs):
+        """
+        Opt-in cached constructor: returns the already parsed object when
+        the same unmodified file was opened before with the same class, so
+        that Sat_Altitude.open(path) only parses the file once per process.
+        The returned object is shared between callers.
+
+        Parameters
+        ----------
+        filepath : str
+            Sat_SATELLITE_ALTITUDE.txt
+        cache : Parser_Cache, optional
+            The default is the process-wide PARSER_CACHE.
+        **kwargs
+            precision = "single", passed to the constructor.
+
+        Returns
+        -------
+        Sat_File_Parser
+            Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+
+        """
+        if cache is None:
+            cache = PARSER_CACHE
+        return cache.get(cls, filepath, **kwargs)
+        
+    @classmethod
+    def from_simulation_data(cls, filepath : str, simulation_data : dict, precision : str = "double"):
+        """
+        Builds a parser over simulation data computed rather than read, such
+        as the output of a propagator, so that the code written against the
+        parsed files uses it unchanged. The file does not need to exist.
+
+        Parameters
+        ----------
+        filepath : str
+            Sat_SATELLITE_ALTITUDE.txt, the name the data would have on disk.
+        simulation_data : dict
+            {'CIC_MEM_VERS': '2.0', ..., 'USER_DEFINED_CONTENT': 'SATELLITE_ALTITUDE', 
+             ..., 'SIMULATION_RESULTS': Simulation_Results}, as returned by
+            get_simulation_data.
+        precision : str, optional
+            "double", the precision of the simulation results.
+
+        Raises
+        ------
+        ValueError
+            The USER_DEFINED_CONTENT must be registered and of the
+            CONTENT_TYPE of the class.
+
+        Returns
+        -------
+        Sat_File_Parser
+            Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+
+        """
+        sat_file_parser = cls.__new__(cls)
+        sat_file_parser.filepath = str(filepath)
+        sat_file_parser.precision = precision
+        sat_file_parser.typecodes = None
+        sat_file_parser.start = None
+        sat_file_parser.stop = None
+        sat_file_parser.check_integrity = False
+        sat_file_parser.integrity_report = None
+        sat_file_parser.check_content(simulation_data)
+        sat_file_parser.simulation_data = simulation_data
+        return sat_file_parser
         
     def get_simulation_informations(self, file : File) -> dict:
         """
@@ -364,6 +1638,59 @@ class Sat_File_Parser(File):
         simulation_informations['STOP_TIME'] = self.set_str_to_datetime(simulation_informations['STOP_TIME'])
         return simulation_informations
     
+    def get_typecodes(self, simulation_informations : dict) -> list:
+        """
+        Array typecodes of the value columns, from the USER_DEFINED_CONTENT
+        of the file and the requested precision.
+
+        Parameters
+        ----------
+        simulation_informations : dict
+            {'USER_DEFINED_CONTENT': 'SATELLITE_DIRECTION-GROUND_STATION_1_FRAME', ...}
+
+        Returns
+        -------
+        list
+            ['f', 'f'] in single precision, None for an unknown content.
+
+        """
+        if self.typecodes is not None:
+            return list(self.typecodes)
+        content_type = CONTENT_REGISTRY.get(simulation_informations.get('USER_DEFINED_CONTENT', ''))
+        if content_type is None:
+            return None
+        return content_type.get_typecodes(self.precision)
+    
+    def check_content(self, simulation_informations : dict) -> None:
+        """
+        Checks the USER_DEFINED_CONTENT of the header against CONTENT_REGISTRY
+        and the CONTENT_TYPE of the class.
+
+        Parameters
+        ----------
+        simulation_informations : dict
+            {'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_3', ...}
+
+        Raises
+        ------
+        ValueError
+            - The content must be registered.
+            - The content must be of the CONTENT_TYPE of the class.
+
+        Returns
+        -------
+        None
+
+        """
+        user_defined_content = simulation_informations.get('USER_DEFINED_CONTENT', '')
+        content_type = CONTENT_REGISTRY.get(user_defined_content)
+        if content_type is None:
+            raise ValueError(f"{self.filepath}: USER_DEFINED_CONTENT {user_defined_content!r} must be one of "
+                             f"{CONTENT_REGISTRY.get_names()}.")
+        if self.CONTENT_TYPE is not None and content_type.name != self.CONTENT_TYPE:
+            raise ValueError(f"{self.filepath}: USER_DEFINED_CONTENT should be {self.CONTENT_TYPE}, "
+                             f"got {user_defined_content}.")
+    
     def get_simulation_results(self, file : File)  -> list:
         """
         Extracts the simulation results from the given file.
@@ -440,18 +1767,73 @@ class Sat_File_Parser(File):
 
         Returns
         -------
-        list
+        Simulation_Results
+            [[dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc), 1096.411], 
+            [dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc), 1052.271], 
+            [dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc), 1010.944]]
+
+        """
+        formatted_simulation_results = Simulation_Results()
+        for simulation_result in simulation_results:
+            formatted_simulation_results.append(simulation_result)
+        return formatted_simulation_results
+    
+    def read_simulation_results(self, file : File, typecodes : list = None, 
+                                integrity_checker = None) -> Simulation_Results:
+        """
+        Extracts and formats the simulation results from the given file in a
+        single pass, without building the intermediate list of tokens. When
+        the parser has a start or stop date, the values of the rows outside
+        of [start, stop] are not converted and the reading stops at the first
+        row after stop (the rows being in chronological order). With an
+        integrity checker, every row is checked and the whole file is read,
+        the rows that cannot be parsed being skipped.
+
+        Parameters
+        ----------
+        file : File
+            File(Sat_DISTANCE_GROUND_STATION_1.txt)
+        typecodes : list, optional
+            ['d']. The array typecode of each value column.
+        integrity_checker : Integrity_Checker, optional
+            Integrity_Checker(simulation_informations), see simu_cic_integrity.
+
+        Returns
+        -------
+        Simulation_Results
             [[dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc), 1096.411], 
             [dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc), 1052.271], 
             [dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc), 1010.944]]
 
         """
-        for index, simulation_result in enumerate(simulation_results):
-            simulation_result = list(map(float, simulation_result))
-            mjd = self.set_mjd_to_datetime(simulation_result[0])
-            sec = self.set_sec_to_datetime(simulation_result[1])
-            simulation_result[:2] = [mjd + sec]
-            simulation_results[index] = simulation_result
+        simulation_results = Simulation_Results(typecodes)
+        if integrity_checker is not None:
+            start = -2**63 if self.start is None else set_datetime_to_epoch(self.start)
+            stop = 2**63 - 1 if self.stop is None else set_datetime_to_epoch(self.stop)
+            check = integrity_checker.check
+            for line in file:
+                simulation_result = line.split()
+                if simulation_result:
+                    epoch = check(simulation_result)
+                    if epoch is not None and start <= epoch <= stop:
+                        simulation_results.append(simulation_result, epoch)
+            return simulation_results
+        if self.start is None and self.stop is None:
+            for line in file:
+                simulation_result = line.split()
+                if simulation_result:
+                    simulation_results.append(simulation_result)
+            return simulation_results
+        start = -2**63 if self.start is None else set_datetime_to_epoch(self.start)
+        stop = 2**63 - 1 if self.stop is None else set_datetime_to_epoch(self.stop)
+        for line in file:
+            simulation_result = line.split()
+            if simulation_result:
+                epoch = simulation_results.set_mjd_to_epoch(float(simulation_result[0]), float(simulation_result[1]))
+                if epoch > stop:
+                    break
+                if epoch >= start:
+                    simulation_results.append(simulation_result, epoch)
         return simulation_results
     
     def get_simulation_data(self) -> dict:
@@ -471,21 +1853,109 @@ class Sat_File_Parser(File):
                                    [dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc), 1010.944]]}
 
         """
-        with open(self.filepath) as file:
+        with self.open_text() as file:
             simulation_informations = self.get_simulation_informations(file)
+            self.check_content(simulation_informations)
             simulation_informations = self.format_simulation_informations(simulation_informations)
-            simulation_results = self.get_simulation_results(file)
-            simulation_results = self.format_simulation_results(simulation_results) 
+            integrity_checker = None
+            if self.check_integrity:
+                from simu_cic_integrity import Integrity_Checker
+                integrity_checker = Integrity_Checker(simulation_informations, filepath = self.filepath)
+            simulation_results = self.read_simulation_results(file, self.get_typecodes(simulation_informations), 
+                                                              integrity_checker)
+            if integrity_checker is not None:
+                self.integrity_report = integrity_checker.get_report()
             simulation_data = simulation_informations
             simulation_data['SIMULATION_RESULTS'] = simulation_results
         return simulation_data
     
     def get_simulation_result_date(self, index):
-        return self.get_results()[index][0]
+        return self.get_results().get_date(index)
+    
+    def get_simulation_result_index(self, date : dt.datetime) -> int:
+        return self.get_results().get_index(date)
+    
+    def get_simulation_result_dates(self, selection = None) -> list:
+        return self.get_results().get_dates(selection)
+    
+    def get_integrity_report(self):
+        """
+        Summary of the integrity issues found while reading the file.
+
+        Returns
+        -------
+        Integrity_Report
+            Integrity_Report(Sat_ORBIT_NUMBER.txt, {'gap': 0, 'duplicate': 1, ...}),
+            None unless the parser was created with check_integrity = True.
+
+        """
+        return self.integrity_report
     
     def get_results(self):
         return self.simulation_data['SIMULATION_RESULTS']
     
+    def get_nbytes(self) -> int:
+        return self.get_results().get_nbytes()
+    
+    def get_values(self, index : int, selection = None, scale : float = 1.0) -> array:
+        """
+        Batch form of the single index getters: extracts the values of a
+        column for a slice, an array of indexes or a boolean mask, and
+        applies the unit conversion to the whole selection at once.
+
+        Parameters
+        ----------
+        index : int
+            1 (the column index as in get_results()[i][1])
+        selection : None, slice, sequence of int or sequence of bool, optional
+            slice(0, 2)
+        scale : float, optional
+            1e3
+
+        Returns
+        -------
+        array
+            array('d', [1096411.0, 1052271.0])
+
+        """
+        values = self.get_results().get_values(index, selection)
+        if scale != 1.0:
+            values = array('d', [value * scale for value in values])
+        return values
+    
+    def to_pandas(self):
+        """
+        DataFrame of the simulation results indexed by a UTC DatetimeIndex,
+        wrapping the typed arrays without copy, the columns being named
+        after the COMMENT and the header being in attrs (see simu_cic_frames).
+        Requires pandas, imported on first call.
+
+        Returns
+        -------
+        pandas.DataFrame
+                                       distance (km)
+            Date
+            2021-07-14 00:17:00+00:00       1096.411
+            ...
+
+        """
+        from simu_cic_frames import parser_to_pandas
+        return parser_to_pandas(self)
+    
+    def to_xarray(self):
+        """
+        Dataset of the simulation results along a time dimension of naive
+        UTC dates (see to_pandas). Requires xarray, imported on first call.
+
+        Returns
+        -------
+        xarray.Dataset
+            <xarray.Dataset> Dimensions: (time: 3) ... Data variables: distance (km) (time) float64 ...
+
+        """
+        from simu_cic_frames import parser_to_xarray
+        return parser_to_xarray(self)
+    
     def get_version(self):
         return self.simulation_data['CIC_MEM_VERS']
     
@@ -521,7 +1991,9 @@ class Sat_File_Parser(File):
     
 class Sat_Orbit_Number(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "ORBIT_NUMBER"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from Sat_ORBIT_NUMBER 
         files generated by the simu-cic software.
@@ -530,18 +2002,23 @@ class Sat_Orbit_Number(Sat_File_Parser):
         ----------
         path : str
             Sat_ORBIT_NUMBER.txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
-        if self.get_basename() != "Sat_ORBIT_NUMBER.txt":
-            raise ValueError("Path basename should be Sat_ORBIT_NUMBER.txt")
+        super().__init__(path, **kwargs)
         
     def get_orbit_number(self, index : int) -> int:
         return int(self.get_results()[index][1])
     
+    def get_orbit_numbers(self, selection = None) -> array:
+        return array('q', map(int, self.get_values(1, selection)))
+    
 class Sat_Position(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "SATELLITE_DIRECTION-GROUND_STATION_FRAME"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from Sat_SATELLITE_DIRECTION 
         files generated by the simu-cic software.
@@ -550,9 +2027,11 @@ class Sat_Position(Sat_File_Parser):
         ----------
         path : str
             Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
+        super().__init__(path, **kwargs)
     
     def get_sat_azimut(self, index):
         return float(self.get_results()[index][1])
@@ -560,10 +2039,18 @@ class Sat_Position(Sat_File_Parser):
     def get_sat_elevation(self, index):
         return float(self.get_results()[index][2])
     
+    def get_sat_azimuts(self, selection = None) -> array:
+        return self.get_values(1, selection)
+    
+    def get_sat_elevations(self, selection = None) -> array:
+        return self.get_values(2, selection)
+    
     
 class Sat_Visibility(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "GEOMETRICAL_VISIBILITY_GROUND_STATION"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from ...
         files generated by the simu-cic software.
@@ -572,16 +2059,23 @@ class Sat_Visibility(Sat_File_Parser):
         ----------
         path : str
             ....txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
+        super().__init__(path, **kwargs)
     
     def get_sat_visibility(self, index):
         return self.get_results()[index][1]
     
+    def get_sat_visibilities(self, selection = None) -> array:
+        return self.get_values(1, selection)
+    
 class Sat_Distance_To_Ground_Station(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "DISTANCE_GROUND_STATION"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from ...
         files generated by the simu-cic software.
@@ -590,16 +2084,23 @@ class Sat_Distance_To_Ground_Station(Sat_File_Parser):
         ----------
         path : str
             ....txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
+        super().__init__(path, **kwargs)
     
     def get_sat_distance_to_ground_station(self, index):
         return self.get_results()[index][1]*1e3
     
+    def get_sat_distances_to_ground_station(self, selection = None) -> array:
+        return self.get_values(1, selection, scale = 1e3)
+    
 class Sat_Geographical_Coordinates(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "GEOGRAPHICAL_COORDINATES"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from ...
         files generated by the simu-cic software.
@@ -608,11 +2109,11 @@ class Sat_Geographical_Coordinates(Sat_File_Parser):
         ----------
         path : str
             ....txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
-        if self.get_basename() != "Sat_GEOGRAPHICAL_COORDINATES.txt":
-            raise ValueError( "Path basename should be Sat_GEOGRAPHICAL_COORDINATES.txt")
+        super().__init__(path, **kwargs)
     
     def get_sat_longitude(self, index):
         return self.get_results()[index][1]
@@ -620,9 +2121,17 @@ class Sat_Geographical_Coordinates(Sat_File_Parser):
     def get_sat_latitude(self, index):
         return self.get_results()[index][2]
     
+    def get_sat_longitudes(self, selection = None) -> array:
+        return self.get_values(1, selection)
+    
+    def get_sat_latitudes(self, selection = None) -> array:
+        return self.get_values(2, selection)
+    
 class Sat_Eclipse(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "SATELLITE_ECLIPSE"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from Sat_SATELLITE_ECLIPSE
         files generated by the simu-cic software.
@@ -631,18 +2140,23 @@ class Sat_Eclipse(Sat_File_Parser):
         ----------
         path : str
             Sat_SATELLITE_ECLIPSE.txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
-        if self.get_basename() != "Sat_SATELLITE_ECLIPSE.txt":
-            raise ValueError("Path basename should be Sat_SATELLITE_ECLIPSE.txt")
+        super().__init__(path, **kwargs)
     
     def get_sun_eclipse(self, index):
         return self.get_results()[index][1]
     
+    def get_sun_eclipses(self, selection = None) -> array:
+        return self.get_values(1, selection)
+    
 class Sat_Altitude(Sat_File_Parser):
     
-    def __init__(self, path : str):
+    CONTENT_TYPE = "SATELLITE_ALTITUDE"
+    
+    def __init__(self, path : str, **kwargs):
         """
         This class aims at extracting specific informations from Sat_SATELLITE_ALTITUDE.txt
         files generated by the simu-cic software.
@@ -651,12 +2165,209 @@ class Sat_Altitude(Sat_File_Parser):
         ----------
         path : str
             ....txt
+        **kwargs
+            precision, typecodes, start or stop, see Sat_File_Parser.
 
         """
-        super().__init__(path)
-        if self.get_basename() != "Sat_SATELLITE_ALTITUDE.txt":
-            raise ValueError("Path basename should be Sat_SATELLITE_ALTITUDE.txt")
+        super().__init__(path, **kwargs)
     
     def get_sat_altitude(self, index):
         return self.get_results()[index][1]*1e3
     
+    def get_sat_altitudes(self, selection = None) -> array:
+        return self.get_values(1, selection, scale = 1e3)
+
+    
+
+CONTENT_PARSERS = {"DISTANCE_GROUND_STATION" : Sat_Distance_To_Ground_Station,
+                   "ORBIT_NUMBER" : Sat_Orbit_Number,
+                   "SATELLITE_DIRECTION-GROUND_STATION_FRAME" : Sat_Position,
+                   "SATELLITE_ALTITUDE" : Sat_Altitude,
+                   "SATELLITE_ECLIPSE" : Sat_Eclipse,
+                   "GEOMETRICAL_VISIBILITY_GROUND_STATION" : Sat_Visibility,
+                   "GEOGRAPHICAL_COORDINATES" : Sat_Geographical_Coordinates}
+
+CONTENT_REGISTRY = Content_Registry()
+for content_type, parser_class in CONTENT_PARSERS.items():
+    CONTENT_REGISTRY.register(content_type, CONTENT_SCHEMAS[content_type], parser_class)
+
+def get_sat_filepaths(dirpath : str) -> dict:
+    """
+    Discovers the "sat" files of a directory, whatever their names, from the
+    OBJECT_NAME and USER_DEFINED_CONTENT of their headers (see
+    Content_Registry.identify). When a content is available several times,
+    the first file in alphabetical order is kept.
+
+    Parameters
+    ----------
+    dirpath : str
+        simu
+
+    Returns
+    -------
+    dict
+        {'Sat': {'ORBIT_NUMBER': 'simu/Sat_ORBIT_NUMBER.txt', 
+                 'SATELLITE_ALTITUDE': 'simu/Sat_SATELLITE_ALTITUDE.TXT.gz'}}
+
+    """
+    filepaths = defaultdict(dict)
+    for basename in sorted(os.listdir(dirpath)):
+        filename = basename
+        if Path(filename).suffix in COMPRESSION_SUFFIXES:
+            filename = Path(filename).stem
+        filepath = os.path.join(dirpath, basename)
+        if Path(filename).suffix.lower() != ".txt" or not filepath.isascii() or not os.path.isfile(filepath):
+            continue
+        identity = CONTENT_REGISTRY.identify(filepath)
+        if identity is not None:
+            object_name, user_defined_content = identity
+            filepaths[object_name].setdefault(user_defined_content, filepath)
+    return dict(filepaths)
+
+# Memory held by the parsers restricted to a time range of one run.
+WINDOW_CACHE_BYTES = 64 * 2**20
+
+class Simulation_Run():
+    
+    def __init__(self, dirpath : str, object_name : str = "Sat", filepaths : dict = None,
+                 window_cache : Parser_Cache = None) -> None:
+        """
+        This class aims at gathering the output files of one simu-cic run.
+        The "sat" files of the directory are identified from the OBJECT_NAME
+        and USER_DEFINED_CONTENT of their headers (see get_sat_filepaths) but
+        only parsed on first access, so that the files a computation does not
+        need are never fully read.
+
+        Parameters
+        ----------
+        dirpath : str
+            simu
+        object_name : str, optional
+            "Sat", the OBJECT_NAME prefix of the "sat" files.
+        filepaths : dict, optional
+            {'ORBIT_NUMBER': 'simu/Sat_ORBIT_NUMBER.txt'}, the files of the
+            run when already discovered (see get_sat_filepaths).
+        window_cache : Parser_Cache, optional
+            Parser_Cache(16 * 2**20), the cache of the parsers restricted to a
+            time range. The default is a cache of WINDOW_CACHE_BYTES per run.
+
+        Raises
+        ------
+        FileNotFoundError
+            dirpath should be an existing directory.
+
+        Returns
+        -------
+        None
+
+        """
+        if not os.path.isdir(dirpath):
+            raise FileNotFoundError(f"{dirpath} is not a directory.")
+        self.dirpath = str(dirpath)
+        self.object_name = object_name
+        self.filepaths = self.get_filepaths() if filepaths is None else dict(filepaths)
+        self.parsers = {}
+        self.window_cache = Parser_Cache(WINDOW_CACHE_BYTES) if window_cache is None else window_cache
+        self.lock = threading.Lock()
+    
+    def get_filepaths(self) -> dict:
+        """
+        Discovers the "sat" files of the run from their headers.
+
+        Returns
+        -------
+        dict
+            {'ORBIT_NUMBER': 'simu/Sat_ORBIT_NUMBER.txt', 
+             'SATELLITE_ALTITUDE': 'simu/Sat_SATELLITE_ALTITUDE.txt.gz'}
+
+        """
+        return get_sat_filepaths(self.dirpath).get(self.object_name, {})
+    
+    def get_contents(self) -> list:
+        return list(self.filepaths)
+    
+    def get_filepath(self, content : str) -> str:
+        if content not in self.filepaths:
+            raise KeyError(f"{content} is not part of the run {self.dirpath} ({self.get_contents()}).")
+        return self.filepaths[content]
+    
+    def get_parser(self, content : str, start : dt.datetime = None, stop : dt.datetime = None) -> Sat_File_Parser:
+        """
+        Returns the parsed file of the given USER_DEFINED_CONTENT, parsing it
+        on first access. Parsers restricted to a time range are kept apart
+        from the full ones, in the window cache: it evicts the least recently
+        used windows and parses a window again once its file changed, so that
+        ad-hoc ranges do not accumulate.
+
+        Parameters
+        ----------
+        content : str
+            SATELLITE_DIRECTION-GROUND_STATION_1_FRAME
+        start : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 0, 17)
+        stop : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 1, 0)
+
+        Raises
+        ------
+        KeyError
+            The content must be part of the run.
+
+        Returns
+        -------
+        Sat_File_Parser
+            Sat_Position(simu/Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt)
+
+        """
+        if start is not None or stop is not None:
+            return self.window_cache.get(CONTENT_REGISTRY.get_parser_class(content), self.get_filepath(content),
+                                         start = start, stop = stop)
+        key = (content, None, None)
+        with self.lock:
+            if key in self.parsers:
+                return self.parsers[key]
+        filepath = self.get_filepath(content)
+        parser = CONTENT_REGISTRY.get_parser_class(content)(filepath)
+        with self.lock:
+            return self.parsers.setdefault(key, parser)
+    
+    def get_simu_cic_info(self) -> Simu_Cic_Info_File_Parser:
+        return Simu_Cic_Info_File_Parser(os.path.join(self.dirpath, "simu_cic_info.txt"))
+    
+    def to_pandas(self, contents : list = None):
+        """
+        DataFrame of the files of the run aligned on their dates, with
+        (USER_DEFINED_CONTENT, column) columns (see simu_cic_frames.run_to_pandas).
+
+        Parameters
+        ----------
+        contents : list, optional
+            ['SATELLITE_ALTITUDE']. The default is every content of the run.
+
+        Returns
+        -------
+        pandas.DataFrame
+            frame['SATELLITE_ALTITUDE']['altitude (km)']
+
+        """
+        from simu_cic_frames import run_to_pandas
+        return run_to_pandas(self, contents)
+    
+    def to_xarray(self, contents : list = None):
+        """
+        Dataset of the files of the run aligned on their dates, with
+        "USER_DEFINED_CONTENT:column" variables (see simu_cic_frames.run_to_xarray).
+
+        Parameters
+        ----------
+        contents : list, optional
+            ['SATELLITE_ALTITUDE']. The default is every content of the run.
+
+        Returns
+        -------
+        xarray.Dataset
+            dataset['SATELLITE_ALTITUDE:altitude (km)']
+
+        """
+        from simu_cic_frames import run_to_xarray
+        return run_to_xarray(self, contents)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+pandas and xarray views of the parsed "sat" files and of whole runs. The
+value columns are wrapped without copy (numpy.frombuffer over the typed
+arrays), the dates are computed from the epochs in one vectorized step,
+and pandas, numpy and xarray are only imported on first use.
+"""
+import datetime as dt
+import importlib
+
+from simu_cic_file_manager import CONTENT_REGISTRY, MJD_EPOCH, Sat_File_Parser, Simulation_Run, Time_Axis
+
+# Microseconds between the MJD epoch and the Unix epoch of datetime64.
+UNIX_EPOCH_OFFSET = (dt.datetime(1970, 1, 1, tzinfo = dt.timezone.utc) - MJD_EPOCH) // dt.timedelta(microseconds = 1)
+
+def import_optional(name : str):
+    """
+    Imports an optional dependency.
+
+    Parameters
+    ----------
+    name : str
+        pandas
+
+    Raises
+    ------
+    ImportError
+        The package must be installed.
+
+    Returns
+    -------
+    module
+        <module 'pandas'>
+
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as error:
+        raise ImportError(f"Converting the simulation results requires the {name} package.") from error
+
+def get_column_labels(sat_file_parser : Sat_File_Parser) -> list:
+    """
+    Labels of the value columns, from the parsed COMMENT of the header
+    without the legends of the values, or from CONTENT_SCHEMAS when the
+    COMMENT does not name every column.
+
+    Parameters
+    ----------
+    sat_file_parser : Sat_File_Parser
+        Sat_Visibility(Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt)
+
+    Returns
+    -------
+    list
+        ['station_visibility']
+
+    """
+    columns = sat_file_parser.get_results().columns
+    comment = sat_file_parser.simulation_data.get('COMMENT')
+    labels = list(comment[1:]) if isinstance(comment, (list, tuple)) else []
+    if len(labels) != len(columns):
+        content_type = CONTENT_REGISTRY.get(sat_file_parser.get_user_defined_content())
+        labels = content_type.column_names if content_type is not None else []
+    if len(labels) != len(columns):
+        labels = [f"column {index}" for index in range(1, len(columns) + 1)]
+    return [label.split(':')[0].strip() for label in labels]
+
+def get_attrs(sat_file_parser : Sat_File_Parser) -> dict:
+    """
+    Header of a parsed file as attributes, the dates in ISO format and the
+    COMMENT as in the file, so that they can be written to netCDF.
+
+    Returns
+    -------
+    dict
+        {'filepath': 'Sat_SATELLITE_ALTITUDE.txt', 'precision': 'double', 'CIC_MEM_VERS': '2.0',
+         'CREATION_DATE': '2021-06-23T09:52:26', ..., 'COMMENT': 'Date, altitude (km)', ...}
+
+    """
+    attrs = {"filepath" : sat_file_parser.filepath, "precision" : sat_file_parser.precision}
+    for key, value in sat_file_parser.simulation_data.items():
+        if key == 'SIMULATION_RESULTS':
+            continue
+        if isinstance(value, dt.datetime):
+            value = value.isoformat()
+        elif isinstance(value, (list, tuple)):
+            value = ", ".join(value)
+        attrs[key] = value
+    return attrs
+
+def get_epochs_values(time_axis : Time_Axis):
+    """
+    numpy datetime64[us] dates of a time axis, computed from (start, step,
+    count) on a regular axis and viewed over the epochs of an explicit one.
+    """
+    numpy = import_optional("numpy")
+    if time_axis.is_regular():
+        epochs = numpy.arange(len(time_axis), dtype = numpy.int64) * (time_axis.step or 0) + (time_axis.start or 0)
+    else:
+        epochs = numpy.frombuffer(time_axis.epochs, dtype = numpy.int64)
+    return (epochs - UNIX_EPOCH_OFFSET).astype("datetime64[us]")
+
+def get_column_values(column):
+    """
+    Read-only numpy view over a typed array, sharing its memory. The array
+    cannot be resized while the view is alive.
+    """
+    numpy = import_optional("numpy")
+    values = numpy.frombuffer(column, dtype = column.typecode)
+    values.flags.writeable = False
+    return values
+
+def parser_to_pandas(sat_file_parser : Sat_File_Parser):
+    """
+    DataFrame of the simulation results of a parsed file, indexed by a UTC
+    DatetimeIndex named Date, its columns being views over the typed arrays
+    and its attrs the header (see get_attrs).
+
+    Returns
+    -------
+    pandas.DataFrame
+                                   altitude (km)
+        Date
+        2021-07-14 00:17:00+00:00        601.674
+        ...
+
+    """
+    pandas = import_optional("pandas")
+    results = sat_file_parser.get_results()
+    index = pandas.DatetimeIndex(get_epochs_values(results.epochs), name = "Date").tz_localize("UTC")
+    data = {label : get_column_values(column) for label, column in zip(get_column_labels(sat_file_parser), results.columns)}
+    frame = pandas.DataFrame(data, index = index, copy = False)
+    frame.attrs.update(get_attrs(sat_file_parser))
+    return frame
+
+def parser_to_xarray(sat_file_parser : Sat_File_Parser):
+    """
+    Dataset of the simulation results of a parsed file: one variable per
+    column along the time dimension, the header being in attrs.
+
+    Returns
+    -------
+    xarray.Dataset
+        <xarray.Dataset> Dimensions: (time: 3) ... Data variables: altitude (km) (time) float64 ...
+
+    """
+    xarray = import_optional("xarray")
+    results = sat_file_parser.get_results()
+    data_vars = {label : ("time", get_column_values(column))
+                 for label, column in zip(get_column_labels(sat_file_parser), results.columns)}
+    return xarray.Dataset(data_vars, coords = {"time" : get_epochs_values(results.epochs)},
+                          attrs = get_attrs(sat_file_parser))
+
+def get_run_attrs(simulation_run : Simulation_Run) -> dict:
+    return {"dirpath" : simulation_run.dirpath, "object_name" : simulation_run.object_name}
+
+def run_to_pandas(simulation_run : Simulation_Run, contents : list = None):
+    """
+    DataFrame of the files of a run, aligned on the union of their dates
+    (NaN where a file has no sample), with (USER_DEFINED_CONTENT, label)
+    columns. The attrs hold the run and the header of each file.
+
+    Parameters
+    ----------
+    simulation_run : Simulation_Run
+        Simulation_Run(simu)
+    contents : list, optional
+        ['SATELLITE_ALTITUDE', 'SATELLITE_ECLIPSE']. The default is every
+        content of the run.
+
+    Returns
+    -------
+    pandas.DataFrame
+        frame['SATELLITE_ALTITUDE']['altitude (km)']
+
+    """
+    pandas = import_optional("pandas")
+    contents = sorted(simulation_run.get_contents()) if contents is None else contents
+    frames = [parser_to_pandas(simulation_run.get_parser(content)) for content in contents]
+    frame = pandas.concat(frames, axis = 1, keys = contents, join = "outer", sort = True) if frames else pandas.DataFrame()
+    frame.attrs = dict(get_run_attrs(simulation_run), contents = {content : dict(other.attrs)
+                                                                   for content, other in zip(contents, frames)})
+    return frame
+
+def run_to_xarray(simulation_run : Simulation_Run, contents : list = None):
+    """
+    Dataset of the files of a run, aligned on the union of their dates, the
+    variables being named "USER_DEFINED_CONTENT:label" with the header of
+    their file in attrs.
+
+    Parameters
+    ----------
+    simulation_run : Simulation_Run
+        Simulation_Run(simu)
+    contents : list, optional
+        ['SATELLITE_ALTITUDE']. The default is every content of the run.
+
+    Returns
+    -------
+    xarray.Dataset
+        dataset['SATELLITE_ALTITUDE:altitude (km)']
+
+    """
+    xarray = import_optional("xarray")
+    contents = sorted(simulation_run.get_contents()) if contents is None else contents
+    datasets = []
+    for content in contents:
+        dataset = parser_to_xarray(simulation_run.get_parser(content))
+        dataset = dataset.rename({name : f"{content}:{name}" for name in dataset.data_vars})
+        for name in dataset.data_vars:
+            dataset[name].attrs.update(dataset.attrs)
+        dataset.attrs = {}
+        datasets.append(dataset)
+    dataset = xarray.merge(datasets, join = "outer", combine_attrs = "drop_conflicts")
+    return dataset.assign_attrs(get_run_attrs(simulation_run))
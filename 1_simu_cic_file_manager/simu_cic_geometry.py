@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+Station geometry computed from the ground track of the satellite, so that
+any station of Stations_ref.txt can be evaluated without re-running the
+simu-cic software.
+"""
+import heapq
+import math
+import operator
+from array import array
+from itertools import compress, repeat
+
+from simu_cic_file_manager import Stations_Ref_File_Parser, Sat_Geographical_Coordinates, \
+    Sat_Altitude
+
+WGS84_SEMI_MAJOR_AXIS = 6378137.0
+WGS84_FLATTENING = 1 / 298.257223563
+WGS84_ECCENTRICITY_SQUARED = WGS84_FLATTENING * (2 - WGS84_FLATTENING)
+
+def set_geodetic_to_ecef(longitude : float, latitude : float, altitude : float) -> tuple:
+    """
+    Convert WGS84 geodetic coordinates to Earth-centered Earth-fixed ones.
+
+    Parameters
+    ----------
+    longitude : float
+        6.9216 (deg)
+    latitude : float
+        43.7546 (deg)
+    altitude : float
+        1323.0 (m)
+
+    Returns
+    -------
+    tuple
+        (4581694.1, 556198.5, 4389352.3) (m)
+
+    """
+    longitude = math.radians(longitude)
+    latitude = math.radians(latitude)
+    sin_latitude = math.sin(latitude)
+    radius = WGS84_SEMI_MAJOR_AXIS / math.sqrt(1 - WGS84_ECCENTRICITY_SQUARED * sin_latitude ** 2)
+    return ((radius + altitude) * math.cos(latitude) * math.cos(longitude),
+            (radius + altitude) * math.cos(latitude) * math.sin(longitude),
+            (radius * (1 - WGS84_ECCENTRICITY_SQUARED) + altitude) * sin_latitude)
+
+def set_ecef_to_geodetic(x : float, y : float, z : float) -> tuple:
+    """
+    Convert Earth-centered Earth-fixed coordinates to WGS84 geodetic ones,
+    by a few fixed-point iterations on the latitude (sub-millimetre below
+    geostationary altitudes).
+
+    Parameters
+    ----------
+    x : float
+        4581694.1 (m)
+    y : float
+        556198.5 (m)
+    z : float
+        4389352.3 (m)
+
+    Returns
+    -------
+    tuple
+        (6.9216 (deg), 43.7546 (deg), 1323.0 (m)), the longitude being in [0, 360).
+
+    """
+    longitude = math.degrees(math.atan2(y, x)) % 360.0
+    distance = math.hypot(x, y)
+    latitude = math.atan2(z, distance * (1 - WGS84_ECCENTRICITY_SQUARED))
+    for _ in range(5):
+        sin_latitude = math.sin(latitude)
+        radius = WGS84_SEMI_MAJOR_AXIS / math.sqrt(1 - WGS84_ECCENTRICITY_SQUARED * sin_latitude ** 2)
+        latitude = math.atan2(z + WGS84_ECCENTRICITY_SQUARED * radius * sin_latitude, distance)
+    sin_latitude, cos_latitude = math.sin(latitude), math.cos(latitude)
+    radius = WGS84_SEMI_MAJOR_AXIS / math.sqrt(1 - WGS84_ECCENTRICITY_SQUARED * sin_latitude ** 2)
+    if cos_latitude > 1e-9:
+        altitude = distance / cos_latitude - radius
+    else:
+        altitude = abs(z) - radius * (1 - WGS84_ECCENTRICITY_SQUARED)
+    return longitude, math.degrees(latitude), altitude
+
+def get_enu_rotation(longitude : float, latitude : float) -> tuple:
+    """
+    Rows of the rotation from ECEF to the local East-North-Up frame.
+
+    Parameters
+    ----------
+    longitude : float
+        6.9216 (deg)
+    latitude : float
+        43.7546 (deg)
+
+    Returns
+    -------
+    tuple
+        (east, north, up) unit vectors expressed in ECEF.
+
+    """
+    longitude = math.radians(longitude)
+    latitude = math.radians(latitude)
+    sin_longitude, cos_longitude = math.sin(longitude), math.cos(longitude)
+    sin_latitude, cos_latitude = math.sin(latitude), math.cos(latitude)
+    return ((-sin_longitude, cos_longitude, 0.0),
+            (-sin_latitude * cos_longitude, -sin_latitude * sin_longitude, cos_latitude),
+            (cos_latitude * cos_longitude, cos_latitude * sin_longitude, sin_latitude))
+
+class Station_Table():
+    
+    def __init__(self, records : list) -> None:
+        """
+        This class aims at holding large station networks compactly: one
+        typed array per field, a case-insensitive index of the names and
+        mnemonics, and the ECEF position and ENU rotation of every station
+        computed once, so that the geometry of a satellite position is
+        evaluated for all the stations in a few passes over the arrays.
+
+        Parameters
+        ----------
+        records : list
+            [{'name': 'Paris', 'longitude': 2.351, 'latitude': 48.856, 'altitude': 30.0,
+              'mnemonic': 'PAR', 'min_elevation': 0.0, 'reconfiguration_time': nan,
+              'conjunction_angle': nan}], see Stations_Ref_File_Parser.get_ground_stations_records.
+
+        Raises
+        ------
+        ValueError
+            The names must be unique whatever their case.
+
+        Returns
+        -------
+        None
+
+        """
+        self.names = [record["name"] for record in records]
+        self.mnemonics = [record.get("mnemonic", "") for record in records]
+        self.longitudes = array('d', [record["longitude"] for record in records])
+        self.latitudes = array('d', [record["latitude"] for record in records])
+        self.altitudes = array('d', [record["altitude"] for record in records])
+        self.min_elevations = array('d', [record.get("min_elevation", 0.0) for record in records])
+        self.reconfiguration_times = array('d', [record.get("reconfiguration_time", math.nan) for record in records])
+        self.conjunction_angles = array('d', [record.get("conjunction_angle", math.nan) for record in records])
+        self.index = {}
+        for position, name in enumerate(self.names):
+            if self.index.setdefault(name.casefold(), position) != position:
+                raise ValueError(f"The station {name} is defined twice.")
+        for position, mnemonic in enumerate(self.mnemonics):
+            if mnemonic:
+                self.index.setdefault(mnemonic.casefold(), position)
+        self.x, self.y, self.z = array('d'), array('d'), array('d')
+        # Rows of the ENU rotations, one array per coefficient (east_x is
+        # the x component of the east vector of every station).
+        self.east_x, self.east_y = array('d'), array('d')
+        self.north_x, self.north_y, self.north_z = array('d'), array('d'), array('d')
+        self.up_x, self.up_y, self.up_z = array('d'), array('d'), array('d')
+        for longitude, latitude, altitude in zip(self.longitudes, self.latitudes, self.altitudes):
+            x, y, z = set_geodetic_to_ecef(longitude, latitude, altitude)
+            self.x.append(x)
+            self.y.append(y)
+            self.z.append(z)
+            east, north, up = get_enu_rotation(longitude, latitude)
+            self.east_x.append(east[0])
+            self.east_y.append(east[1])
+            self.north_x.append(north[0])
+            self.north_y.append(north[1])
+            self.north_z.append(north[2])
+            self.up_x.append(up[0])
+            self.up_y.append(up[1])
+            self.up_z.append(up[2])
+    
+    @classmethod
+    def from_file(cls, filepath : str) -> "Station_Table":
+        return Stations_Ref_File_Parser(filepath).get_station_table()
+    
+    def get_index(self, name : str) -> int:
+        """
+        Position of a station given its name or mnemonic, whatever the case.
+
+        Parameters
+        ----------
+        name : str
+            PAR
+
+        Raises
+        ------
+        KeyError
+            The station must be in the table.
+
+        Returns
+        -------
+        int
+            1
+
+        """
+        try:
+            return self.index[name.casefold()]
+        except KeyError:
+            raise KeyError(f"{name} is not a station of the table.") from None
+    
+    def get_station(self, name : str) -> dict:
+        """
+        Every field of a station given its name or mnemonic.
+
+        Returns
+        -------
+        dict
+            {'name': 'Paris', 'longitude': 2.351, 'latitude': 48.856, 'altitude': 30.0,
+             'mnemonic': 'PAR', 'min_elevation': 0.0, 'reconfiguration_time': nan,
+             'conjunction_angle': nan}
+
+        """
+        index = self.get_index(name)
+        return {"name" : self.names[index], "longitude" : self.longitudes[index],
+                "latitude" : self.latitudes[index], "altitude" : self.altitudes[index],
+                "mnemonic" : self.mnemonics[index], "min_elevation" : self.min_elevations[index],
+                "reconfiguration_time" : self.reconfiguration_times[index],
+                "conjunction_angle" : self.conjunction_angles[index]}
+    
+    def get_sub_table(self, names : list) -> "Station_Table":
+        """
+        Table of some of the stations, given their names or mnemonics, so that
+        the geometry is only evaluated for them.
+
+        Returns
+        -------
+        Station_Table
+            Station_Table(1 stations), the stations in the order of names.
+
+        """
+        return Station_Table([self.get_station(name) for name in names])
+    
+    def get_ecef(self, name : str) -> tuple:
+        index = self.get_index(name)
+        return self.x[index], self.y[index], self.z[index]
+    
+    def get_enu_rotation(self, name : str) -> tuple:
+        index = self.get_index(name)
+        return ((self.east_x[index], self.east_y[index], 0.0),
+                (self.north_x[index], self.north_y[index], self.north_z[index]),
+                (self.up_x[index], self.up_y[index], self.up_z[index]))
+    
+    def get_topocentric(self, x : float, y : float, z : float) -> tuple:
+        """
+        Azimut, elevation and distance of an ECEF position from every station.
+
+        Parameters
+        ----------
+        x : float
+            4286155.2 (m)
+        y : float
+            -120377.5 (m)
+        z : float
+            5119480.6 (m)
+
+        Returns
+        -------
+        tuple
+            (array('d', [azimuts (deg)]), array('d', [elevations (deg)]), array('d', [distances (m)])),
+            in the order of the stations.
+
+        """
+        dx = list(map(operator.sub, repeat(x), self.x))
+        dy = list(map(operator.sub, repeat(y), self.y))
+        dz = list(map(operator.sub, repeat(z), self.z))
+        e = [a * u + b * v for a, b, u, v in zip(self.east_x, self.east_y, dx, dy)]
+        n = [a * u + b * v + c * w for a, b, c, u, v, w in zip(self.north_x, self.north_y, self.north_z, dx, dy, dz)]
+        u = [a * u + b * v + c * w for a, b, c, u, v, w in zip(self.up_x, self.up_y, self.up_z, dx, dy, dz)]
+        distances = array('d', map(math.hypot, dx, dy, dz))
+        # atan2 rather than asin(up / distance), which rounding pushes out of
+        # [-1, 1] at the zenith of a station.
+        elevations = array('d', [math.degrees(math.atan2(up, math.hypot(east, north))) if distance else 90.0
+                                 for east, north, up, distance in zip(e, n, u, distances)])
+        azimuts = array('d', [math.degrees(math.atan2(east, north)) % 360.0 for east, north in zip(e, n)])
+        return azimuts, elevations, distances
+    
+    def get_visible_stations(self, x : float, y : float, z : float) -> list:
+        """
+        Names of the stations seeing an ECEF position above their minimum
+        elevation.
+
+        Returns
+        -------
+        list
+            ['Grasse', 'Paris']
+
+        """
+        elevations = self.get_topocentric(x, y, z)[1]
+        return list(compress(self.names, map(operator.ge, elevations, self.min_elevations)))
+    
+    def get_nearest_stations(self, longitude : float, latitude : float, altitude : float = 0.0,
+                             count : int = 1) -> list:
+        """
+        Stations closest to a geodetic position, by straight-line distance.
+
+        Parameters
+        ----------
+        longitude : float
+            5.0 (deg)
+        latitude : float
+            45.0 (deg)
+        altitude : float, optional
+            0.0 (m)
+        count : int, optional
+            1
+
+        Returns
+        -------
+        list
+            [('Grasse', 145230.7)], the names and distances (m) in increasing
+            distance order.
+
+        """
+        x, y, z = set_geodetic_to_ecef(longitude, latitude, altitude)
+        distances = array('d', map(math.hypot, map(operator.sub, repeat(x), self.x),
+                                   map(operator.sub, repeat(y), self.y), map(operator.sub, repeat(z), self.z)))
+        indexes = heapq.nsmallest(count, range(len(distances)), key = distances.__getitem__)
+        return [(self.names[index], distances[index]) for index in indexes]
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __contains__(self, name : str) -> bool:
+        return name.casefold() in self.index
+    
+    def __iter__(self):
+        return iter(self.names)
+    
+    def __repr__(self) -> str:
+        return f"Station_Table({len(self)} stations)"
+
+class Stations_Geometry():
+    
+    def __init__(self, stations_ref_file_parser : Stations_Ref_File_Parser,
+                 sat_geographical_coordinates : Sat_Geographical_Coordinates,
+                 sat_altitude : Sat_Altitude, names : list = None) -> None:
+        """
+        This class aims at computing the azimut, elevation, distance and
+        visibility of the satellite for every ground station of a
+        Stations_ref.txt file at once, from the Sat_GEOGRAPHICAL_COORDINATES
+        and Sat_SATELLITE_ALTITUDE files. The station ECEF positions and
+        ENU rotations are those of the station table of the file (see
+        Station_Table.get_topocentric), the geometry being keyed by the names
+        of the file whatever the case or mnemonic given in names.
+
+        Parameters
+        ----------
+        stations_ref_file_parser : Stations_Ref_File_Parser
+            Stations_Ref_File_Parser(Stations_ref.txt)
+        sat_geographical_coordinates : Sat_Geographical_Coordinates
+            Sat_Geographical_Coordinates(Sat_GEOGRAPHICAL_COORDINATES.txt)
+        sat_altitude : Sat_Altitude
+            Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+        names : list, optional
+            ["Grasse"]. The default is every station of the file.
+
+        Raises
+        ------
+        ValueError
+            The files must share at least one date.
+
+        Returns
+        -------
+        None
+
+        """
+        self.stations = stations_ref_file_parser
+        if names is None:
+            names = list(self.stations.ground_stations_data)
+        self.names = [self.stations.get_ground_station_name(name) for name in names]
+        self.epochs, longitudes, latitudes, altitudes = self.get_ground_track(sat_geographical_coordinates,
+                                                                              sat_altitude)
+        if not self.epochs:
+            raise ValueError("The ground track and altitude files have no date in common.")
+        self.geometry = self.get_geometry(longitudes, latitudes, altitudes)
+    
+    def get_ground_track(self, sat_geographical_coordinates : Sat_Geographical_Coordinates,
+                         sat_altitude : Sat_Altitude) -> tuple:
+        """
+        Align the ground track and the altitude of the satellite on their
+        common dates.
+
+        Returns
+        -------
+        tuple
+            (epochs, longitudes (deg), latitudes (deg), altitudes (m))
+
+        """
+        altitude_axis = sat_altitude.get_results().epochs
+        indexes, altitude_indexes = [], []
+        for index, epoch in enumerate(sat_geographical_coordinates.get_results().epochs):
+            altitude_index = altitude_axis.find(epoch)
+            if altitude_index >= 0:
+                indexes.append(index)
+                altitude_indexes.append(altitude_index)
+        epochs = sat_geographical_coordinates.get_results().get_epochs(indexes)
+        altitudes = sat_altitude.get_sat_altitudes(altitude_indexes)
+        return (epochs, sat_geographical_coordinates.get_sat_longitudes(indexes),
+                sat_geographical_coordinates.get_sat_latitudes(indexes), altitudes)
+    
+    def get_geometry(self, longitudes : array, latitudes : array, altitudes : array) -> dict:
+        """
+        Compute the geometry of every station along the ground track, only
+        the selected stations being evaluated (see Station_Table.get_sub_table).
+
+        Returns
+        -------
+        dict
+            {'Grasse': {'azimut': array('d', [...]), 'elevation': array('d', [...]),
+                        'distance': array('d', [...]), 'visibility': array('B', [...])}}
+
+        """
+        geometry = {name : {"azimut" : array('d'), "elevation" : array('d'),
+                            "distance" : array('d'), "visibility" : array('B')} for name in self.names}
+        station_table = self.stations.get_station_table().get_sub_table(list(geometry))
+        stations = [(index, station_table.min_elevations[index], geometry[name])
+                    for index, name in enumerate(station_table.names)]
+        for longitude, latitude, altitude in zip(longitudes, latitudes, altitudes):
+            azimuts, elevations, distances = station_table.get_topocentric(*set_geodetic_to_ecef(longitude, latitude,
+                                                                                                 altitude))
+            for index, min_elevation, station_geometry in stations:
+                station_geometry["azimut"].append(azimuts[index])
+                station_geometry["elevation"].append(elevations[index])
+                station_geometry["distance"].append(distances[index])
+                station_geometry["visibility"].append(elevations[index] >= min_elevation)
+        return geometry
+    
+    def get_epochs(self) -> array:
+        return self.epochs
+    
+    def get_station_names(self) -> list:
+        return self.names
+    
+    def get_station_geometry(self, name : str) -> dict:
+        return self.geometry[self.stations.get_ground_station_name(name)]
+    
+    def get_sat_azimuts(self, name : str) -> array:
+        return self.get_station_geometry(name)["azimut"]
+    
+    def get_sat_elevations(self, name : str) -> array:
+        return self.get_station_geometry(name)["elevation"]
+    
+    def get_sat_distances_to_ground_station(self, name : str) -> array:
+        return self.get_station_geometry(name)["distance"]
+    
+    def get_sat_visibilities(self, name : str) -> array:
+        return self.get_station_geometry(name)["visibility"]
+    
+    def get_visible_stations(self, index : int) -> list:
+        return [name for name in self.names if self.geometry[name]["visibility"][index]]
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Integrity checks of the rows of the "sat" files: gaps, duplicate or
+backward dates, malformed rows and values out of their range, summarized
+instead of raised row by row.
+"""
+import datetime as dt
+import math
+from collections import Counter
+
+from simu_cic_file_manager import CONTENT_REGISTRY, File, set_datetime_to_epoch
+
+# Kinds of issues, in the order of the reports.
+ISSUE_KINDS = {"gap" : "gaps", "duplicate" : "duplicate dates", "backward" : "backward dates",
+               "column_count" : "rows with a wrong number of columns", "invalid_value" : "unparsable values",
+               "out_of_range_value" : "values out of range", "outside_start_stop" : "rows outside START_TIME/STOP_TIME"}
+
+# Valid bounds (inclusive) of the value columns, by column name.
+VALUE_RANGES = {"distance (km)" : (0.0, math.inf), "orbit number" : (0, math.inf),
+                "azimut (deg)" : (0.0, 360.0), "elevation (deg)" : (-90.0, 90.0),
+                "sun_eclipse_ratio (%)" : (0.0, 100.0), "station_visibility" : (0, 1),
+                "longitude (deg)" : (-180.0, 360.0), "latitude (deg)" : (-90.0, 90.0)}
+
+DAY = 86400000000
+
+def set_header_date_to_epoch(date) -> int:
+    """
+    Epoch of a START_TIME/STOP_TIME, as read or as formatted.
+
+    Parameters
+    ----------
+    date : str or dt.datetime
+        '2021-06-22T00:00:00.000' or dt.datetime(2021, 6, 22, 0, 0)
+
+    Returns
+    -------
+    int
+        5130720000000000
+
+    """
+    if isinstance(date, str):
+        date = dt.datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f')
+    return set_datetime_to_epoch(date)
+
+class Integrity_Report():
+    
+    def __init__(self, filepath : str, row_count : int, step : int, issues : dict, missing_samples : int = 0) -> None:
+        """
+        Compact summary of the integrity issues of a "sat" file: the number
+        of occurrences of each kind of ISSUE_KINDS and the indexes of their
+        first rows (data rows, counted from 0 after META_STOP).
+
+        Parameters
+        ----------
+        filepath : str
+            Sat_DISTANCE_GROUND_STATION_1.txt
+        row_count : int
+            3, the number of data rows.
+        step : int
+            10000000, the nominal sampling step in microseconds.
+        issues : dict
+            {'gap': (1, [2]), 'duplicate': (0, []), ...}, the count and the
+            first row indexes of each kind.
+        missing_samples : int, optional
+            5, the number of samples missing in the gaps.
+
+        Returns
+        -------
+        None
+
+        """
+        self.filepath = filepath
+        self.row_count = row_count
+        self.step = step
+        self.issues = issues
+        self.missing_samples = missing_samples
+    
+    def get_count(self, kind : str) -> int:
+        return self.issues[kind][0]
+    
+    def get_rows(self, kind : str) -> list:
+        return self.issues[kind][1]
+    
+    def get_summary(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            {'gap': 1, 'duplicate': 0, 'backward': 0, ...}
+
+        """
+        return {kind : count for kind, (count, _) in self.issues.items()}
+    
+    def is_valid(self) -> bool:
+        return not any(count for count, _ in self.issues.values())
+    
+    def __str__(self) -> str:
+        lines = [f"{self.filepath}: {self.row_count} rows, step {self.step / 1e6:g} s"]
+        for kind, (count, rows) in self.issues.items():
+            if count:
+                detail = f", {self.missing_samples} missing samples" if kind == "gap" else ""
+                lines.append(f"  {count} {ISSUE_KINDS[kind]}{detail} (rows {rows}{', ...' if count > len(rows) else ''})")
+        if len(lines) == 1:
+            lines[0] += ", no issue"
+        return "\n".join(lines)
+    
+    def __repr__(self) -> str:
+        return f"Integrity_Report({self.filepath}, {self.get_summary()})"
+
+class Integrity_Checker():
+    
+    def __init__(self, simulation_informations : dict, step : int = None, max_examples : int = 5,
+                 filepath : str = None) -> None:
+        """
+        This class aims at checking the rows of a "sat" file one by one while
+        they are read, either in the parse loop of Sat_File_Parser
+        (check_integrity = True) or by scan_integrity. Only counters and the
+        first row indexes of each issue are kept, the differences between
+        consecutive dates being counted by value: the nominal step is the
+        most frequent one unless given.
+
+        Parameters
+        ----------
+        simulation_informations : dict
+            {'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_1', 'START_TIME': '2021-06-22T00:00:00.000',
+             'STOP_TIME': '2022-06-22T00:00:00.000', ...}, raw or formatted.
+        step : int, optional
+            10000000, the nominal sampling step in microseconds.
+        max_examples : int, optional
+            5, the number of row indexes kept for each kind of issue.
+        filepath : str, optional
+            Sat_DISTANCE_GROUND_STATION_1.txt, the name given to the report.
+
+        Returns
+        -------
+        None
+
+        """
+        content_type = CONTENT_REGISTRY.get(simulation_informations.get('USER_DEFINED_CONTENT', ''))
+        column_names = content_type.column_names if content_type is not None else []
+        self.filepath = filepath
+        self.width = len(column_names) + 2 if content_type is not None else None
+        self.ranges = [VALUE_RANGES.get(column_name, (-math.inf, math.inf)) for column_name in column_names]
+        self.start = set_header_date_to_epoch(simulation_informations['START_TIME']) \
+            if simulation_informations.get('START_TIME') else -2**63
+        self.stop = set_header_date_to_epoch(simulation_informations['STOP_TIME']) \
+            if simulation_informations.get('STOP_TIME') else 2**63 - 1
+        self.step = step
+        self.max_examples = max_examples
+        self.row_count = 0
+        self.previous_epoch = None
+        self.issues = {kind : [0, []] for kind in ISSUE_KINDS}
+        self.deltas = Counter()
+        self.delta_rows = {}
+    
+    def add_issue(self, kind : str, row : int) -> None:
+        issue = self.issues[kind]
+        issue[0] += 1
+        if len(issue[1]) < self.max_examples:
+            issue[1].append(row)
+    
+    def check(self, simulation_result : list):
+        """
+        Checks one tokenized row.
+
+        Parameters
+        ----------
+        simulation_result : list
+            ['59409', '1020.00000', '1096.411']
+
+        Returns
+        -------
+        int
+            5132938620000000, the epoch of the row, None when the row cannot
+            be parsed (wrong number of columns or unparsable value).
+
+        """
+        row = self.row_count
+        self.row_count += 1
+        if self.width is None:
+            self.width = len(simulation_result)
+            self.ranges = [(-math.inf, math.inf)] * (self.width - 2)
+        if len(simulation_result) != self.width:
+            self.add_issue("column_count", row)
+            return None
+        try:
+            epoch = round(float(simulation_result[0]) * DAY) + round(float(simulation_result[1]) * 1000000)
+            values = [float(value) for value in simulation_result[2:]]
+        except ValueError:
+            self.add_issue("invalid_value", row)
+            return None
+        previous_epoch = self.previous_epoch
+        if previous_epoch is not None:
+            delta = epoch - previous_epoch
+            if delta > 0:
+                self.deltas[delta] += 1
+                rows = self.delta_rows.setdefault(delta, [])
+                if len(rows) < self.max_examples:
+                    rows.append(row)
+            elif delta == 0:
+                self.add_issue("duplicate", row)
+            else:
+                self.add_issue("backward", row)
+        self.previous_epoch = epoch
+        if not self.start <= epoch <= self.stop:
+            self.add_issue("outside_start_stop", row)
+        for (minimum, maximum), value in zip(self.ranges, values):
+            if not minimum <= value <= maximum:
+                self.add_issue("out_of_range_value", row)
+                break
+        return epoch
+    
+    def get_step(self) -> int:
+        if self.step is not None:
+            return self.step
+        if not self.deltas:
+            return 0
+        return min(self.deltas, key = lambda delta : (-self.deltas[delta], delta))
+    
+    def get_report(self) -> Integrity_Report:
+        step = self.get_step()
+        issues = {kind : (count, list(rows)) for kind, (count, rows) in self.issues.items()}
+        gaps = [delta for delta in self.deltas if step and delta > step]
+        gap_rows = sorted(row for delta in gaps for row in self.delta_rows[delta])[:self.max_examples]
+        issues["gap"] = (sum(self.deltas[delta] for delta in gaps), gap_rows)
+        missing_samples = sum(self.deltas[delta] * ((delta - 1) // step) for delta in gaps)
+        return Integrity_Report(self.filepath, self.row_count, step, issues, missing_samples)
+
+def read_header(file) -> dict:
+    """
+    Reads the "KEY = VALUE" lines of a header up to META_STOP, leaving the
+    file at the first data row (see Sat_File_Parser.get_simulation_informations).
+    """
+    simulation_informations = {}
+    for line in file:
+        line = line.strip()
+        if line == 'META_STOP':
+            break
+        line_datas = line.split(' = ')
+        if len(line_datas) == 2:
+            simulation_informations[line_datas[0].strip()] = line_datas[1].strip()
+    return simulation_informations
+
+def scan_integrity(filepath : str, step : int = None, max_examples : int = 5) -> Integrity_Report:
+    """
+    Checks a "sat" file in one streaming pass, without storing its rows.
+
+    Parameters
+    ----------
+    filepath : str
+        Sat_DISTANCE_GROUND_STATION_1.txt, optionally compressed.
+    step : int, optional
+        10000000, see Integrity_Checker.
+    max_examples : int, optional
+        5, see Integrity_Checker.
+
+    Returns
+    -------
+    Integrity_Report
+        Integrity_Report(Sat_DISTANCE_GROUND_STATION_1.txt, {'gap': 0, 'duplicate': 0, ...})
+
+    """
+    file = File(filepath)
+    with file.open_text() as text:
+        integrity_checker = Integrity_Checker(read_header(text), step, max_examples, file.filepath)
+        check = integrity_checker.check
+        for line in text:
+            simulation_result = line.split()
+            if simulation_result:
+                check(simulation_result)
+    return integrity_checker.get_report()
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Interpolation of the columns of the "sat" files at arbitrary epochs, with
+linear, Lagrange and Hermite methods and the angles unwrapped across 360.
+"""
+import datetime as dt
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+from simu_cic_file_manager import CONTENT_REGISTRY, Sat_File_Parser, set_datetime_to_epoch
+
+# Columns whose values wrap around, such as 359.77 -> 0.4 deg for the
+# longitudes. The latitudes and elevations do not wrap.
+COLUMN_PERIODS = {"longitude (deg)" : 360.0, "azimut (deg)" : 360.0}
+
+METHODS = ["linear", "lagrange", "hermite"]
+
+def set_unwrapped(values : array, period : float) -> array:
+    """
+    Removes the jumps of more than half a period between consecutive values.
+
+    Parameters
+    ----------
+    values : array
+        array('d', [359.089225, 359.766168, 0.4])
+    period : float
+        360.0
+
+    Returns
+    -------
+    array
+        array('d', [359.089225, 359.766168, 360.4])
+
+    """
+    unwrapped = array('d', values)
+    offset = 0.0
+    half_period = period / 2
+    for index in range(1, len(unwrapped)):
+        difference = values[index] - values[index - 1]
+        if difference > half_period:
+            offset -= period
+        elif difference < -half_period:
+            offset += period
+        unwrapped[index] = values[index] + offset
+    return unwrapped
+
+class Interpolator():
+    
+    def __init__(self, sat_file_parser : Sat_File_Parser, index : int = 1, method : str = "linear",
+                 order : int = 4, period : float = None) -> None:
+        """
+        This class aims at evaluating a column of a "sat" file between its
+        samples. The column is unwrapped once when its values are periodic
+        (see COLUMN_PERIODS), and every interpolated value is wrapped back
+        into [0, period). A query falling in a gap of the time axis (two
+        samples further apart than its step, see Time_Axis.get_step) or
+        outside of it evaluates to NaN, the stencils never crossing a gap.
+
+        Parameters
+        ----------
+        sat_file_parser : Sat_File_Parser
+            Sat_Geographical_Coordinates(Sat_GEOGRAPHICAL_COORDINATES.txt)
+        index : int, optional
+            1, the column index as in get_results()[i][1].
+        method : str, optional
+            "linear" (default), "lagrange" (polynomial through order samples
+            around the query) or "hermite" (cubic Hermite spline with
+            tangents estimated by finite differences).
+        order : int, optional
+            4, the number of samples of the Lagrange polynomials.
+        period : float, optional
+            360.0. The default is the period of the column in COLUMN_PERIODS,
+            if any.
+
+        Raises
+        ------
+        ValueError
+            - method must be in METHODS.
+            - order must be at least 2.
+
+        Returns
+        -------
+        None
+
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be in {METHODS}.")
+        if order < 2:
+            raise ValueError("order must be at least 2.")
+        results = sat_file_parser.get_results()
+        if period is None:
+            content_type = CONTENT_REGISTRY.get(sat_file_parser.get_user_defined_content())
+            if content_type is not None:
+                period = COLUMN_PERIODS.get(content_type.column_names[index - 1])
+        self.method = method
+        self.order = order
+        self.period = period
+        self.time_axis = results.epochs
+        self.step = self.time_axis.get_step()
+        self.epochs = None if self.time_axis.is_regular() else self.time_axis[:]
+        values = results.get_column(index)
+        self.values = set_unwrapped(values, period) if period else array('d', values)
+        self.breaks = self.get_breaks()
+        self.tangents = self.get_tangents() if method == "hermite" else None
+    
+    def get_epoch(self, index : int) -> int:
+        if self.epochs is None:
+            return self.time_axis.start + index * self.step
+        return self.epochs[index]
+    
+    def get_breaks(self) -> array:
+        """
+        Indexes i of the samples followed by a gap (epochs[i + 1] - epochs[i] > step).
+
+        Returns
+        -------
+        array
+            array('q', [2]), empty for a regular axis.
+
+        """
+        breaks = array('q')
+        if self.epochs is not None:
+            epochs, step = self.epochs, self.step
+            for index in range(len(epochs) - 1):
+                if epochs[index + 1] - epochs[index] > step:
+                    breaks.append(index)
+        return breaks
+    
+    def get_segment(self, index : int) -> tuple:
+        """
+        First and last indexes of the gap-free run of samples of index.
+        """
+        position = bisect_left(self.breaks, index)
+        first = self.breaks[position - 1] + 1 if position > 0 else 0
+        last = self.breaks[position] if position < len(self.breaks) else len(self.values) - 1
+        return first, last
+    
+    def get_tangents(self) -> array:
+        """
+        Time derivatives of the values at the samples (per microsecond), by
+        central differences inside a run of samples and one-sided ones at
+        its bounds.
+        """
+        count = len(self.values)
+        tangents = array('d', bytes(8 * count))
+        values, breaks = self.values, set(self.breaks)
+        for index in range(count):
+            previous = index - 1 if index > 0 and index - 1 not in breaks else index
+            following = index + 1 if index + 1 < count and index not in breaks else index
+            if following != previous:
+                tangents[index] = (values[following] - values[previous]) / \
+                    (self.get_epoch(following) - self.get_epoch(previous))
+        return tangents
+    
+    def get_interval(self, epoch : int) -> int:
+        """
+        Index i of the sample interval [epochs[i], epochs[i + 1]] holding the
+        epoch, -1 when the epoch is outside of the axis or in a gap.
+        """
+        count = len(self.values)
+        if self.epochs is None:
+            if not count or epoch < self.time_axis.start:
+                return -1
+            index = (epoch - self.time_axis.start) // self.step if self.step else 0
+        else:
+            index = bisect_right(self.epochs, epoch) - 1
+            if index < 0:
+                return -1
+        if index >= count - 1:
+            return count - 2 if index == count - 1 and epoch == self.get_epoch(count - 1) and count > 1 else -1
+        if self.get_epoch(index + 1) - self.get_epoch(index) > self.step and epoch != self.get_epoch(index):
+            return -1
+        return index
+    
+    def evaluate(self, epochs) -> array:
+        """
+        Values of the column at the given epochs, in one call.
+
+        Parameters
+        ----------
+        epochs : iterable
+            array('q', [5132938625000000, 5132938635000000]), microseconds
+            since the MJD epoch like the Time_Axis.
+
+        Returns
+        -------
+        array
+            array('d', [359.42, 0.1]), NaN outside of the samples.
+
+        """
+        if self.epochs is None and len(self.values) > 1:
+            return self.evaluate_regular(epochs)
+        values, period = self.values, self.period
+        get_interval, get_epoch = self.get_interval, self.get_epoch
+        interpolated = array('d')
+        append = interpolated.append
+        method = self.method
+        count = len(values)
+        for epoch in epochs:
+            index = get_interval(epoch)
+            if index < 0:
+                if count == 1 and epoch == get_epoch(0):
+                    append(values[0] % period if period else values[0])
+                else:
+                    append(math.nan)
+                continue
+            epoch_0, epoch_1 = get_epoch(index), get_epoch(index + 1)
+            if epoch == epoch_1:
+                value = values[index + 1]
+            elif method == "linear":
+                value = values[index] + (values[index + 1] - values[index]) * (epoch - epoch_0) / (epoch_1 - epoch_0)
+            elif method == "hermite":
+                value = self.get_hermite(index, epoch, epoch_0, epoch_1)
+            else:
+                value = self.get_lagrange(index, epoch)
+            append(value % period if period else value)
+        return interpolated
+    
+    def evaluate_regular(self, epochs) -> array:
+        """
+        evaluate on a regular time axis, where the interval of a query and
+        the position in its Lagrange stencil are found by one division, and
+        the denominators of the Lagrange weights are computed once.
+        """
+        values, period, method = self.values, self.period, self.method
+        start, step = self.time_axis.start, self.step
+        count = len(values)
+        last = count - 1
+        order = min(self.order, count)
+        nodes = range(order)
+        denominators = [math.prod(i - j for j in nodes if j != i) for i in nodes]
+        interpolated = array('d')
+        append = interpolated.append
+        for epoch in epochs:
+            index, remainder = divmod(epoch - start, step)
+            if not 0 <= index < last:
+                append((values[last] % period if period else values[last]) if index == last and not remainder else math.nan)
+                continue
+            if method == "linear":
+                value = values[index] + (values[index + 1] - values[index]) * remainder / step
+            elif method == "hermite":
+                value = self.get_hermite(index, epoch, start + index * step, start + (index + 1) * step)
+            else:
+                first = min(max(index - (order - 1) // 2, 0), count - order)
+                x = index - first + remainder / step
+                value = 0.0
+                for i in nodes:
+                    weight = values[first + i] / denominators[i]
+                    for j in nodes:
+                        if j != i:
+                            weight *= x - j
+                    value += weight
+            append(value % period if period else value)
+        return interpolated
+    
+    def get_hermite(self, index : int, epoch : int, epoch_0 : int, epoch_1 : int) -> float:
+        duration = epoch_1 - epoch_0
+        x = (epoch - epoch_0) / duration
+        x2, x3 = x * x, x * x * x
+        return ((2 * x3 - 3 * x2 + 1) * self.values[index] + (x3 - 2 * x2 + x) * duration * self.tangents[index] +
+                (-2 * x3 + 3 * x2) * self.values[index + 1] + (x3 - x2) * duration * self.tangents[index + 1])
+    
+    def get_lagrange(self, index : int, epoch : int) -> float:
+        first, last = self.get_segment(index)
+        order = min(self.order, last - first + 1)
+        start = min(max(index - (order - 1) // 2, first), last - order + 1)
+        epochs = [self.get_epoch(position) for position in range(start, start + order)]
+        value = 0.0
+        for i in range(order):
+            if epoch == epochs[i]:
+                return self.values[start + i]
+            weight = 1.0
+            for j in range(order):
+                if j != i:
+                    weight *= (epoch - epochs[j]) / (epochs[i] - epochs[j])
+            value += weight * self.values[start + i]
+        return value
+    
+    def evaluate_dates(self, dates : list) -> array:
+        """
+        Values of the column at the given dates.
+
+        Parameters
+        ----------
+        dates : list
+            [dt.datetime(2021, 7, 14, 0, 17, 5, tzinfo=dt.timezone.utc)],
+            naive datetimes being UTC.
+
+        Returns
+        -------
+        array
+            array('d', [1074.341])
+
+        """
+        return self.evaluate([set_datetime_to_epoch(date) for date in dates])
+    
+    def __call__(self, date : dt.datetime) -> float:
+        return self.evaluate((set_datetime_to_epoch(date),))[0]
+
+def interpolate(sat_file_parser : Sat_File_Parser, epochs, method : str = "linear", order : int = 4) -> list:
+    """
+    Interpolates every value column of a "sat" file at the given epochs.
+
+    Parameters
+    ----------
+    sat_file_parser : Sat_File_Parser
+        Sat_Position(Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt)
+    epochs : iterable
+        array('q', [5132938625000000]), see Interpolator.evaluate.
+    method : str, optional
+        "linear", see Interpolator.
+    order : int, optional
+        4, see Interpolator.
+
+    Returns
+    -------
+    list
+        [array('d', [201.0]), array('d', [30.16])], one array per column.
+
+    """
+    epochs = array('q', epochs)
+    return [Interpolator(sat_file_parser, index, method, order).evaluate(epochs)
+            for index in range(1, len(sat_file_parser.get_results().columns) + 1)]
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Interval algebra on the time axis of the simu-cic files, for contact,
+eclipse and custom windows.
+"""
+import datetime as dt
+from array import array
+from bisect import bisect_right
+from datetime import timedelta
+
+from simu_cic_file_manager import MJD_EPOCH, Sat_File_Parser, Sat_Visibility, Sat_Eclipse, \
+    Time_Axis, INTEGER_TYPECODES, set_datetime_to_epoch
+
+def get_mask_intervals(time_axis : Time_Axis, mask : bytearray) -> list:
+    """
+    Merges the consecutive samples of a mask into [start, stop) intervals of
+    epochs. A sample covers one step of the axis (see Time_Axis.get_step),
+    so that the gaps of files sampled only part of the time, such as the
+    station distances, split the intervals.
+
+    Parameters
+    ----------
+    time_axis : Time_Axis
+        Time_Axis of 3 epochs [100, 110, 120]
+    mask : bytearray
+        bytearray(b'\\x00\\x01\\x01')
+
+    Returns
+    -------
+    list
+        [(110, 130)]
+
+    """
+    intervals = []
+    count = len(mask)
+    step = time_axis.get_step()
+    regular = time_axis.is_regular()
+    index = mask.find(1)
+    while index >= 0:
+        end = mask.find(0, index)
+        if end < 0:
+            end = count
+        start = time_axis[index]
+        if not regular:
+            for position in range(index, end - 1):
+                if time_axis[position + 1] - time_axis[position] > step:
+                    intervals.append((start, time_axis[position] + step))
+                    start = time_axis[position + 1]
+        intervals.append((start, time_axis[end - 1] + step))
+        index = mask.find(1, end)
+    return intervals
+
+class Interval_Set():
+    
+    def __init__(self, intervals = ()) -> None:
+        """
+        Sorted set of disjoint non-empty [start, stop) time intervals, stored
+        as two array('q') of microseconds since the MJD epoch like the
+        Time_Axis of the "sat" files. The given intervals are sorted and
+        merged once, then the set operations walk both sets in O(n + m).
+
+        Parameters
+        ----------
+        intervals : iterable, optional
+            [(dt.datetime(2021, 7, 14, 0, 17), dt.datetime(2021, 7, 14, 0, 20))],
+            the bounds being datetimes (naive ones being UTC) or epochs.
+
+        Raises
+        ------
+        ValueError
+            The start of an interval cannot be after its stop.
+
+        Returns
+        -------
+        None
+
+        """
+        bounds = []
+        for start, stop in intervals:
+            if isinstance(start, dt.datetime):
+                start = set_datetime_to_epoch(start)
+            if isinstance(stop, dt.datetime):
+                stop = set_datetime_to_epoch(stop)
+            if start > stop:
+                raise ValueError(f"The interval starts after its stop ({start} > {stop}).")
+            if start < stop:
+                bounds.append((start, stop))
+        bounds.sort()
+        self.starts, self.stops = self.merge(bounds)
+    
+    @classmethod
+    def from_arrays(cls, starts : array, stops : array) -> "Interval_Set":
+        """
+        Builds a set from arrays of bounds that are already sorted, disjoint
+        and merged, without copying them.
+        """
+        interval_set = cls.__new__(cls)
+        interval_set.starts = starts
+        interval_set.stops = stops
+        return interval_set
+    
+    @classmethod
+    def from_mask(cls, time_axis : Time_Axis, mask : bytearray) -> "Interval_Set":
+        starts, stops = array('q'), array('q')
+        for start, stop in get_mask_intervals(time_axis, mask):
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return cls.from_arrays(starts, stops)
+    
+    @classmethod
+    def from_parser(cls, sat_file_parser : Sat_File_Parser, index : int = 1, function = bool) -> "Interval_Set":
+        """
+        Builds the set of the samples of a column for which function holds.
+
+        Parameters
+        ----------
+        sat_file_parser : Sat_File_Parser
+            Sat_Visibility(Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt)
+        index : int, optional
+            1, the column index as in get_results()[i][1].
+        function : callable, optional
+            lambda value : value > 10. The default is bool (non-zero values).
+
+        Returns
+        -------
+        Interval_Set
+            [(dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc),
+              dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc))]
+
+        """
+        results = sat_file_parser.get_results()
+        column = results.get_column(index)
+        if function is bool and column.typecode in INTEGER_TYPECODES:
+            mask = bytearray(value != 0 for value in column)
+        else:
+            mask = bytearray(bool(function(value)) for value in column)
+        return cls.from_mask(results.epochs, mask)
+    
+    @classmethod
+    def from_sat_visibility(cls, sat_visibility : Sat_Visibility) -> "Interval_Set":
+        return cls.from_parser(sat_visibility)
+    
+    @classmethod
+    def from_sat_eclipse(cls, sat_eclipse : Sat_Eclipse, minimum : float = 100.0, maximum : float = 100.0) -> "Interval_Set":
+        """
+        Dates where the eclipse ratio (%) is in [minimum, maximum], the full
+        eclipses by default.
+        """
+        return cls.from_parser(sat_eclipse, function = lambda ratio : minimum <= ratio <= maximum)
+    
+    def merge(self, bounds : list) -> tuple:
+        starts, stops = array('q'), array('q')
+        for start, stop in bounds:
+            if stops and start <= stops[-1]:
+                if stop > stops[-1]:
+                    stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+        return starts, stops
+    
+    def union(self, other : "Interval_Set") -> "Interval_Set":
+        starts, stops = array('q'), array('q')
+        i, j = 0, 0
+        count, other_count = len(self.starts), len(other.starts)
+        while i < count or j < other_count:
+            if j >= other_count or (i < count and self.starts[i] <= other.starts[j]):
+                start, stop = self.starts[i], self.stops[i]
+                i += 1
+            else:
+                start, stop = other.starts[j], other.stops[j]
+                j += 1
+            if stops and start <= stops[-1]:
+                if stop > stops[-1]:
+                    stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+        return Interval_Set.from_arrays(starts, stops)
+    
+    def intersection(self, other : "Interval_Set") -> "Interval_Set":
+        starts, stops = array('q'), array('q')
+        i, j = 0, 0
+        while i < len(self.starts) and j < len(other.starts):
+            start = max(self.starts[i], other.starts[j])
+            stop = min(self.stops[i], other.stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            if self.stops[i] < other.stops[j]:
+                i += 1
+            else:
+                j += 1
+        return Interval_Set.from_arrays(starts, stops)
+    
+    def difference(self, other : "Interval_Set") -> "Interval_Set":
+        starts, stops = array('q'), array('q')
+        j = 0
+        for start, stop in zip(self.starts, self.stops):
+            while j < len(other.starts) and other.stops[j] <= start:
+                j += 1
+            k = j
+            while k < len(other.starts) and other.starts[k] < stop:
+                if other.starts[k] > start:
+                    starts.append(start)
+                    stops.append(other.starts[k])
+                start = max(start, other.stops[k])
+                k += 1
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return Interval_Set.from_arrays(starts, stops)
+    
+    def complement(self, start : dt.datetime, stop : dt.datetime) -> "Interval_Set":
+        return Interval_Set([(start, stop)]).difference(self)
+    
+    def filter(self, min_duration : timedelta) -> "Interval_Set":
+        """
+        Keeps the intervals lasting at least min_duration.
+
+        Parameters
+        ----------
+        min_duration : timedelta
+            timedelta(minutes = 2)
+
+        Returns
+        -------
+        Interval_Set
+            The intervals lasting at least 2 minutes.
+
+        """
+        minimum = min_duration // timedelta(microseconds = 1)
+        keep = [index for index, (start, stop) in enumerate(zip(self.starts, self.stops)) if stop - start >= minimum]
+        return Interval_Set.from_arrays(array('q', [self.starts[index] for index in keep]),
+                                        array('q', [self.stops[index] for index in keep]))
+    
+    def get_durations(self) -> array:
+        return array('q', [stop - start for start, stop in zip(self.starts, self.stops)])
+    
+    def get_coverage(self) -> timedelta:
+        return timedelta(microseconds = sum(self.stops) - sum(self.starts))
+    
+    def contains(self, date : dt.datetime) -> bool:
+        epoch = set_datetime_to_epoch(date)
+        index = bisect_right(self.starts, epoch) - 1
+        return index >= 0 and epoch < self.stops[index]
+    
+    def __or__(self, other):
+        return self.union(other)
+    
+    def __and__(self, other):
+        return self.intersection(other)
+    
+    def __sub__(self, other):
+        return self.difference(other)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def __getitem__(self, index : int) -> tuple:
+        return (MJD_EPOCH + timedelta(microseconds = self.starts[index]),
+                MJD_EPOCH + timedelta(microseconds = self.stops[index]))
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Interval_Set):
+            return self.starts == other.starts and self.stops == other.stops
+        if isinstance(other, (list, tuple)):
+            return list(self) == [tuple(interval) for interval in other]
+        return NotImplemented
+
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"Interval_Set({list(self)!r})"
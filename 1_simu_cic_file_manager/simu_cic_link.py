@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Link budget along the distance and direction files of a ground station:
+free-space path loss, range rate and Doppler shift, elevation dependent
+margins and downlink volume per pass.
+"""
+import math
+from array import array
+from datetime import timedelta
+
+from simu_cic_file_manager import MJD_EPOCH, Sat_Distance_To_Ground_Station, Sat_Position
+from simu_cic_intervals import get_mask_intervals
+
+SPEED_OF_LIGHT = 299792458.0
+BOLTZMANN_CONSTANT_DB = -228.5992
+
+class Link_Configuration():
+    
+    def __init__(self, frequency : float, eirp : float, g_over_t : float, data_rate : float,
+                 required_eb_n0 : float, losses : float = 0.0, zenith_atmospheric_loss : float = 0.0,
+                 min_elevation : float = 0.0) -> None:
+        """
+        Simple downlink configuration.
+
+        Parameters
+        ----------
+        frequency : float
+            8.2e9 (Hz)
+        eirp : float
+            10.0 (dBW), equivalent isotropic radiated power of the satellite.
+        g_over_t : float
+            30.0 (dB/K), figure of merit of the ground station.
+        data_rate : float
+            100e6 (bit/s)
+        required_eb_n0 : float
+            4.5 (dB), including the implementation losses of the modem.
+        losses : float, optional
+            2.0 (dB), constant losses (pointing, polarization, ...).
+        zenith_atmospheric_loss : float, optional
+            0.5 (dB), atmospheric loss at zenith, scaled by 1 / sin(elevation).
+        min_elevation : float, optional
+            5.0 (deg), elevation below which the link is not used.
+
+        Raises
+        ------
+        ValueError
+            frequency and data_rate must be positive.
+
+        Returns
+        -------
+        None
+
+        """
+        if frequency <= 0 or data_rate <= 0:
+            raise ValueError("frequency and data_rate must be positive.")
+        self.frequency = frequency
+        self.eirp = eirp
+        self.g_over_t = g_over_t
+        self.data_rate = data_rate
+        self.required_eb_n0 = required_eb_n0
+        self.losses = losses
+        self.zenith_atmospheric_loss = zenith_atmospheric_loss
+        self.min_elevation = min_elevation
+
+class Link_Analysis():
+    
+    def __init__(self, sat_distance_to_ground_station : Sat_Distance_To_Ground_Station,
+                 link_configuration : Link_Configuration, sat_position : Sat_Position = None) -> None:
+        """
+        This class aims at computing a link budget over a whole
+        Sat_DISTANCE_GROUND_STATION file at once, every quantity being
+        returned as a typed array aligned on the samples of the distance file.
+        The optional Sat_SATELLITE_DIRECTION file of the same station gives
+        the elevations used by the atmospheric loss and the minimum elevation.
+
+        Parameters
+        ----------
+        sat_distance_to_ground_station : Sat_Distance_To_Ground_Station
+            Sat_Distance_To_Ground_Station(Sat_DISTANCE_GROUND_STATION_1.txt)
+        link_configuration : Link_Configuration
+            Link_Configuration(8.2e9, 10.0, 30.0, 100e6, 4.5)
+        sat_position : Sat_Position, optional
+            Sat_Position(Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt)
+
+        Returns
+        -------
+        None
+
+        """
+        self.link_configuration = link_configuration
+        self.time_axis = sat_distance_to_ground_station.get_results().epochs
+        self.distances = sat_distance_to_ground_station.get_sat_distances_to_ground_station()
+        self.elevations = None
+        if sat_position is not None:
+            self.elevations = self.get_aligned_elevations(sat_position)
+    
+    def get_aligned_elevations(self, sat_position : Sat_Position) -> array:
+        """
+        Elevations of the direction file at the dates of the distance file,
+        NaN where the direction file has no sample.
+
+        Returns
+        -------
+        array
+            array('d', [29.24913, 31.08049, 32.95857])
+
+        """
+        position_axis = sat_position.get_results().epochs
+        elevations = sat_position.get_results().get_column(2)
+        elevations_at_epochs = array('d')
+        for epoch in self.time_axis:
+            index = position_axis.find(epoch)
+            elevations_at_epochs.append(elevations[index] if index >= 0 else math.nan)
+        return elevations_at_epochs
+    
+    def get_free_space_path_losses(self) -> array:
+        """
+        Free-space path loss 20 log10(4 pi d f / c) of every sample.
+
+        Returns
+        -------
+        array
+            array('d', [171.5, 171.1, 170.8]) (dB)
+
+        """
+        offset = 20 * math.log10(4 * math.pi * self.link_configuration.frequency / SPEED_OF_LIGHT)
+        return array('d', [20 * math.log10(distance) + offset for distance in self.distances])
+    
+    def get_range_rates(self) -> array:
+        """
+        Time derivative of the distance, by central differences inside a pass
+        and one-sided differences at its bounds. Samples further apart than
+        one step of the time axis belong to different passes.
+
+        Returns
+        -------
+        array
+            array('d', [-4414.0, -4273.35, -4132.7]) (m/s)
+
+        """
+        count = len(self.distances)
+        step = self.time_axis.get_step()
+        epochs = self.time_axis[:]
+        range_rates = array('d', bytes(8 * count))
+        for index in range(count):
+            previous = index - 1 if index > 0 and epochs[index] - epochs[index - 1] <= step else index
+            following = index + 1 if index + 1 < count and epochs[index + 1] - epochs[index] <= step else index
+            if following != previous:
+                range_rates[index] = (self.distances[following] - self.distances[previous]) * 1e6 / \
+                    (epochs[following] - epochs[previous])
+        return range_rates
+    
+    def get_doppler_shifts(self) -> array:
+        """
+        Doppler shift -f rdot / c of the carrier.
+
+        Returns
+        -------
+        array
+            array('d', [120732.9, 116885.8, 113038.7]) (Hz)
+
+        """
+        factor = -self.link_configuration.frequency / SPEED_OF_LIGHT
+        return array('d', [factor * range_rate for range_rate in self.get_range_rates()])
+    
+    def get_atmospheric_losses(self) -> array:
+        zenith_atmospheric_loss = self.link_configuration.zenith_atmospheric_loss
+        if self.elevations is None or zenith_atmospheric_loss == 0:
+            return array('d', bytes(8 * len(self.distances)))
+        return array('d', [zenith_atmospheric_loss / max(math.sin(math.radians(elevation)), 0.01)
+                           if elevation == elevation else math.inf for elevation in self.elevations])
+    
+    def get_link_margins(self) -> array:
+        """
+        Eb/N0 margin of every sample:
+        EIRP - FSPL - losses - atmospheric loss + G/T - k - 10 log10(R) - Eb/N0 required.
+        The samples below the minimum elevation have a -inf margin.
+
+        Returns
+        -------
+        array
+            array('d', [9.6, 10.0, 10.4]) (dB)
+
+        """
+        configuration = self.link_configuration
+        constant = configuration.eirp - configuration.losses + configuration.g_over_t - BOLTZMANN_CONSTANT_DB - \
+            10 * math.log10(configuration.data_rate) - configuration.required_eb_n0
+        margins = array('d', [constant - loss - atmospheric_loss for loss, atmospheric_loss
+                              in zip(self.get_free_space_path_losses(), self.get_atmospheric_losses())])
+        if self.elevations is not None:
+            for index, elevation in enumerate(self.elevations):
+                if not elevation >= configuration.min_elevation:
+                    margins[index] = -math.inf
+        return margins
+    
+    def get_pass_volumes(self) -> list:
+        """
+        Downlinked data volume of every pass, a pass being a run of samples
+        without gap and the link being used on the samples with a
+        non-negative margin.
+
+        Returns
+        -------
+        list
+            [(dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc),
+              dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc), 3000000000.0)] (bit)
+
+        """
+        step = self.time_axis.get_step()
+        margins = self.get_link_margins()
+        pass_volumes = []
+        for start, stop in get_mask_intervals(self.time_axis, bytearray(b'\x01') * len(margins)):
+            first, last = self.time_axis.search(start), self.time_axis.search(stop)
+            usable = sum(1 for margin in margins[first:last] if margin >= 0)
+            pass_volumes.append((MJD_EPOCH + timedelta(microseconds = start), MJD_EPOCH + timedelta(microseconds = stop),
+                                 usable * step * 1e-6 * self.link_configuration.data_rate))
+        return pass_volumes
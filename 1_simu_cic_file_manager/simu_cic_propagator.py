@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Analytic mean-element J2 propagation of the initial conditions of
+simu_cic_info.txt, producing the ground track, altitude and orbit number
+files of a run without running the simu-cic software.
+"""
+import datetime as dt
+import math
+from array import array
+from datetime import timedelta
+
+from simu_cic_file_manager import CONTENT_REGISTRY, MJD_EPOCH, Simu_Cic_Info_File_Parser, \
+    Simulation_Results, Sat_Altitude, Sat_Geographical_Coordinates, Sat_Orbit_Number, Time_Axis, \
+    set_datetime_to_epoch
+from simu_cic_geometry import WGS84_SEMI_MAJOR_AXIS, set_ecef_to_geodetic
+
+EARTH_GRAVITATIONAL_PARAMETER = 3.986004418e14
+EARTH_J2 = 1.08262668e-3
+MJD_J2000 = 51544.5
+
+def get_time_axis(start : dt.datetime, stop : dt.datetime, step : timedelta) -> Time_Axis:
+    """
+    Regular time grid from start to stop included.
+
+    Parameters
+    ----------
+    start : dt.datetime
+        dt.datetime(2021, 1, 1)
+    stop : dt.datetime
+        dt.datetime(2021, 1, 2)
+    step : timedelta
+        timedelta(seconds = 10)
+
+    Raises
+    ------
+    ValueError
+        step must be positive.
+
+    Returns
+    -------
+    Time_Axis
+        Implicit Time_Axis of 8641 epochs.
+
+    """
+    step = step // timedelta(microseconds = 1)
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    time_axis = Time_Axis()
+    for epoch in range(set_datetime_to_epoch(start), set_datetime_to_epoch(stop) + 1, step):
+        time_axis.append(epoch)
+    return time_axis
+
+def get_mean_sun_right_ascension(epoch : int) -> float:
+    """
+    Right ascension of the mean sun, the reference of the mean local times.
+
+    Parameters
+    ----------
+    epoch : int
+        5132938620000000 (microseconds since the MJD epoch)
+
+    Returns
+    -------
+    float
+        1.9... (rad)
+
+    """
+    days = epoch / 86400e6 - MJD_J2000
+    return math.radians(280.46 + 0.9856474 * days) % (2 * math.pi)
+
+def get_greenwich_sidereal_angle(epoch : int) -> float:
+    days = epoch / 86400e6 - MJD_J2000
+    return math.radians(280.46061837 + 360.98564736629 * days) % (2 * math.pi)
+
+class J2_Propagator():
+    
+    def __init__(self, date : dt.datetime, altitude : float, eccentricity : float, inclination : float,
+                 argument_of_perigee : float, mltan : float, argument_of_latitude : float,
+                 object_name : str = "Sat", first_orbit_number : int = 1) -> None:
+        """
+        This class aims at propagating mean orbital elements under the
+        secular effect of J2 (drifts of the ascending node, of the perigee and
+        of the mean anomaly), which is what the "Mean J2 orbital period" of
+        simu_cic_info.txt refers to. Short periodic terms are neglected, so
+        the positions are those of the mean orbit, within a few kilometres of
+        a numerical propagation over days.
+
+        Parameters
+        ----------
+        date : dt.datetime
+            dt.datetime(2021, 1, 1), the date of the initial conditions (UTC).
+        altitude : float
+            607.942 (km), semi-major axis minus the equatorial radius.
+        eccentricity : float
+            0.0023903
+        inclination : float
+            97.815 (deg)
+        argument_of_perigee : float
+            118.055 (deg)
+        mltan : float
+            1.0 (h), mean local time of the ascending node.
+        argument_of_latitude : float
+            24.699 (deg)
+        object_name : str, optional
+            "Sat", the OBJECT_NAME of the generated files.
+        first_orbit_number : int, optional
+            1, the orbit number at the initial date, incremented at each
+            ascending node.
+
+        Raises
+        ------
+        ValueError
+            - eccentricity must be in [0, 1).
+            - The perigee must be above the surface of the Earth.
+
+        Returns
+        -------
+        None
+
+        """
+        semi_major_axis = WGS84_SEMI_MAJOR_AXIS + altitude * 1e3
+        if not 0 <= eccentricity < 1:
+            raise ValueError("eccentricity must be in [0, 1).")
+        if semi_major_axis * (1 - eccentricity) <= WGS84_SEMI_MAJOR_AXIS:
+            raise ValueError("The perigee must be above the surface of the Earth.")
+        self.object_name = object_name
+        self.first_orbit_number = first_orbit_number
+        self.epoch = set_datetime_to_epoch(date)
+        self.semi_major_axis = semi_major_axis
+        self.eccentricity = eccentricity
+        self.inclination = math.radians(inclination)
+        self.argument_of_perigee = math.radians(argument_of_perigee)
+        self.right_ascension = (get_mean_sun_right_ascension(self.epoch) + math.radians((mltan - 12) * 15)) % (2 * math.pi)
+        true_anomaly = math.radians(argument_of_latitude) - self.argument_of_perigee
+        eccentric_anomaly = math.atan2(math.sqrt(1 - eccentricity ** 2) * math.sin(true_anomaly),
+                                       eccentricity + math.cos(true_anomaly))
+        self.mean_anomaly = eccentric_anomaly - eccentricity * math.sin(eccentric_anomaly)
+        self.argument_of_latitude = math.radians(argument_of_latitude) % (2 * math.pi)
+        mean_motion = math.sqrt(EARTH_GRAVITATIONAL_PARAMETER / semi_major_axis ** 3)
+        factor = 1.5 * EARTH_J2 * (WGS84_SEMI_MAJOR_AXIS / (semi_major_axis * (1 - eccentricity ** 2))) ** 2 * mean_motion
+        cos_inclination = math.cos(self.inclination)
+        self.right_ascension_rate = -factor * cos_inclination
+        self.argument_of_perigee_rate = factor / 2 * (5 * cos_inclination ** 2 - 1)
+        self.mean_anomaly_rate = mean_motion + factor / 2 * math.sqrt(1 - eccentricity ** 2) * (3 * cos_inclination ** 2 - 1)
+    
+    @classmethod
+    def from_simu_cic_info(cls, simu_cic_info_file_parser : Simu_Cic_Info_File_Parser,
+                           first_orbit_number : int = 1) -> "J2_Propagator":
+        """
+        Propagator of the initial conditions of a simu_cic_info.txt file.
+
+        Parameters
+        ----------
+        simu_cic_info_file_parser : Simu_Cic_Info_File_Parser
+            Simu_Cic_Info_File_Parser(simu_cic_info.txt)
+        first_orbit_number : int, optional
+            1, see J2_Propagator.
+
+        Returns
+        -------
+        J2_Propagator
+            J2_Propagator of the satellite of the run.
+
+        """
+        info = simu_cic_info_file_parser
+        return cls(info.get_initial_conditions_date(), info.get_initial_conditions_altitude(),
+                   info.get_initial_conditions_eccentricity(), info.get_initial_conditions_inclination(),
+                   info.get_initial_conditions_argument_of_perigee(), info.get_initial_conditions_mltan(),
+                   info.get_initial_conditions_argument_of_latitude(), info.get_satellite_name(),
+                   first_orbit_number)
+    
+    def get_nodal_period(self) -> float:
+        """
+        Mean period between two ascending nodes, to be compared with the
+        "Mean J2 orbital period" of simu_cic_info.txt.
+
+        Returns
+        -------
+        float
+            1.615 (h)
+
+        """
+        return 2 * math.pi / (self.mean_anomaly_rate + self.argument_of_perigee_rate) / 3600
+    
+    def get_mltan(self, date : dt.datetime) -> float:
+        """
+        Mean local time of the ascending node at the given date, constant
+        for a sun-synchronous orbit.
+
+        Returns
+        -------
+        float
+            1.0 (h)
+
+        """
+        epoch = set_datetime_to_epoch(date)
+        right_ascension = self.right_ascension + self.right_ascension_rate * (epoch - self.epoch) * 1e-6
+        return (math.degrees(right_ascension - get_mean_sun_right_ascension(epoch)) / 15 + 12) % 24
+    
+    def propagate(self, time_axis : Time_Axis) -> dict:
+        """
+        Ground track, altitude and orbit number at every epoch of the time
+        axis, computed in one pass with the secular rates evaluated once.
+
+        Parameters
+        ----------
+        time_axis : Time_Axis
+            get_time_axis(dt.datetime(2021, 1, 1), dt.datetime(2021, 1, 2), timedelta(seconds = 10))
+
+        Returns
+        -------
+        dict
+            {'longitude': array('d', [...]) (deg, in [0, 360)), 'latitude': array('d', [...]) (deg),
+             'altitude': array('d', [...]) (km), 'orbit number': array('i', [...])}
+
+        """
+        two_pi = 2 * math.pi
+        e = self.eccentricity
+        sqrt_e = math.sqrt((1 + e) / (1 - e))
+        sin_inclination, cos_inclination = math.sin(self.inclination), math.cos(self.inclination)
+        first_revolution = math.floor((self.argument_of_perigee + self.mean_anomaly +
+                                       math.remainder(self.argument_of_latitude - self.argument_of_perigee - self.mean_anomaly, two_pi))
+                                      / two_pi)
+        longitudes, latitudes, altitudes, orbit_numbers = array('d'), array('d'), array('d'), array('i')
+        for epoch in time_axis:
+            seconds = (epoch - self.epoch) * 1e-6
+            right_ascension = self.right_ascension + self.right_ascension_rate * seconds
+            argument_of_perigee = self.argument_of_perigee + self.argument_of_perigee_rate * seconds
+            mean_anomaly = self.mean_anomaly + self.mean_anomaly_rate * seconds
+            eccentric_anomaly = mean_anomaly
+            for _ in range(10):
+                delta = (eccentric_anomaly - e * math.sin(eccentric_anomaly) - mean_anomaly) / (1 - e * math.cos(eccentric_anomaly))
+                eccentric_anomaly -= delta
+                if abs(delta) < 1e-12:
+                    break
+            true_anomaly = 2 * math.atan(sqrt_e * math.tan(eccentric_anomaly / 2))
+            argument_of_latitude = argument_of_perigee + mean_anomaly + math.remainder(true_anomaly - mean_anomaly, two_pi)
+            radius = self.semi_major_axis * (1 - e * math.cos(eccentric_anomaly))
+            angle = right_ascension - get_greenwich_sidereal_angle(epoch)
+            cos_angle, sin_angle = math.cos(angle), math.sin(angle)
+            cos_latitude, sin_latitude = math.cos(argument_of_latitude), math.sin(argument_of_latitude)
+            longitude, latitude, altitude = set_ecef_to_geodetic(
+                radius * (cos_angle * cos_latitude - sin_angle * sin_latitude * cos_inclination),
+                radius * (sin_angle * cos_latitude + cos_angle * sin_latitude * cos_inclination),
+                radius * sin_latitude * sin_inclination)
+            longitudes.append(longitude)
+            latitudes.append(latitude)
+            altitudes.append(altitude * 1e-3)
+            orbit_numbers.append(self.first_orbit_number + math.floor(argument_of_latitude / two_pi) - first_revolution)
+        return {"longitude" : longitudes, "latitude" : latitudes, "altitude" : altitudes, "orbit number" : orbit_numbers}
+    
+    def get_simulation_data(self, user_defined_content : str, time_axis : Time_Axis, columns : list) -> dict:
+        """
+        Header and simulation results of a generated file, laid out as
+        Sat_File_Parser.get_simulation_data.
+
+        Returns
+        -------
+        dict
+            {'CIC_MEM_VERS': '2.0', ..., 'COMMENT': ['Date', 'altitude (km)'],
+             ..., 'SIMULATION_RESULTS': Simulation_Results}
+
+        """
+        content_type = CONTENT_REGISTRY.get(user_defined_content)
+        simulation_results = Simulation_Results(content_type.get_typecodes())
+        simulation_results.epochs = time_axis
+        simulation_results.columns = columns
+        start, stop = (MJD_EPOCH + timedelta(microseconds = time_axis[0]), MJD_EPOCH + timedelta(microseconds = time_axis[-1])) \
+            if len(time_axis) else (None, None)
+        return {'CIC_MEM_VERS' : '2.0',
+                'CREATION_DATE' : dt.datetime.now(dt.timezone.utc).replace(tzinfo = None, microsecond = 0),
+                'ORIGINATOR' : 'J2_Propagator', 'COMMENT' : ['Date'] + content_type.column_names,
+                'OBJECT_NAME' : self.object_name, 'OBJECT_ID' : self.object_name,
+                'USER_DEFINED_PROTOCOL' : 'CIC', 'USER_DEFINED_CONTENT' : user_defined_content, 'TIME_SYSTEM' : 'UTC',
+                'START_TIME' : start and start.replace(tzinfo = None), 'STOP_TIME' : stop and stop.replace(tzinfo = None),
+                'SIMULATION_RESULTS' : simulation_results}
+    
+    def get_parsers(self, time_axis : Time_Axis) -> dict:
+        """
+        Generates the GEOGRAPHICAL_COORDINATES, SATELLITE_ALTITUDE and
+        ORBIT_NUMBER files of the satellite on the time axis, as the parsers
+        that would read them, so that Stations_Geometry, Query or
+        Interval_Set use them like parsed files.
+
+        Parameters
+        ----------
+        time_axis : Time_Axis
+            get_time_axis(dt.datetime(2021, 1, 1), dt.datetime(2021, 1, 2), timedelta(seconds = 10))
+
+        Returns
+        -------
+        dict
+            {'GEOGRAPHICAL_COORDINATES': Sat_Geographical_Coordinates,
+             'SATELLITE_ALTITUDE': Sat_Altitude, 'ORBIT_NUMBER': Sat_Orbit_Number}
+
+        """
+        states = self.propagate(time_axis)
+        contents = {"GEOGRAPHICAL_COORDINATES" : (Sat_Geographical_Coordinates, [states["longitude"], states["latitude"]]),
+                    "SATELLITE_ALTITUDE" : (Sat_Altitude, [states["altitude"]]),
+                    "ORBIT_NUMBER" : (Sat_Orbit_Number, [states["orbit number"]])}
+        return {content : parser_class.from_simulation_data(f"{self.object_name}_{content}.txt",
+                                                            self.get_simulation_data(content, time_axis, columns))
+                for content, (parser_class, columns) in contents.items()}
+
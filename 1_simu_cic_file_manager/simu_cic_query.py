@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Boolean queries over the columns of a simu-cic run, evaluated as masks on
+the time axis shared by the files they involve, and returned as time
+intervals.
+"""
+import datetime as dt
+import heapq
+import operator
+from abc import ABC, abstractmethod
+
+from simu_cic_file_manager import CONTENT_SCHEMAS, Simulation_Run, Time_Axis
+from simu_cic_intervals import Interval_Set
+
+def get_column_name(schema_name : str) -> str:
+    """
+    Name of a CONTENT_SCHEMAS column without its unit, as used by Column.
+
+    Parameters
+    ----------
+    schema_name : str
+        sun_eclipse_ratio (%)
+
+    Returns
+    -------
+    str
+        sun eclipse ratio
+
+    """
+    return schema_name.split(' (')[0].replace('_', ' ').strip()
+
+class Predicate(ABC):
+    """
+    Base class of the boolean expressions, combined with &, | and ~. The
+    dates where a file of the expression has no value are unknown rather
+    than false (three-valued logic): ~(Column("elevation", station = 1) > 10)
+    does not hold where the file has no elevation, while an unknown operand
+    of & or | does not matter once the other one decides the result.
+    """
+    
+    def __and__(self, other):
+        return And(self, other)
+    
+    def __or__(self, other):
+        return Or(self, other)
+    
+    def __invert__(self):
+        return Not(self)
+    
+    @abstractmethod
+    def get_columns(self) -> set:
+        pass
+    
+    @abstractmethod
+    def evaluate_known(self, values : dict) -> tuple:
+        """
+        Evaluates the predicate on the aligned values of its columns.
+
+        Parameters
+        ----------
+        values : dict
+            {('SATELLITE_DIRECTION-GROUND_STATION_1_FRAME', 2): [29.24913, 31.08049, None]}
+
+        Returns
+        -------
+        tuple
+            (bytearray(b'\\x00\\x01\\x00'), bytearray(b'\\x01\\x01\\x00')), the dates
+            where the predicate holds and those where it is known.
+
+        """
+    
+    def evaluate(self, values : dict) -> bytearray:
+        """
+        Dates where the predicate holds, the unknown ones evaluating to
+        False (see evaluate_known).
+        """
+        return self.evaluate_known(values)[0]
+
+class Column():
+    
+    def __init__(self, name : str, station : int = None) -> None:
+        """
+        Reference to a column of a "sat" file, used to build predicates:
+        Column("elevation", station = 1) > 10.
+
+        Parameters
+        ----------
+        name : str
+            "elevation", the CONTENT_SCHEMAS column name without its unit,
+            underscores and spaces being equivalent ("orbit_number").
+        station : int, optional
+            1, the ground station number for the station related files.
+
+        Raises
+        ------
+        ValueError
+            - The name must be a column of CONTENT_SCHEMAS.
+            - station is required by station related columns only.
+
+        Returns
+        -------
+        None
+
+        """
+        name = get_column_name(name)
+        for content_type, schema in CONTENT_SCHEMAS.items():
+            for index, (schema_name, _) in enumerate(schema):
+                if get_column_name(schema_name) == name:
+                    break
+            else:
+                continue
+            break
+        else:
+            raise ValueError(f"{name} is not a column of {list(CONTENT_SCHEMAS)}.")
+        if ("GROUND_STATION" in content_type) != (station is not None):
+            raise ValueError(f"station is {'required' if station is None else 'not expected'} for {name}.")
+        self.name = name
+        self.station = station
+        self.content = content_type if station is None else \
+            content_type.replace("GROUND_STATION", f"GROUND_STATION_{station}")
+        self.index = index + 1
+    
+    def get_key(self) -> tuple:
+        return (self.content, self.index)
+    
+    def compare(self, function, value) -> "Comparison":
+        return Comparison(self, function, value)
+    
+    def __lt__(self, value):
+        return self.compare(operator.lt, value)
+    
+    def __le__(self, value):
+        return self.compare(operator.le, value)
+    
+    def __gt__(self, value):
+        return self.compare(operator.gt, value)
+    
+    def __ge__(self, value):
+        return self.compare(operator.ge, value)
+    
+    def __eq__(self, value):
+        return self.compare(operator.eq, value)
+    
+    def __ne__(self, value):
+        return self.compare(operator.ne, value)
+
+    __hash__ = None
+    
+    def between(self, low, high) -> "Comparison":
+        return Comparison(self, lambda x, _ : low <= x <= high, None)
+    
+    def __repr__(self) -> str:
+        return f"Column({self.name!r}, station = {self.station})"
+
+class Comparison(Predicate):
+    
+    def __init__(self, column : Column, function, value) -> None:
+        self.column = column
+        self.function = function
+        self.value = value
+    
+    def get_columns(self) -> set:
+        return {self.column.get_key()}
+    
+    def evaluate_known(self, values : dict) -> tuple:
+        function, value = self.function, self.value
+        column = values[self.column.get_key()]
+        return (bytearray(x is not None and function(x, value) for x in column),
+                bytearray(x is not None for x in column))
+
+class And(Predicate):
+    
+    def __init__(self, left : Predicate, right : Predicate) -> None:
+        self.left = left
+        self.right = right
+    
+    def get_columns(self) -> set:
+        return self.left.get_columns() | self.right.get_columns()
+    
+    def evaluate_known(self, values : dict) -> tuple:
+        left, left_known = self.left.evaluate_known(values)
+        right, right_known = self.right.evaluate_known(values)
+        # Known where both sides are known, or where one side is known false.
+        known = bytearray((a_known and b_known) or (a_known and not a) or (b_known and not b)
+                          for a, a_known, b, b_known in zip(left, left_known, right, right_known))
+        return bytearray(map(operator.and_, left, right)), known
+
+class Or(And):
+    
+    def evaluate_known(self, values : dict) -> tuple:
+        left, left_known = self.left.evaluate_known(values)
+        right, right_known = self.right.evaluate_known(values)
+        # Known where both sides are known, or where one side holds.
+        known = bytearray((a_known and b_known) or a or b
+                          for a, a_known, b, b_known in zip(left, left_known, right, right_known))
+        return bytearray(map(operator.or_, left, right)), known
+
+class Not(Predicate):
+    
+    def __init__(self, predicate : Predicate) -> None:
+        self.predicate = predicate
+    
+    def get_columns(self) -> set:
+        return self.predicate.get_columns()
+    
+    def evaluate_known(self, values : dict) -> tuple:
+        flags, known = self.predicate.evaluate_known(values)
+        return bytearray(is_known and not flag for flag, is_known in zip(flags, known)), known
+
+class Query():
+    
+    def __init__(self, simulation_run : Simulation_Run) -> None:
+        """
+        This class aims at answering questions that combine several files of
+        a run, such as (Column("elevation", station = 1) > 10) &
+        (Column("sun_eclipse_ratio") > 0) & Column("orbit_number").between(300, 350).
+        Only the files involved in the predicate are parsed, restricted to
+        the requested time range.
+
+        Parameters
+        ----------
+        simulation_run : Simulation_Run
+            Simulation_Run(simu)
+
+        Returns
+        -------
+        None
+
+        """
+        self.simulation_run = simulation_run
+    
+    def get_time_axis(self, time_axes : list) -> Time_Axis:
+        """
+        Union of the time axes of the involved files. Axes sharing the same
+        regular grid are returned as is.
+
+        Parameters
+        ----------
+        time_axes : list
+            [Time_Axis, Time_Axis]
+
+        Returns
+        -------
+        Time_Axis
+            Time_Axis with every date of the given axes.
+
+        """
+        first = time_axes[0]
+        if all(axis.is_regular() and (axis.start, axis.step, len(axis)) == (first.start, first.step, len(first))
+               for axis in time_axes):
+            return first
+        time_axis = Time_Axis()
+        previous = None
+        for epoch in heapq.merge(*time_axes):
+            if epoch != previous:
+                time_axis.append(epoch)
+                previous = epoch
+        return time_axis
+    
+    def get_mask(self, predicate : Predicate, start : dt.datetime = None,
+                 stop : dt.datetime = None) -> tuple:
+        """
+        Evaluates the predicate on the union of the time axes of its files.
+
+        Parameters
+        ----------
+        predicate : Predicate
+            Column("elevation", station = 1) > 30
+        start : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 0, 17)
+        stop : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 1, 0)
+
+        Returns
+        -------
+        tuple
+            (Time_Axis, bytearray(b'\\x00\\x01\\x01'))
+
+        """
+        columns = predicate.get_columns()
+        parsers = {content : self.simulation_run.get_parser(content, start, stop)
+                   for content in sorted({content for content, _ in columns})}
+        time_axes = [parser.get_results().epochs for parser in parsers.values()]
+        if not any(len(axis) for axis in time_axes):
+            return Time_Axis(), bytearray()
+        time_axis = self.get_time_axis([axis for axis in time_axes if len(axis)])
+        values = {}
+        for content, index in columns:
+            results = parsers[content].get_results()
+            column = results.get_column(index)
+            if results.epochs is time_axis or (results.epochs.is_regular() and time_axis.is_regular() and 
+                                               (results.epochs.start, results.epochs.step, len(results.epochs)) == 
+                                               (time_axis.start, time_axis.step, len(time_axis))):
+                values[(content, index)] = column
+            else:
+                find = results.epochs.find
+                positions = [find(epoch) for epoch in time_axis]
+                values[(content, index)] = [column[position] if position >= 0 else None for position in positions]
+        return time_axis, predicate.evaluate(values)
+    
+    def get_intervals(self, predicate : Predicate, start : dt.datetime = None,
+                      stop : dt.datetime = None) -> Interval_Set:
+        """
+        Merged time intervals during which the predicate holds. A sample
+        where the predicate holds covers the time until the next sample of
+        the axis (one step for the last one).
+
+        Parameters
+        ----------
+        predicate : Predicate
+            Column("elevation", station = 1) > 30
+        start : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 0, 17)
+        stop : dt.datetime, optional
+            dt.datetime(2021, 7, 14, 1, 0)
+
+        Returns
+        -------
+        Interval_Set
+            [(dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc),
+              dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc))]
+
+        """
+        return Interval_Set.from_mask(*self.get_mask(predicate, start, stop))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Sample "sat" files shipped next to the modules, shared by the tests. The
+files are found from their headers (see get_sat_filepaths), so that they are
+found whatever the case of their extension (.TXT in the repository).
+"""
+import os
+import shutil
+
+from simu_cic_file_manager import get_sat_filepaths
+
+SAMPLES_DIRPATH = os.path.dirname(os.path.abspath(__file__))
+
+def get_sample_filepaths(dirpath : str = SAMPLES_DIRPATH) -> dict:
+    """
+    Sample files of the satellite Sat, by USER_DEFINED_CONTENT.
+
+    Parameters
+    ----------
+    dirpath : str, optional
+        The default is the directory of this module.
+
+    Raises
+    ------
+    FileNotFoundError
+        There must be at least one sample file.
+
+    Returns
+    -------
+    dict
+        {'ORBIT_NUMBER': '.../Sat_ORBIT_NUMBER.TXT', 'SATELLITE_ALTITUDE': '.../Sat_SATELLITE_ALTITUDE.TXT', ...}
+
+    """
+    filepaths = get_sat_filepaths(dirpath).get("Sat", {})
+    if not filepaths:
+        raise FileNotFoundError(f"No sample \"sat\" file in {dirpath}.")
+    return filepaths
+
+SAMPLE_FILEPATHS = get_sample_filepaths()
+SAT_FILEPATHS = sorted(SAMPLE_FILEPATHS.values())
+
+def copy_samples(dirpath : str, object_name : str = "Sat", contents : list = None) -> list:
+    """
+    Copies sample files to a directory as <object_name>_<content>.txt.
+
+    Parameters
+    ----------
+    dirpath : str
+        /tmp/run_1
+    object_name : str, optional
+        SatA
+    contents : list, optional
+        ['SATELLITE_ALTITUDE']. The default is every sample.
+
+    Returns
+    -------
+    list
+        ['/tmp/run_1/SatA_SATELLITE_ALTITUDE.txt']
+
+    """
+    filepaths = []
+    for content in (sorted(SAMPLE_FILEPATHS) if contents is None else contents):
+        filepaths.append(shutil.copy(SAMPLE_FILEPATHS[content], os.path.join(dirpath, f"{object_name}_{content}.txt")))
+    return filepaths
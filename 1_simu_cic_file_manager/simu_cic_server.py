@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+Local HTTP/JSON service answering queries on the "sat" files of simu-cic
+runs preloaded in memory, reloaded when the files change:
+
+    python simu_cic_server.py [--port 8765] RUN_DIRECTORY [RUN_DIRECTORY ...]
+
+GET /runs, /range, /value, /passes and /eclipses, see Simulation_Store.
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from simu_cic_file_manager import CONTENT_REGISTRY, MJD_EPOCH, get_sat_filepaths, set_datetime_to_epoch
+from simu_cic_interpolation import Interpolator, METHODS
+from simu_cic_intervals import Interval_Set
+
+DEFAULT_PORT = 8765
+
+def get_signature(filepath : str) -> tuple:
+    stat = os.stat(filepath)
+    return (stat.st_size, stat.st_mtime_ns)
+
+def set_str_to_datetime(str_date : str) -> dt.datetime:
+    """
+    Parses a date of a query, naive dates being UTC.
+
+    Parameters
+    ----------
+    str_date : str
+        '2021-07-14T00:17:05'
+
+    Raises
+    ------
+    ValueError
+        The date must be in ISO 8601 format.
+
+    Returns
+    -------
+    dt.datetime
+        dt.datetime(2021, 7, 14, 0, 17, 5, tzinfo=dt.timezone.utc)
+
+    """
+    date = dt.datetime.fromisoformat(str_date.replace("Z", "+00:00"))
+    return date if date.tzinfo is not None else date.replace(tzinfo = dt.timezone.utc)
+
+def set_epoch_to_str(epoch : int) -> str:
+    return (MJD_EPOCH + timedelta(microseconds = epoch)).isoformat()
+
+def get_json_values(values) -> list:
+    return [value if value == value else None for value in values]
+
+class Loaded_File():
+    
+    def __init__(self, filepath : str) -> None:
+        """
+        A "sat" file parsed with the parser class of its content and frozen,
+        so that the request threads share it without locks, with the
+        signature (size, modification time) it was parsed at.
+
+        Parameters
+        ----------
+        filepath : str
+            run_1/Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt
+
+        Returns
+        -------
+        None
+
+        """
+        self.filepath = filepath
+        self.signature = get_signature(filepath)
+        self.user_defined_content = CONTENT_REGISTRY.identify(filepath)[1]
+        self.parser = CONTENT_REGISTRY.get_parser_class(self.user_defined_content)(filepath, frozen = True)
+    
+    def get_derived(self, key : tuple, function):
+        """
+        Structure derived from the file (interpolator, interval set), computed
+        once on first request (see Sat_File_Parser.get_derived).
+        """
+        return self.parser.get_derived(key, function)
+
+class Simulation_Store():
+    
+    def __init__(self, dirpaths : list, max_rows : int = 1000000) -> None:
+        """
+        This class aims at serving the "sat" files of simu-cic runs from
+        memory. Every file of the run directories is parsed once through its
+        parser class; reload parses again only the files whose size or
+        modification time changed, then swaps them in at once, so that the
+        queries in progress keep the files they started with.
+
+        Parameters
+        ----------
+        dirpaths : list
+            ['runs/run_1', 'runs/run_2'], the runs being named after their
+            directory (run_1, run_2).
+        max_rows : int, optional
+            1000000, the maximum number of rows of a range query.
+
+        Raises
+        ------
+        FileNotFoundError
+            The run directories must exist.
+        ValueError
+            Two runs cannot have the same directory name.
+
+        Returns
+        -------
+        None
+
+        """
+        self.dirpaths = {}
+        for dirpath in dirpaths:
+            if not os.path.isdir(dirpath):
+                raise FileNotFoundError(f"{dirpath} is not a directory.")
+            run = os.path.basename(os.path.normpath(dirpath))
+            if run in self.dirpaths:
+                raise ValueError(f"Two runs are named {run}.")
+            self.dirpaths[run] = str(dirpath)
+        self.max_rows = max_rows
+        self.files = {}
+        self.reload_lock = threading.Lock()
+        self.reload()
+    
+    def reload(self) -> list:
+        """
+        Parses the new and modified files of the runs and forgets the removed ones.
+
+        Returns
+        -------
+        list
+            [('run_1', 'Sat', 'SATELLITE_ALTITUDE')], the keys of the files
+            (re)loaded.
+
+        """
+        with self.reload_lock:
+            files = {}
+            reloaded = []
+            for run, dirpath in self.dirpaths.items():
+                for object_name, filepaths in get_sat_filepaths(dirpath).items():
+                    for user_defined_content, filepath in filepaths.items():
+                        key = (run, object_name, user_defined_content)
+                        loaded_file = self.files.get(key)
+                        try:
+                            if loaded_file is None or loaded_file.filepath != filepath or \
+                                loaded_file.signature != get_signature(filepath):
+                                loaded_file = Loaded_File(filepath)
+                                reloaded.append(key)
+                        except (OSError, ValueError):
+                            if loaded_file is None:
+                                continue
+                        files[key] = loaded_file
+            self.files = files
+        return reloaded
+    
+    def get_runs(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            {'run_1': {'Sat': ['GEOGRAPHICAL_COORDINATES', 'ORBIT_NUMBER', ...]}}
+
+        """
+        runs = {run : {} for run in self.dirpaths}
+        for run, object_name, user_defined_content in sorted(self.files):
+            runs[run].setdefault(object_name, []).append(user_defined_content)
+        return runs
+    
+    def get_file(self, user_defined_content : str, run : str = None, object_name : str = None) -> Loaded_File:
+        """
+        File of a content of a run and an object, which may be omitted when
+        the store holds only one run or the run only one object.
+
+        Raises
+        ------
+        KeyError
+            The file must be loaded.
+
+        """
+        files = self.files
+        if run is None:
+            runs = {key[0] for key in files}
+            run = runs.pop() if len(runs) == 1 else None
+        if object_name is None:
+            object_names = {key[1] for key in files if key[0] == run}
+            object_name = object_names.pop() if len(object_names) == 1 else None
+        key = (run, object_name, user_defined_content)
+        if key not in files:
+            raise KeyError(f"No {user_defined_content} file for run {run} and object {object_name}.")
+        return files[key]
+    
+    def get_range(self, content : str, start : dt.datetime = None, stop : dt.datetime = None,
+                  run : str = None, object_name : str = None) -> dict:
+        """
+        Samples of a file between two dates (included).
+
+        Raises
+        ------
+        ValueError
+            The range must hold at most max_rows samples.
+
+        Returns
+        -------
+        dict
+            {'user_defined_content': 'SATELLITE_ALTITUDE', 'columns': ['altitude (km)'],
+             'dates': ['2021-07-14T00:17:00+00:00', ...], 'values': [[601.674, ...]]}
+
+        """
+        loaded_file = self.get_file(content, run, object_name)
+        results = loaded_file.parser.get_results()
+        time_axis = results.epochs
+        first = 0 if start is None else time_axis.search(set_datetime_to_epoch(start))
+        last = len(time_axis) if stop is None else time_axis.search(set_datetime_to_epoch(stop) + 1)
+        if last - first > self.max_rows:
+            raise ValueError(f"The range holds {last - first} samples, more than {self.max_rows}.")
+        return {"user_defined_content" : loaded_file.user_defined_content,
+                "columns" : CONTENT_REGISTRY.get(loaded_file.user_defined_content).column_names,
+                "dates" : [set_epoch_to_str(epoch) for epoch in time_axis[first:last]],
+                "values" : [get_json_values(column[first:last]) for column in results.columns]}
+    
+    def get_value(self, content : str, date : dt.datetime, method : str = "linear",
+                  run : str = None, object_name : str = None) -> dict:
+        """
+        Values of every column of a file at a date, interpolated between the
+        samples (see Interpolator).
+
+        Returns
+        -------
+        dict
+            {'user_defined_content': 'GEOGRAPHICAL_COORDINATES', 'date': '2021-07-14T00:17:05+00:00',
+             'values': {'longitude (deg)': 358.754277, 'latitude (deg)': 41.629625}}
+
+        """
+        loaded_file = self.get_file(content, run, object_name)
+        column_names = CONTENT_REGISTRY.get(loaded_file.user_defined_content).column_names
+        epoch = set_datetime_to_epoch(date)
+        values = {}
+        for index, column_name in enumerate(column_names, 1):
+            interpolator = loaded_file.get_derived(("interpolator", index, method),
+                                                   lambda : Interpolator(loaded_file.parser, index, method))
+            values[column_name] = get_json_values(interpolator.evaluate((epoch,)))[0]
+        return {"user_defined_content" : loaded_file.user_defined_content, "date" : date.isoformat(), "values" : values}
+    
+    def get_intervals(self, loaded_file : Loaded_File, interval_set : Interval_Set, start : dt.datetime = None,
+                      stop : dt.datetime = None) -> dict:
+        if start is not None or stop is not None:
+            interval_set = interval_set & Interval_Set([(-2**63 if start is None else set_datetime_to_epoch(start),
+                                                         2**63 - 1 if stop is None else set_datetime_to_epoch(stop))])
+        return {"user_defined_content" : loaded_file.user_defined_content,
+                "intervals" : [[start.isoformat(), stop.isoformat(), (stop - start).total_seconds()]
+                               for start, stop in interval_set]}
+    
+    def get_passes(self, station : int = 1, start : dt.datetime = None, stop : dt.datetime = None,
+                   run : str = None, object_name : str = None) -> dict:
+        """
+        Visibility windows of a ground station, optionally clipped to [start, stop].
+
+        Returns
+        -------
+        dict
+            {'user_defined_content': 'GEOMETRICAL_VISIBILITY_GROUND_STATION_1',
+             'intervals': [['2021-07-14T00:17:00+00:00', '2021-07-14T00:17:30+00:00', 30.0]]}
+
+        """
+        loaded_file = self.get_file(f"GEOMETRICAL_VISIBILITY_GROUND_STATION_{station}", run, object_name)
+        interval_set = loaded_file.get_derived(("passes",), lambda : Interval_Set.from_sat_visibility(loaded_file.parser))
+        return self.get_intervals(loaded_file, interval_set, start, stop)
+    
+    def get_eclipses(self, minimum : float = 100.0, maximum : float = 100.0, start : dt.datetime = None,
+                     stop : dt.datetime = None, run : str = None, object_name : str = None) -> dict:
+        """
+        Windows of sun eclipse ratio in [minimum, maximum] (%), optionally
+        clipped to [start, stop]. See get_passes. Only the windows of total
+        eclipse are kept with the file, the other thresholds being computed
+        per query so that the clients cannot grow the cache.
+        """
+        loaded_file = self.get_file("SATELLITE_ECLIPSE", run, object_name)
+        if (minimum, maximum) == (100.0, 100.0):
+            interval_set = loaded_file.get_derived(("eclipses",),
+                                                   lambda : Interval_Set.from_sat_eclipse(loaded_file.parser))
+        else:
+            interval_set = Interval_Set.from_sat_eclipse(loaded_file.parser, minimum, maximum)
+        return self.get_intervals(loaded_file, interval_set, start, stop)
+
+class Simulation_Request_Handler(BaseHTTPRequestHandler):
+
+    # Parameters of the queries, converted from the query string.
+    PARAMETERS = {"start" : set_str_to_datetime, "stop" : set_str_to_datetime, "date" : set_str_to_datetime,
+                  "station" : int, "minimum" : float, "maximum" : float, "content" : str, "method" : str,
+                  "run" : str, "object_name" : str}
+    
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        store = self.server.store
+        routes = {"/runs" : store.get_runs, "/range" : store.get_range, "/value" : store.get_value,
+                  "/passes" : store.get_passes, "/eclipses" : store.get_eclipses}
+        if url.path not in routes:
+            self.send_json(404, {"error" : f"Unknown query {url.path}, expected one of {list(routes)}."})
+            return
+        try:
+            parameters = {}
+            for name, values in parse_qs(url.query, strict_parsing = False).items():
+                if name not in self.PARAMETERS:
+                    raise ValueError(f"Unknown parameter {name}.")
+                parameters[name] = self.PARAMETERS[name](values[-1])
+            if parameters.get("method", "linear") not in METHODS:
+                raise ValueError(f"method must be in {METHODS}.")
+            response = routes[url.path](**parameters)
+        except TypeError as error:
+            self.send_json(400, {"error" : str(error)})
+        except KeyError as error:
+            self.send_json(404, {"error" : error.args[0]})
+        except ValueError as error:
+            self.send_json(400, {"error" : str(error)})
+        else:
+            self.send_json(200, response)
+    
+    def send_json(self, status : int, response : dict) -> None:
+        body = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format : str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class Simulation_Server(ThreadingHTTPServer):
+
+    daemon_threads = True
+    
+    def __init__(self, store : Simulation_Store, host : str = "127.0.0.1", port : int = DEFAULT_PORT,
+                 reload_interval : float = 2.0, verbose : bool = False) -> None:
+        """
+        HTTP server of a Simulation_Store, each request being answered in its
+        own thread. A background thread reloads the store every
+        reload_interval seconds.
+
+        Parameters
+        ----------
+        store : Simulation_Store
+            Simulation_Store(['runs/run_1'])
+        host : str, optional
+            "127.0.0.1"
+        port : int, optional
+            8765, 0 picking a free port (see server_address).
+        reload_interval : float, optional
+            2.0 (s), None disabling the reloads.
+        verbose : bool, optional
+            False, whether the requests are logged to stderr.
+
+        Returns
+        -------
+        None
+
+        """
+        super().__init__((host, port), Simulation_Request_Handler)
+        self.store = store
+        self.verbose = verbose
+        self.reload_interval = reload_interval
+        self.stopped = threading.Event()
+        self.reload_thread = None
+        if reload_interval:
+            self.reload_thread = threading.Thread(target = self.reload_loop, daemon = True)
+            self.reload_thread.start()
+    
+    def reload_loop(self) -> None:
+        while not self.stopped.wait(self.reload_interval):
+            reloaded = self.store.reload()
+            if reloaded and self.verbose:
+                print(f"reloaded {reloaded}", file = sys.stderr)
+    
+    def server_close(self) -> None:
+        self.stopped.set()
+        if self.reload_thread is not None:
+            self.reload_thread.join()
+        super().server_close()
+
+def main(argv : list = None) -> int:
+    argument_parser = argparse.ArgumentParser(prog = "simu-cic-server", description = __doc__.split("\n\n")[0].strip())
+    argument_parser.add_argument("dirpaths", nargs = "+", help = "run directories")
+    argument_parser.add_argument("--host", default = "127.0.0.1")
+    argument_parser.add_argument("--port", type = int, default = DEFAULT_PORT)
+    argument_parser.add_argument("--reload-interval", type = float, default = 2.0, help = "seconds, 0 disables the reloads")
+    argument_parser.add_argument("-v", "--verbose", action = "store_true")
+    arguments = argument_parser.parse_args(argv)
+    store = Simulation_Store(arguments.dirpaths)
+    with Simulation_Server(store, arguments.host, arguments.port, arguments.reload_interval, arguments.verbose) as server:
+        print(f"Serving {len(store.files)} files on http://{server.server_address[0]}:{server.server_address[1]}",
+              file = sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
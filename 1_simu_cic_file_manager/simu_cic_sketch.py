@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""
+Mergeable sketches of the distribution of the columns of the "sat" files,
+filled chunk by chunk in bounded memory: fixed-bin histograms and KLL
+quantile sketches. The sketches of parallel workers or of many runs are
+combined with merge.
+"""
+import math
+import random
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress
+
+from simu_cic_diff import CHUNK_SIZE, iter_file_chunks, iter_parser_chunks
+from simu_cic_file_manager import Sat_File_Parser
+
+class Histogram():
+    
+    def __init__(self, low : float, high : float, bins : int = 100) -> None:
+        """
+        Counts of values in bins of equal width over [low, high), with the
+        values below low, from high up and NaN counted apart. Two histograms
+        with the same bins merge exactly.
+
+        Parameters
+        ----------
+        low : float
+            0.0
+        high : float
+            90.0
+        bins : int, optional
+            90
+
+        Raises
+        ------
+        ValueError
+            low must be lower than high, and there must be at least one bin.
+
+        Returns
+        -------
+        None
+
+        """
+        if not low < high:
+            raise ValueError(f"low ({low}) must be lower than high ({high}).")
+        if bins < 1:
+            raise ValueError("There must be at least one bin.")
+        self.low = float(low)
+        self.high = float(high)
+        self.bins = bins
+        self.counts = array('q', bytes(8 * bins))
+        self.underflow = 0
+        self.overflow = 0
+        self.nan_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+    
+    def update(self, values) -> None:
+        """
+        Adds values to the histogram.
+
+        Parameters
+        ----------
+        values : iterable of float
+            array('d', [12.5, 47.25, 89.9])
+
+        Returns
+        -------
+        None
+
+        """
+        values = list(values)
+        finite = [value for value in values if value == value]
+        self.nan_count += len(values) - len(finite)
+        if not finite:
+            return
+        counts, bins, low, high = self.counts, self.bins, self.low, self.high
+        scale = bins / (high - low)
+        for value in finite:
+            if value < low:
+                self.underflow += 1
+            elif value >= high:
+                self.overflow += 1
+            else:
+                counts[min(int((value - low) * scale), bins - 1)] += 1
+        self.count += len(finite)
+        self.total += math.fsum(finite)
+        self.minimum = min(self.minimum, min(finite))
+        self.maximum = max(self.maximum, max(finite))
+    
+    def merge(self, other : "Histogram") -> "Histogram":
+        """
+        Adds the counts of another histogram with the same bins.
+
+        Raises
+        ------
+        ValueError
+            The histograms must have the same low, high and bins.
+
+        Returns
+        -------
+        Histogram
+            The merged histogram (self).
+
+        """
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError(f"Cannot merge the bins {(other.low, other.high, other.bins)} "
+                             f"into {(self.low, self.high, self.bins)}.")
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.nan_count += other.nan_count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+    
+    def get_edges(self) -> array:
+        width = (self.high - self.low) / self.bins
+        return array('d', [self.low + index * width for index in range(self.bins)] + [self.high])
+    
+    def get_mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+    
+    def get_quantile(self, q : float) -> float:
+        """
+        Quantile of the values, interpolated linearly inside its bin. The
+        values out of [low, high) are assumed to lie in [minimum, low) and
+        [high, maximum].
+
+        Parameters
+        ----------
+        q : float
+            0.5
+
+        Raises
+        ------
+        ValueError
+            q must be in [0, 1].
+
+        Returns
+        -------
+        float
+            45.3, NaN when the histogram is empty.
+
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"q must be in [0, 1], got {q}.")
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        if rank <= self.underflow:
+            return self.minimum + (self.low - self.minimum) * (rank / self.underflow if self.underflow else 0.0)
+        rank -= self.underflow
+        edges = self.get_edges()
+        for index, count in enumerate(self.counts):
+            if rank <= count and count:
+                return max(self.minimum, min(self.maximum, edges[index] + (edges[index + 1] - edges[index]) * rank / count))
+            rank -= count
+        if not self.overflow:
+            return self.maximum
+        return self.high + (self.maximum - self.high) * min(rank / self.overflow, 1.0)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __repr__(self) -> str:
+        return f"Histogram([{self.low:g}, {self.high:g}), {self.bins} bins, {self.count} values)"
+
+class KLL_Sketch():
+
+    # Ratio of the capacities of two consecutive levels.
+    CAPACITY_RATIO = 2 / 3
+    
+    def __init__(self, k : int = 200, seed : int = None) -> None:
+        """
+        KLL quantile sketch (Karnin, Lang and Liberty, 2016): levels of
+        sorted samples, each sample of level h standing for 2**h values. A
+        full level is sorted and every other sample is promoted to the next
+        level, so that the sketch retains O(k log(n / k)) samples whatever the
+        number n of values, for a rank error of about 1.7 / k. Merging two
+        sketches concatenates their levels and compacts them again, which
+        keeps the same error bound and gives the exact count, minimum and
+        maximum.
+
+        Parameters
+        ----------
+        k : int, optional
+            200, the capacity of the top level.
+        seed : int, optional
+            42. The seed of the choice of the promoted samples. The default
+            seeds from the system, so that the sketches are only reproducible
+            when a seed is given.
+
+        Raises
+        ------
+        ValueError
+            k must be at least 8.
+
+        Returns
+        -------
+        None
+
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8.")
+        self.k = k
+        self.random = random.Random(seed)
+        self.levels = [array('d')]
+        self.size = 0
+        self.max_size = self.get_capacity(0)
+        self.nan_count = 0
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+    
+    def get_capacity(self, level : int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * self.CAPACITY_RATIO ** depth)), 2)
+    
+    def grow(self) -> None:
+        self.levels.append(array('d'))
+        self.max_size = sum(self.get_capacity(level) for level in range(len(self.levels)))
+    
+    def compact(self) -> None:
+        """
+        Promotes every other sample of the first full level to the next one,
+        until the sketch is below its maximum size.
+        """
+        for level in range(len(self.levels)):
+            samples = self.levels[level]
+            if len(samples) >= self.get_capacity(level):
+                if level + 1 >= len(self.levels):
+                    self.grow()
+                samples = array('d', sorted(samples))
+                offset = self.random.getrandbits(1)
+                even = len(samples) - len(samples) % 2
+                self.levels[level + 1].extend(samples[offset:even:2])
+                self.levels[level] = samples[even:]
+                self.size = sum(len(samples) for samples in self.levels)
+                if self.size < self.max_size:
+                    break
+    
+    def update(self, values) -> None:
+        """
+        Adds values to the sketch, NaN being counted apart.
+
+        Parameters
+        ----------
+        values : iterable of float
+            array('d', [1096.411, 1052.271, 1010.944])
+
+        Returns
+        -------
+        None
+
+        """
+        values = list(values)
+        finite = [value for value in values if value == value]
+        self.nan_count += len(values) - len(finite)
+        if not finite:
+            return
+        self.count += len(finite)
+        self.minimum = min(self.minimum, min(finite))
+        self.maximum = max(self.maximum, max(finite))
+        first = 0
+        while first < len(finite):
+            last = first + max(self.max_size - self.size, 1)
+            self.levels[0].extend(finite[first:last])
+            self.size += len(finite[first:last])
+            first = last
+            while self.size >= self.max_size:
+                self.compact()
+    
+    def merge(self, other : "KLL_Sketch") -> "KLL_Sketch":
+        """
+        Adds the values of another sketch.
+
+        Raises
+        ------
+        ValueError
+            The sketches must have the same k.
+
+        Returns
+        -------
+        KLL_Sketch
+            The merged sketch (self).
+
+        """
+        if self.k != other.k:
+            raise ValueError(f"Cannot merge a sketch of k = {other.k} into a sketch of k = {self.k}.")
+        while len(self.levels) < len(other.levels):
+            self.grow()
+        for level, samples in enumerate(other.levels):
+            self.levels[level].extend(samples)
+        self.size = sum(len(samples) for samples in self.levels)
+        self.nan_count += other.nan_count
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        while self.size >= self.max_size:
+            self.compact()
+        return self
+    
+    def get_weighted_samples(self) -> tuple:
+        """
+        Retained samples in increasing order, with the cumulated weights.
+
+        Returns
+        -------
+        tuple
+            (array('d', [1010.944, 1052.271, 1096.411]), [1, 2, 3])
+
+        """
+        pairs = sorted((value, 1 << level) for level, samples in enumerate(self.levels) for value in samples)
+        return array('d', [value for value, _ in pairs]), list(accumulate(weight for _, weight in pairs))
+    
+    def get_rank(self, value : float) -> float:
+        """
+        Approximate fraction of the values lower than or equal to value.
+
+        Parameters
+        ----------
+        value : float
+            1052.271
+
+        Returns
+        -------
+        float
+            0.667, NaN when the sketch is empty.
+
+        """
+        if self.count == 0:
+            return math.nan
+        weight = sum(sum(1 for sample in samples if sample <= value) << level
+                     for level, samples in enumerate(self.levels))
+        return weight / sum(len(samples) << level for level, samples in enumerate(self.levels))
+    
+    def get_quantiles(self, qs : list) -> list:
+        """
+        Approximate quantiles of the values, the quantiles 0 and 1 being
+        the exact minimum and maximum.
+
+        Parameters
+        ----------
+        qs : list
+            [0.05, 0.5, 0.95]
+
+        Raises
+        ------
+        ValueError
+            Every q must be in [0, 1].
+
+        Returns
+        -------
+        list
+            [1010.944, 1052.271, 1096.411], NaN when the sketch is empty.
+
+        """
+        if any(not 0.0 <= q <= 1.0 for q in qs):
+            raise ValueError(f"Every q must be in [0, 1], got {qs}.")
+        if self.count == 0:
+            return [math.nan] * len(qs)
+        values, weights = self.get_weighted_samples()
+        quantiles = []
+        for q in qs:
+            if q == 0.0:
+                quantiles.append(self.minimum)
+            elif q == 1.0:
+                quantiles.append(self.maximum)
+            else:
+                index = min(bisect_left(weights, q * weights[-1]), len(values) - 1)
+                quantiles.append(values[index])
+        return quantiles
+    
+    def get_quantile(self, q : float) -> float:
+        return self.get_quantiles([q])[0]
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __repr__(self) -> str:
+        return f"KLL_Sketch(k = {self.k}, {self.count} values, {self.size} samples)"
+
+def fill_sketches(source, sketches : dict, chunk_size : int = CHUNK_SIZE, where = None) -> dict:
+    """
+    Fills sketches with the columns of a "sat" file, read by chunks of
+    chunk_size rows when given a filepath.
+
+    Parameters
+    ----------
+    source : Sat_File_Parser or str
+        Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt
+    sketches : dict
+        {2: [Histogram(0.0, 90.0, 90), KLL_Sketch()]}, the sketches to fill
+        with each column, the column index being as in get_results()[i][1].
+    chunk_size : int, optional
+        65536
+    where : callable, optional
+        lambda epochs, columns : [elevation >= 5.0 for elevation in columns[1]],
+        the rows of each chunk to add. The default adds every row.
+
+    Returns
+    -------
+    dict
+        The filled sketches.
+
+    """
+    if isinstance(source, Sat_File_Parser):
+        chunks = iter_parser_chunks(source, chunk_size)
+    else:
+        chunks = iter_file_chunks(source, chunk_size)
+    for epochs, columns in chunks:
+        mask = None if where is None else list(where(epochs, columns))
+        for index, column_sketches in sketches.items():
+            values = columns[index - 1] if mask is None else list(compress(columns[index - 1], mask))
+            for sketch in column_sketches:
+                sketch.update(values)
+    return sketches
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""
+Spatial index over the ground track of a Sat_GEOGRAPHICAL_COORDINATES file,
+answering region overflight queries as time intervals.
+"""
+import json
+import math
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+from simu_cic_file_manager import File, Sat_Geographical_Coordinates, Time_Axis
+from simu_cic_intervals import Interval_Set
+
+INDEX_SUFFIX = ".tiles"
+INDEX_VERSION = 1
+
+def set_point_in_polygon(longitude : float, latitude : float, vertices : list) -> bool:
+    """
+    Even-odd rule test of a point against a polygon.
+
+    Parameters
+    ----------
+    longitude : float
+        2.35 (deg)
+    latitude : float
+        48.85 (deg)
+    vertices : list
+        [(-5.0, 42.0), (8.0, 42.0), (8.0, 51.0), (-5.0, 51.0)]
+
+    Returns
+    -------
+    bool
+        True
+
+    """
+    inside = False
+    x0, y0 = vertices[-1]
+    for x1, y1 in vertices:
+        if (y1 > latitude) != (y0 > latitude) and \
+            longitude < x0 + (latitude - y0) * (x1 - x0) / (y1 - y0):
+            inside = not inside
+        x0, y0 = x1, y1
+    return inside
+
+def set_segment_in_box(x0 : float, y0 : float, x1 : float, y1 : float, box : tuple) -> bool:
+    """
+    Liang-Barsky test of a segment crossing a box (x_min, y_min, x_max, y_max).
+    """
+    x_min, y_min, x_max, y_max = box
+    low, high = 0.0, 1.0
+    for p, q in ((x0 - x1, x0 - x_min), (x1 - x0, x_max - x0), (y0 - y1, y0 - y_min), (y1 - y0, y_max - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            low = max(low, q / p)
+        else:
+            high = min(high, q / p)
+        if low > high:
+            return False
+    return True
+
+class Ground_Track_Index():
+    
+    def __init__(self, sat_geographical_coordinates : Sat_Geographical_Coordinates, tile_size : float = 1.0) -> None:
+        """
+        This class aims at answering "when did the satellite fly over this
+        region" without scanning the whole ground track. The track is cut
+        once into runs of consecutive samples falling in the same
+        tile_size x tile_size degrees tile, so that a query only visits the
+        tiles of the region: the runs of the tiles inside the region are
+        taken as a whole, and only the samples of the tiles on its border
+        are tested one by one. The index can be saved next to the source
+        file and reloaded without parsing it (see Ground_Track_Index.open).
+
+        Parameters
+        ----------
+        sat_geographical_coordinates : Sat_Geographical_Coordinates
+            Sat_Geographical_Coordinates(Sat_GEOGRAPHICAL_COORDINATES.txt)
+        tile_size : float, optional
+            1.0 (deg), a divisor of 180.
+
+        Raises
+        ------
+        ValueError
+            tile_size must divide 180.
+
+        Returns
+        -------
+        None
+
+        """
+        if tile_size <= 0 or not (180 / tile_size).is_integer():
+            raise ValueError("tile_size must divide 180.")
+        self.filepath = sat_geographical_coordinates.filepath
+        self.tile_size = tile_size
+        results = sat_geographical_coordinates.get_results()
+        self.time_axis = results.epochs
+        self.longitudes = array('d', results.get_column(1))
+        self.latitudes = array('d', results.get_column(2))
+        self.set_tiles()
+    
+    def get_tile(self, longitude : float, latitude : float) -> int:
+        rows, columns = round(180 / self.tile_size), round(360 / self.tile_size)
+        row = min(max(int((latitude + 90) // self.tile_size), 0), rows - 1)
+        return row * columns + int((longitude % 360) // self.tile_size) % columns
+    
+    def set_tiles(self) -> None:
+        """
+        Cuts the track into runs of samples of the same tile, stored as
+        sorted tile keys, offsets into the runs and (first, last) sample
+        indexes of the runs.
+        """
+        runs = {}
+        tile, first = None, 0
+        for index, (longitude, latitude) in enumerate(zip(self.longitudes, self.latitudes)):
+            current = self.get_tile(longitude, latitude)
+            if current != tile:
+                if tile is not None:
+                    runs.setdefault(tile, array('q')).extend((first, index - 1))
+                tile, first = current, index
+        if tile is not None:
+            runs.setdefault(tile, array('q')).extend((first, len(self.longitudes) - 1))
+        self.keys = array('q', sorted(runs))
+        self.offsets = array('q', [0])
+        self.runs = array('q')
+        for key in self.keys:
+            self.runs.extend(runs[key])
+            self.offsets.append(len(self.runs))
+        self.set_lookup()
+    
+    def set_lookup(self) -> None:
+        self.lookup = {key : index for index, key in enumerate(self.keys)}
+        self.breaks = array('q')
+        if not self.time_axis.is_regular():
+            step = self.time_axis.get_step()
+            epochs = self.time_axis[:]
+            for index in range(len(epochs) - 1):
+                if epochs[index + 1] - epochs[index] > step:
+                    self.breaks.append(index)
+    
+    def get_runs(self, key : int) -> array:
+        index = self.lookup.get(key)
+        if index is None:
+            return array('q')
+        return self.runs[self.offsets[index]:self.offsets[index + 1]]
+    
+    def get_intervals(self, ranges : list) -> Interval_Set:
+        """
+        Time intervals of ranges of sample indexes, a sample covering one
+        step of the axis as in get_mask_intervals.
+
+        Parameters
+        ----------
+        ranges : list
+            [(3, 7), (0, 1)], (first, last) sample indexes.
+
+        Returns
+        -------
+        Interval_Set
+            The merged time intervals of the samples.
+
+        """
+        ranges.sort()
+        time_axis, step, breaks = self.time_axis, self.time_axis.get_step(), self.breaks
+        starts, stops = array('q'), array('q')
+        merged = []
+        for first, last in ranges:
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        for first, last in merged:
+            start = time_axis[first]
+            position = bisect_left(breaks, first)
+            while position < len(breaks) and breaks[position] < last:
+                starts.append(start)
+                stops.append(time_axis[breaks[position]] + step)
+                start = time_axis[breaks[position] + 1]
+                position += 1
+            starts.append(start)
+            stops.append(time_axis[last] + step)
+        return Interval_Set.from_arrays(starts, stops)
+    
+    def get_tiles(self, longitude_min : float, latitude_min : float, longitude_max : float, latitude_max : float):
+        """
+        Tiles overlapping a box, with the western longitude of each tile
+        expressed from longitude_min (so that boxes may cross 0 deg).
+
+        Returns
+        -------
+        generator
+            (key, x_min, y_min) of every tile.
+        """
+        size = self.tile_size
+        columns = round(360 / size)
+        width = (longitude_max - longitude_min) % 360 if longitude_max - longitude_min < 360 else 360
+        first_column = int((longitude_min % 360) // size)
+        column_count = min(int((longitude_min % 360 + width) // size) - first_column + 1, columns)
+        first_row = max(int((latitude_min + 90) // size), 0)
+        last_row = min(int((latitude_max + 90) // size), round(180 / size) - 1)
+        for row in range(first_row, last_row + 1):
+            for offset in range(column_count):
+                column = (first_column + offset) % columns
+                x_min = longitude_min + (column * size - longitude_min) % 360
+                if x_min > longitude_min + width and offset == 0:
+                    x_min -= 360
+                yield row * columns + column, x_min, row * size - 90
+    
+    def get_overflights(self, contains, longitude_min : float, latitude_min : float,
+                        longitude_max : float, latitude_max : float, classify) -> Interval_Set:
+        ranges = []
+        size = self.tile_size
+        longitudes, latitudes = self.longitudes, self.latitudes
+        for key, x_min, y_min in self.get_tiles(longitude_min, latitude_min, longitude_max, latitude_max):
+            runs = self.get_runs(key)
+            if not runs:
+                continue
+            state = classify((x_min, y_min, x_min + size, y_min + size))
+            if state is False:
+                continue
+            for position in range(0, len(runs), 2):
+                first, last = runs[position], runs[position + 1]
+                if state is True:
+                    ranges.append((first, last))
+                    continue
+                start = None
+                for index in range(first, last + 1):
+                    if contains(longitudes[index], latitudes[index]):
+                        if start is None:
+                            start = index
+                    elif start is not None:
+                        ranges.append((start, index - 1))
+                        start = None
+                if start is not None:
+                    ranges.append((start, last))
+        return self.get_intervals(ranges)
+    
+    def get_box_overflights(self, longitude_min : float, latitude_min : float,
+                            longitude_max : float, latitude_max : float) -> Interval_Set:
+        """
+        Time intervals during which the sub-satellite point is inside a
+        longitude/latitude box, bounds included.
+
+        Parameters
+        ----------
+        longitude_min : float
+            -5.0 (deg), greater than longitude_max for a box wrapping around
+            in longitude (170.0 to -170.0).
+        latitude_min : float
+            42.0 (deg)
+        longitude_max : float
+            8.0 (deg)
+        latitude_max : float
+            51.0 (deg)
+
+        Returns
+        -------
+        Interval_Set
+            [(dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc),
+              dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc))]
+
+        """
+        width = (longitude_max - longitude_min) % 360 if longitude_max - longitude_min < 360 else 360
+
+        def contains(longitude, latitude):
+            return latitude_min <= latitude <= latitude_max and (longitude - longitude_min) % 360 <= width
+
+        def classify(box):
+            x_min, y_min, x_max, y_max = box
+            if y_min >= latitude_min and y_max <= latitude_max and \
+                x_min >= longitude_min and x_max <= longitude_min + width:
+                return True
+            return None
+
+        return self.get_overflights(contains, longitude_min, latitude_min, longitude_max, latitude_max, classify)
+    
+    def get_polygon_overflights(self, vertices : list) -> Interval_Set:
+        """
+        Time intervals during which the sub-satellite point is inside a
+        polygon of (longitude, latitude) vertices, its edges being straight
+        in longitude/latitude. Consecutive vertices are less than 180 deg
+        apart in longitude, so that polygons may cross 0 deg.
+
+        Parameters
+        ----------
+        vertices : list
+            [(-5.0, 42.0), (8.0, 42.0), (8.0, 51.0), (-5.0, 51.0)]
+
+        Raises
+        ------
+        ValueError
+            A polygon has at least 3 vertices.
+
+        Returns
+        -------
+        Interval_Set
+            [(dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc),
+              dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc))]
+
+        """
+        if len(vertices) < 3:
+            raise ValueError("A polygon has at least 3 vertices.")
+        unwrapped = [tuple(vertices[0])]
+        for longitude, latitude in vertices[1:]:
+            previous = unwrapped[-1][0]
+            unwrapped.append((previous + math.remainder(longitude - previous, 360), latitude))
+        longitude_min = min(longitude for longitude, _ in unwrapped)
+        longitude_max = max(longitude for longitude, _ in unwrapped)
+        latitude_min = min(latitude for _, latitude in unwrapped)
+        latitude_max = max(latitude for _, latitude in unwrapped)
+        edges = list(zip(unwrapped, unwrapped[1:] + unwrapped[:1]))
+
+        def contains(longitude, latitude):
+            return set_point_in_polygon(longitude_min + (longitude - longitude_min) % 360, latitude, unwrapped)
+
+        def classify(box):
+            if any(set_segment_in_box(x0, y0, x1, y1, box) for (x0, y0), (x1, y1) in edges):
+                return None
+            return set_point_in_polygon((box[0] + box[2]) / 2, (box[1] + box[3]) / 2, unwrapped)
+
+        return self.get_overflights(contains, longitude_min, latitude_min, longitude_max, latitude_max, classify)
+    
+    def get_index_filepath(self) -> str:
+        return self.filepath + INDEX_SUFFIX
+    
+    def get_source_signature(self) -> list:
+        stat = os.stat(self.filepath)
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def save(self, filepath : str = None) -> str:
+        """
+        Writes the index, with the ground track it refers to, in a binary
+        file next to the source one (Sat_GEOGRAPHICAL_COORDINATES.txt.tiles).
+
+        Parameters
+        ----------
+        filepath : str, optional
+            The default is the source filepath followed by INDEX_SUFFIX.
+
+        Returns
+        -------
+        str
+            Sat_GEOGRAPHICAL_COORDINATES.txt.tiles
+
+        """
+        if filepath is None:
+            filepath = self.get_index_filepath()
+        epochs = array('q') if self.time_axis.is_regular() else self.time_axis.epochs
+        arrays = [epochs, self.longitudes, self.latitudes, self.keys, self.offsets, self.runs]
+        header = {"version" : INDEX_VERSION, "byteorder" : sys.byteorder, "tile_size" : self.tile_size,
+                  "source" : os.path.basename(self.filepath), "signature" : self.get_source_signature(),
+                  "time_axis" : [self.time_axis.start, self.time_axis.step, len(self.time_axis)],
+                  "lengths" : [len(values) for values in arrays]}
+        temporary_filepath = filepath + ".tmp"
+        with open(temporary_filepath, "wb") as file:
+            file.write(json.dumps(header).encode() + b"\n")
+            for values in arrays:
+                values.tofile(file)
+        os.replace(temporary_filepath, filepath)
+        return filepath
+    
+    @classmethod
+    def load(cls, filepath : str, source_filepath : str) -> "Ground_Track_Index":
+        """
+        Reads an index written by save.
+
+        Raises
+        ------
+        ValueError
+            The index must be of INDEX_VERSION and up to date with its source file.
+
+        Returns
+        -------
+        Ground_Track_Index
+            The index, without parsing the source file.
+
+        """
+        with open(filepath, "rb") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != INDEX_VERSION:
+                raise ValueError(f"{filepath} is not a version {INDEX_VERSION} index.")
+            index = cls.__new__(cls)
+            index.filepath = str(source_filepath)
+            index.tile_size = header["tile_size"]
+            if header["signature"] != index.get_source_signature():
+                raise ValueError(f"{filepath} is out of date with {source_filepath}.")
+            arrays = []
+            for typecode, length in zip("qddqqq", header["lengths"]):
+                values = array(typecode)
+                values.fromfile(file, length)
+                if header["byteorder"] != sys.byteorder:
+                    values.byteswap()
+                arrays.append(values)
+        epochs, index.longitudes, index.latitudes, index.keys, index.offsets, index.runs = arrays
+        index.time_axis = Time_Axis()
+        index.time_axis.start, index.time_axis.step, index.time_axis.count = header["time_axis"]
+        if epochs:
+            index.time_axis.epochs = epochs
+        index.set_lookup()
+        return index
+    
+    @classmethod
+    def open(cls, filepath : str, tile_size : float = 1.0, save : bool = True) -> "Ground_Track_Index":
+        """
+        Loads the saved index of a Sat_GEOGRAPHICAL_COORDINATES file when it
+        is up to date and of the same tile size, else parses the file,
+        builds the index and saves it next to the file.
+
+        Parameters
+        ----------
+        filepath : str
+            Sat_GEOGRAPHICAL_COORDINATES.txt
+        tile_size : float, optional
+            1.0 (deg)
+        save : bool, optional
+            True, whether a built index is saved.
+
+        Returns
+        -------
+        Ground_Track_Index
+            Ground_Track_Index of the file.
+
+        """
+        File(filepath)
+        index_filepath = filepath + INDEX_SUFFIX
+        if os.path.exists(index_filepath):
+            try:
+                index = cls.load(index_filepath, filepath)
+                if index.tile_size == tile_size:
+                    return index
+            except (ValueError, KeyError, EOFError, OSError):
+                pass
+        index = cls(Sat_Geographical_Coordinates(filepath), tile_size)
+        if save:
+            index.save(index_filepath)
+        return index
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Aggregation of the runs of a parameter sweep in one table: the initial
+conditions of each run (simu_cic_info.txt) joined with metrics derived from
+its "sat" files, computed in a pool of processes and cached per run so that
+only the new or modified runs are processed again:
+
+    python simu_cic_sweep.py [-j 4] [-o sweep.cols] SWEEP_DIR
+"""
+import argparse
+import datetime as dt
+import json
+import math
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from simu_cic_columnar import COLUMNAR_SUFFIX, save_columnar_table
+from simu_cic_file_manager import CONTENT_REGISTRY, Simulation_Run
+from simu_cic_intervals import Interval_Set
+
+INFO_FILENAME = "simu_cic_info.txt"
+CACHE_DIRNAME = ".sweep_cache"
+CACHE_VERSION = 1
+
+def get_run_signature(dirpath : str) -> list:
+    """
+    Names, sizes and modification times of the files of a run, which change
+    whenever the run is simulated again.
+
+    Parameters
+    ----------
+    dirpath : str
+        sweep/run_1
+
+    Returns
+    -------
+    list
+        [['Sat_SATELLITE_ALTITUDE.txt', 1190, 1624320000000000000], ...]
+
+    """
+    return sorted([entry.name, entry.stat().st_size, entry.stat().st_mtime_ns]
+                  for entry in os.scandir(dirpath) if entry.is_file())
+
+def get_initial_conditions(simulation_run : Simulation_Run) -> dict:
+    """
+    Flattens the informations of simu_cic_info.txt in one row, the dates
+    being given in ISO format.
+
+    Returns
+    -------
+    dict
+        {'simulation name': 'simu', 'satellite name': 'Sat', 'start (UTC)': '2021-01-01T00:00:00', ...,
+         'Altitude (km)': 607.942, ..., 'stations': 'Grasse, Paris'}
+
+    """
+    simu_cic_info = simulation_run.get_simu_cic_info()
+    row = {"simulation name" : simu_cic_info.get_simulation_name(), "satellite name" : simu_cic_info.get_satellite_name(),
+           "start (UTC)" : simu_cic_info.get_simulation_start().isoformat(),
+           "stop (UTC)" : simu_cic_info.get_simulation_stop().isoformat()}
+    for key, value in simu_cic_info.get_initial_conditions().items():
+        row[key] = value.isoformat() if isinstance(value, dt.datetime) else value
+    row["stations"] = ", ".join(simu_cic_info.get_ground_stations().values())
+    return row
+
+def get_run_metrics(simulation_run : Simulation_Run) -> dict:
+    """
+    Metrics of the "sat" files of a run: the total contact time per station,
+    the fraction of the sampled time in full eclipse, and the minimum
+    altitude. The metrics of the contents missing from the run are left out.
+
+    Returns
+    -------
+    dict
+        {'contact time station 1 (s)': 2930.0, 'eclipse fraction': 0.352, 'min altitude (km)': 598.214}
+
+    """
+    metrics = {}
+    for content in sorted(simulation_run.get_contents()):
+        content_type = CONTENT_REGISTRY.get(content)
+        if content_type.name == "GEOMETRICAL_VISIBILITY_GROUND_STATION":
+            coverage = Interval_Set.from_sat_visibility(simulation_run.get_parser(content)).get_coverage()
+            metrics[f"contact time station {content_type.get_station(content)} (s)"] = coverage.total_seconds()
+        elif content_type.name == "SATELLITE_ECLIPSE":
+            sat_eclipse = simulation_run.get_parser(content)
+            sampled = Interval_Set.from_parser(sat_eclipse, function = lambda ratio : True).get_coverage()
+            eclipse = Interval_Set.from_sat_eclipse(sat_eclipse, 100.0, 100.0).get_coverage()
+            metrics["eclipse fraction"] = eclipse / sampled if sampled else math.nan
+        elif content_type.name == "SATELLITE_ALTITUDE":
+            altitudes = [altitude for altitude in simulation_run.get_parser(content).get_results().get_column(1)
+                         if altitude == altitude]
+            metrics["min altitude (km)"] = min(altitudes) if altitudes else math.nan
+    return metrics
+
+def process_run(dirpath : str) -> dict:
+    """
+    Computes the row of a run, in a worker process.
+
+    Parameters
+    ----------
+    dirpath : str
+        sweep/run_1
+
+    Returns
+    -------
+    dict
+        {'run': 'run_1', 'signature': [...], 'row': {...}, 'elapsed': 0.012, 'error': None}
+
+    """
+    result = {"run" : os.path.basename(dirpath), "signature" : None, "row" : None, "elapsed" : 0.0, "error" : None}
+    start = time.perf_counter()
+    try:
+        result["signature"] = get_run_signature(dirpath)
+        simulation_run = Simulation_Run(dirpath)
+        result["row"] = dict(get_initial_conditions(simulation_run), **get_run_metrics(simulation_run))
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+class Parameter_Sweep():
+    
+    def __init__(self, dirpath : str, cache_dirpath : str = None) -> None:
+        """
+        This class aims at gathering the runs of a parameter sweep: the
+        sub-directories of dirpath holding a simu_cic_info.txt file. The row
+        of each run is cached in cache_dirpath, with the signature of the
+        files it was computed from (see get_run_signature).
+
+        Parameters
+        ----------
+        dirpath : str
+            sweep
+        cache_dirpath : str, optional
+            The default is the CACHE_DIRNAME sub-directory of dirpath
+            (sweep/.sweep_cache).
+
+        Raises
+        ------
+        FileNotFoundError
+            dirpath should be an existing directory.
+
+        Returns
+        -------
+        None
+
+        """
+        if not os.path.isdir(dirpath):
+            raise FileNotFoundError(f"{dirpath} is not a directory.")
+        self.dirpath = str(dirpath)
+        self.cache_dirpath = os.path.join(self.dirpath, CACHE_DIRNAME) if cache_dirpath is None else str(cache_dirpath)
+        self.rows = {}
+        self.errors = {}
+    
+    def get_run_dirpaths(self) -> dict:
+        """
+        Discovers the runs of the sweep, in alphabetical order.
+
+        Returns
+        -------
+        dict
+            {'run_1': 'sweep/run_1', 'run_2': 'sweep/run_2'}
+
+        """
+        dirpaths = {}
+        for entry in sorted(os.scandir(self.dirpath), key = lambda entry : entry.name):
+            if entry.is_dir() and os.path.isfile(os.path.join(entry.path, INFO_FILENAME)):
+                dirpaths[entry.name] = entry.path
+        return dirpaths
+    
+    def get_cache_filepath(self, run : str) -> str:
+        return os.path.join(self.cache_dirpath, run + ".json")
+    
+    def read_cache(self, run : str, signature : list) -> dict:
+        """
+        Returns the cached row of a run, or None when the run was never
+        processed or its files changed since.
+        """
+        try:
+            with open(self.get_cache_filepath(run)) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if cache.get("version") != CACHE_VERSION or cache.get("signature") != signature:
+            return None
+        return cache["row"]
+    
+    def write_cache(self, run : str, signature : list, row : dict) -> None:
+        os.makedirs(self.cache_dirpath, exist_ok = True)
+        filepath = self.get_cache_filepath(run)
+        with open(filepath + ".tmp", "w") as file:
+            json.dump({"version" : CACHE_VERSION, "signature" : signature, "row" : row}, file)
+        os.replace(filepath + ".tmp", filepath)
+    
+    def update(self, max_workers : int = None) -> list:
+        """
+        Computes the rows of the runs missing from the cache in a pool of
+        max_workers processes, and reads the others from the cache. The runs
+        which could not be processed are listed in self.errors.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            4. The default is the number of processors, 1 processes the
+            runs in the current process.
+
+        Returns
+        -------
+        list
+            [{'run': 'run_3', 'signature': [...], 'row': {...}, 'elapsed': 0.012, 'error': None}],
+            the results of the processed runs (see process_run).
+
+        """
+        rows, pending = {}, []
+        for run, dirpath in self.get_run_dirpaths().items():
+            row = self.read_cache(run, get_run_signature(dirpath))
+            if row is None:
+                pending.append(dirpath)
+            else:
+                rows[run] = row
+        workers = min(max_workers or os.cpu_count() or 1, max(len(pending), 1))
+        if workers <= 1:
+            results = [process_run(dirpath) for dirpath in pending]
+        else:
+            with ProcessPoolExecutor(max_workers = workers) as executor:
+                results = list(executor.map(process_run, pending))
+        self.errors = {}
+        for result in results:
+            if result["error"] is not None:
+                self.errors[result["run"]] = result["error"]
+                continue
+            self.write_cache(result["run"], result["signature"], result["row"])
+            rows[result["run"]] = result["row"]
+        self.rows = {run : rows[run] for run in sorted(rows)}
+        return results
+    
+    def get_runs(self) -> list:
+        return list(self.rows)
+    
+    def get_table(self) -> dict:
+        """
+        Gathers the rows in columns, the columns of the runs sorted by name:
+        array('d') for the numbers, NaN standing for the metrics a run
+        lacks, and lists of str for the others.
+
+        Returns
+        -------
+        dict
+            {'run': ['run_1', 'run_2'], 'simulation name': ['simu', 'simu'], ...,
+             'min altitude (km)': array('d', [601.6, 598.2])}
+
+        """
+        names = []
+        for row in self.rows.values():
+            names.extend(name for name in row if name not in names)
+        table = {"run" : list(self.rows)}
+        for name in names:
+            values = [row.get(name) for row in self.rows.values()]
+            if all(value is None or isinstance(value, (int, float)) for value in values):
+                table[name] = array('d', [math.nan if value is None else value for value in values])
+            else:
+                table[name] = ["" if value is None else str(value) for value in values]
+        return table
+    
+    def save(self, filepath : str = None) -> str:
+        """
+        Writes the table in a binary columnar file (see save_columnar_table).
+
+        Parameters
+        ----------
+        filepath : str, optional
+            The default is dirpath followed by COLUMNAR_SUFFIX (sweep.cols).
+
+        Returns
+        -------
+        str
+            sweep.cols
+
+        """
+        if filepath is None:
+            filepath = self.dirpath.rstrip(os.sep) + COLUMNAR_SUFFIX
+        return save_columnar_table(self.get_table(), filepath)
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(prog = "simu-cic-sweep", description = __doc__.split("\n\n")[0].strip())
+    argument_parser.add_argument("-j", "--jobs", type = int, default = None,
+                                 help = "number of worker processes (default: number of processors, 1: no pool)")
+    argument_parser.add_argument("-o", "--output", default = None,
+                                 help = f"columnar table (default: SWEEP_DIR{COLUMNAR_SUFFIX})")
+    argument_parser.add_argument("--cache-dir", default = None,
+                                 help = f"cache of the rows of the runs (default: SWEEP_DIR/{CACHE_DIRNAME})")
+    argument_parser.add_argument("dirpath", metavar = "SWEEP_DIR", help = "directory of the run directories")
+    return argument_parser
+
+def main(argv : list = None) -> int:
+    """
+    Updates the table of a sweep and prints the processed runs.
+
+    Parameters
+    ----------
+    argv : list, optional
+        ['-j', '4', 'sweep']. The default is sys.argv[1:].
+
+    Returns
+    -------
+    int
+        0, or 1 when a run could not be processed.
+
+    """
+    arguments = get_argument_parser().parse_args(argv)
+    try:
+        parameter_sweep = Parameter_Sweep(arguments.dirpath, arguments.cache_dir)
+    except FileNotFoundError as error:
+        print(error, file = sys.stderr)
+        return 1
+    start = time.perf_counter()
+    results = parameter_sweep.update(arguments.jobs)
+    for result in results:
+        if result["error"] is None:
+            print(f"{result['run']}: {result['elapsed'] * 1e3:.1f} ms")
+    for run, error in parameter_sweep.errors.items():
+        print(f"{run}: {error}", file = sys.stderr)
+    filepath = parameter_sweep.save(arguments.output)
+    processed = len(results) - len(parameter_sweep.errors)
+    print(f"{len(parameter_sweep.get_runs())} runs ({processed} processed, "
+          f"{len(parameter_sweep.get_runs()) - processed} cached) in {time.perf_counter() - start:.3f} s -> {filepath}")
+    return 1 if parameter_sweep.errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
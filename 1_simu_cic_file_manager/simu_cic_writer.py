@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Writer of "sat" files in the CIC MEM layout read by Sat_File_Parser, from
+parsed or computed simulation results.
+"""
+import bz2
+import datetime as dt
+import gzip
+import io
+import lzma
+from pathlib import Path
+
+from simu_cic_file_manager import COMPRESSION_SUFFIXES, CONTENT_REGISTRY, INTEGER_TYPECODES, \
+    Sat_File_Parser, Simulation_Results, set_datetime_to_epoch
+
+# Decimals of the value columns in the files generated by simu-cic, the
+# integer columns (orbit numbers, visibilities) being written as integers.
+COLUMN_DECIMALS = {"distance (km)" : 3, "altitude (km)" : 3, "azimut (deg)" : 5, "elevation (deg)" : 5,
+                   "sun_eclipse_ratio (%)" : 2, "longitude (deg)" : 6, "latitude (deg)" : 6}
+
+# Header keys in the order of the simu-cic files, with the blank lines and
+# META_START between the groups.
+HEADER_LAYOUT = [['CIC_MEM_VERS', 'CREATION_DATE', 'ORIGINATOR'], ['META_START'], ['COMMENT'],
+                 ['OBJECT_NAME', 'OBJECT_ID'],
+                 ['USER_DEFINED_PROTOCOL', 'USER_DEFINED_CONTENT', 'TIME_SYSTEM', 'START_TIME', 'STOP_TIME']]
+
+DAY = 86400000000
+
+def set_datetime_to_str(date : dt.datetime) -> str:
+    """
+    Convert a datetime to the date format of the headers (milliseconds).
+
+    Parameters
+    ----------
+    date : dt.datetime
+        dt.datetime(2021, 6, 22, 0, 0)
+
+    Returns
+    -------
+    str
+        '2021-06-22T00:00:00.000'
+
+    """
+    return f"{date:%Y-%m-%dT%H:%M:%S}.{date.microsecond // 1000:03d}"
+
+def get_header(simulation_informations : dict) -> dict:
+    """
+    Header of a file as written, from simulation informations either raw
+    (get_simulation_informations) or formatted (get_simulation_data).
+
+    Parameters
+    ----------
+    simulation_informations : dict
+        {'CREATION_DATE': dt.datetime(2021, 6, 23, 9, 52, 26), 'COMMENT': ['Date', 'distance (km)'],
+         'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_1', 'START_TIME': dt.datetime(2021, 6, 22, 0, 0),
+         'STOP_TIME': dt.datetime(2022, 6, 22, 0, 0), 'SIMULATION_RESULTS': Simulation_Results}
+
+    Raises
+    ------
+    ValueError
+        - USER_DEFINED_CONTENT must be registered in CONTENT_REGISTRY.
+        - START_TIME and STOP_TIME are required.
+
+    Returns
+    -------
+    dict
+        {'CIC_MEM_VERS': '2.0', 'CREATION_DATE': '2021-06-23T09:52:26.000', 'ORIGINATOR': 'CNES',
+         'COMMENT': 'days (MJD), sec (UTC), distance (km)', 'OBJECT_NAME': 'Sat', 'OBJECT_ID': 'Sat',
+         'USER_DEFINED_PROTOCOL': 'CIC', 'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_1',
+         'TIME_SYSTEM': 'UTC', 'START_TIME': '2021-06-22T00:00:00.000', 'STOP_TIME': '2022-06-22T00:00:00.000'}
+
+    """
+    user_defined_content = simulation_informations.get('USER_DEFINED_CONTENT', '')
+    content_type = CONTENT_REGISTRY.get(user_defined_content)
+    if content_type is None:
+        raise ValueError(f"USER_DEFINED_CONTENT {user_defined_content!r} must be one of {CONTENT_REGISTRY.get_names()}.")
+    for key in ('START_TIME', 'STOP_TIME'):
+        if simulation_informations.get(key) is None:
+            raise ValueError(f"{key} is required.")
+    object_name = simulation_informations.get('OBJECT_NAME', 'Sat')
+    header = {'CIC_MEM_VERS' : '2.0',
+              'CREATION_DATE' : dt.datetime.now(dt.timezone.utc).replace(tzinfo = None),
+              'ORIGINATOR' : 'CNES', 'COMMENT' : ['Date'] + content_type.column_names,
+              'OBJECT_NAME' : object_name, 'OBJECT_ID' : object_name, 'USER_DEFINED_PROTOCOL' : 'CIC',
+              'TIME_SYSTEM' : 'UTC'}
+    header.update((key, value) for key, value in simulation_informations.items() if key != 'SIMULATION_RESULTS')
+    for key, value in header.items():
+        if isinstance(value, dt.datetime):
+            header[key] = set_datetime_to_str(value)
+        elif key == 'COMMENT' and not isinstance(value, str):
+            header[key] = ", ".join(['days (MJD)', 'sec (UTC)'] + list(value[1:]))
+        else:
+            header[key] = str(value)
+    return header
+
+def format_header(header : dict) -> str:
+    """
+    Text of a header up to the first data row, laid out as the simu-cic
+    files. Keys missing from HEADER_LAYOUT are written after STOP_TIME.
+
+    Parameters
+    ----------
+    header : dict
+        {'CIC_MEM_VERS': '2.0', ..., 'STOP_TIME': '2022-06-22T00:00:00.000'}, see get_header.
+
+    Returns
+    -------
+    str
+        'CIC_MEM_VERS = 2.0\\nCREATION_DATE  = 2021-06-23T09:52:26.000\\n...META_STOP\\n\\n'
+
+    """
+    extra_keys = [key for key in header if not any(key in keys for keys in HEADER_LAYOUT)]
+    lines = []
+    for keys in HEADER_LAYOUT[:-1] + [HEADER_LAYOUT[-1] + extra_keys]:
+        for key in keys:
+            if key == 'META_START':
+                lines.append(key)
+            elif key in header:
+                lines.append(f"{key:<14} = {header[key]}" if key in ('CREATION_DATE', 'ORIGINATOR')
+                             else f"{key} = {header[key]}")
+        lines.append("")
+    lines += ["META_STOP", "", ""]
+    return "\n".join(lines)
+
+def open_text_for_writing(filepath : str, encoding : str = None) -> io.TextIOBase:
+    """
+    Opens a text stream compressed according to the suffix of filepath, as
+    read by File.open_text.
+
+    Parameters
+    ----------
+    filepath : str
+        Sat_ORBIT_NUMBER.txt.gz
+    encoding : str, optional
+        "ascii". The default is the locale encoding.
+
+    Raises
+    ------
+    ValueError
+        filepath extension must be '.txt', optionally followed by a
+        compression suffix in {COMPRESSION_SUFFIXES}.
+    ImportError
+        Writing '.zst' files requires the zstandard package (or Python 3.14+).
+
+    Returns
+    -------
+    io.TextIOBase
+        Text stream writing the (compressed) file.
+
+    """
+    path = Path(filepath)
+    compression = path.suffix if path.suffix in COMPRESSION_SUFFIXES else None
+    if Path(path.stem if compression else path.name).suffix.lower() != ".txt":
+        raise ValueError(f"filepath extension must be '.txt' or '.txt' followed by one of {COMPRESSION_SUFFIXES}.")
+    if compression == ".gz":
+        return gzip.open(filepath, "wt", encoding = encoding)
+    if compression == ".xz":
+        return lzma.open(filepath, "wt", encoding = encoding)
+    if compression == ".bz2":
+        return bz2.open(filepath, "wt", encoding = encoding)
+    if compression == ".zst":
+        try:
+            from compression import zstd
+            return zstd.open(filepath, "wt", encoding = encoding)
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("Writing '.zst' files requires the zstandard package.") from error
+        binary_file = open(filepath, "wb")
+        try:
+            return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(binary_file, closefd = True), encoding = encoding)
+        except BaseException:
+            binary_file.close()
+            raise
+    return open(filepath, "w", encoding = encoding)
+
+class Sat_File_Writer():
+    
+    def __init__(self, filepath : str, simulation_informations : dict, decimals : list = None,
+                 typecodes : list = None, buffer_size : int = 4096) -> None:
+        """
+        This class aims at writing "sat" files that Sat_File_Parser reads back
+        unchanged. The header is written when the writer is created, the rows
+        are formatted with one printf-style format per row (fixed decimals for
+        each value column) and written by chunks of buffer_size rows.
+
+        The dates are written as MJD day and seconds of day with 5 decimals,
+        or 6 when the epoch is not a multiple of 10 microseconds, so that
+        every epoch reads back exactly. A value reads back exactly when its
+        column has at least as many decimals as the value; a decimals entry
+        of None writes the shortest repr of the value, exact for any double.
+
+        Parameters
+        ----------
+        filepath : str
+            Sat_DISTANCE_GROUND_STATION_1.txt, compressed when ending with a
+            suffix of COMPRESSION_SUFFIXES (Sat_DISTANCE_GROUND_STATION_1.txt.gz).
+        simulation_informations : dict
+            {'USER_DEFINED_CONTENT': 'DISTANCE_GROUND_STATION_1', 'START_TIME': dt.datetime(2021, 6, 22, 0, 0),
+             'STOP_TIME': dt.datetime(2022, 6, 22, 0, 0)}, see get_header.
+        decimals : list, optional
+            [3]. The number of decimals of each value column, the default
+            being COLUMN_DECIMALS for the columns of the content.
+        typecodes : list, optional
+            ['i']. The typecode of each value column, integer typecodes being
+            written as integers. The default is the schema of the content.
+        buffer_size : int, optional
+            4096, the number of rows formatted before each write.
+
+        Raises
+        ------
+        ValueError
+            - See get_header and open_text_for_writing.
+            - decimals and typecodes must have one entry per column.
+
+        Returns
+        -------
+        None
+
+        """
+        self.filepath = str(filepath)
+        self.header = get_header(simulation_informations)
+        content_type = CONTENT_REGISTRY.get(self.header['USER_DEFINED_CONTENT'])
+        if typecodes is None:
+            typecodes = content_type.get_typecodes()
+        if decimals is None:
+            decimals = [COLUMN_DECIMALS.get(column_name) for column_name in content_type.column_names]
+        if len(decimals) != len(typecodes):
+            raise ValueError(f"Expected {len(typecodes)} decimals, got {len(decimals)}.")
+        formats = ["%d" if typecode in INTEGER_TYPECODES else "%r" if decimal is None else f"%.{decimal}f"
+                   for typecode, decimal in zip(typecodes, decimals)]
+        self.row_format = " ".join(["%d %d.%05d"] + formats) + "\n"
+        self.fine_row_format = " ".join(["%d %d.%06d"] + formats) + "\n"
+        self.buffer_size = buffer_size
+        self.row_count = 0
+        self.file = open_text_for_writing(self.filepath, encoding = "ascii")
+        self.file.write(format_header(self.header))
+    
+    def write_rows(self, epochs, columns) -> int:
+        """
+        Writes rows from columns of values, which may be arrays, lists or
+        generators: they are consumed buffer_size rows at a time.
+
+        Parameters
+        ----------
+        epochs : iterable
+            Time_Axis or array('q', [5132938620000000, 5132938630000000]),
+            microseconds since the MJD epoch.
+        columns : list
+            [array('d', [1096.411, 1052.271])], one iterable per value column.
+
+        Returns
+        -------
+        int
+            2, the number of rows written.
+
+        """
+        row_format, fine_row_format = self.row_format, self.fine_row_format
+        buffer = []
+        append = buffer.append
+        count = 0
+        for epoch, *values in zip(epochs, *columns):
+            day, microseconds = divmod(epoch, DAY)
+            seconds, microseconds = divmod(microseconds, 1000000)
+            if microseconds % 10:
+                append(fine_row_format % (day, seconds, microseconds, *values))
+            else:
+                append(row_format % (day, seconds, microseconds // 10, *values))
+            if len(buffer) >= self.buffer_size:
+                self.file.write("".join(buffer))
+                count += len(buffer)
+                buffer.clear()
+        self.file.write("".join(buffer))
+        count += len(buffer)
+        self.row_count += count
+        return count
+    
+    def write_row(self, date, values : list) -> None:
+        """
+        Writes one row.
+
+        Parameters
+        ----------
+        date : dt.datetime or int
+            dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc) or
+            5132938620000000 (microseconds since the MJD epoch).
+        values : list
+            [1096.411]
+
+        Returns
+        -------
+        None
+
+        """
+        epoch = set_datetime_to_epoch(date) if isinstance(date, dt.datetime) else date
+        self.write_rows((epoch,), [(value,) for value in values])
+    
+    def write_results(self, simulation_results : Simulation_Results) -> int:
+        return self.write_rows(simulation_results.epochs, simulation_results.columns)
+    
+    def close(self) -> None:
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+def write_sat_file(filepath : str, sat_file_parser : Sat_File_Parser, decimals : list = None, **kwargs) -> int:
+    """
+    Writes the header and the simulation results of a parser, such as a
+    parsed file or J2_Propagator.get_parsers, to a "sat" file.
+
+    Parameters
+    ----------
+    filepath : str
+        Sat_SATELLITE_ALTITUDE.txt.gz
+    sat_file_parser : Sat_File_Parser
+        Sat_Altitude(Sat_SATELLITE_ALTITUDE.txt)
+    decimals : list, optional
+        [3], see Sat_File_Writer.
+    **kwargs
+        ORIGINATOR = "J2_Propagator", header fields replacing those of the parser.
+
+    Returns
+    -------
+    int
+        3, the number of rows written.
+
+    """
+    simulation_informations = dict(sat_file_parser.simulation_data, **kwargs)
+    simulation_results = sat_file_parser.get_results()
+    typecodes = [column.typecode for column in simulation_results.columns] or None
+    with Sat_File_Writer(filepath, simulation_informations, decimals, typecodes) as sat_file_writer:
+        return sat_file_writer.write_results(simulation_results)
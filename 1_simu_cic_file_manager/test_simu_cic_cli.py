@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the command line interface.
+"""
+import io
+import os
+import shutil
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from tempfile import TemporaryDirectory
+
+from simu_cic_cli import get_filepaths, main, run_task
+from simu_cic_columnar import load_columnar
+from simu_cic_file_manager import Sat_Altitude
+from simu_cic_samples import SAMPLE_FILEPATHS, copy_samples
+
+class Test_Cli(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.run_dirpaths = []
+        for name in ("run_1", "run_2"):
+            dirpath = os.path.join(self.temp_dir.name, name)
+            os.mkdir(dirpath)
+            copy_samples(dirpath)
+            shutil.copy("simu_cic_info.txt", dirpath)
+            self.run_dirpaths.append(dirpath)
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def run_main(self, *argv) -> tuple:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+    
+    def test_get_filepaths(self) -> None:
+        self.assertEqual(len(get_filepaths(self.run_dirpaths, "info")), 2 * len(SAMPLE_FILEPATHS))
+        self.assertEqual([os.path.basename(filepath) for filepath in get_filepaths(self.run_dirpaths[:1], "passes", 1)],
+                         ["Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt"])
+        self.assertEqual(get_filepaths(self.run_dirpaths[:1], "passes", 2), [])
+        with self.assertRaises(FileNotFoundError):
+            get_filepaths([os.path.join(self.temp_dir.name, "run_3")], "info")
+            
+    def test_info_in_a_process_pool(self) -> None:
+        status, stdout, _ = self.run_main("-j", "2", "info", *self.run_dirpaths)
+        self.assertEqual(status, 0)
+        self.assertIn("USER_DEFINED_CONTENT SATELLITE_ALTITUDE", stdout)
+        self.assertIn("step 10 s, regular", stdout)
+        self.assertIn(f"{2 * len(SAMPLE_FILEPATHS)} files, {6 * len(SAMPLE_FILEPATHS)} rows", stdout)
+        self.assertIn("2 processes", stdout)
+        self.assertIn("MB/s", stdout.splitlines()[0])
+        
+    def test_stats(self) -> None:
+        status, stdout, _ = self.run_main("-j", "1", "stats", os.path.join(self.run_dirpaths[0], "Sat_SATELLITE_ALTITUDE.txt"))
+        self.assertEqual(status, 0)
+        self.assertIn("altitude (km): count 3, nan 0, min 601.674, max 601.806, mean 601.74", stdout)
+        
+    def test_passes_and_eclipses(self) -> None:
+        status, stdout, _ = self.run_main("-j", "1", "passes", "--station", "1", self.run_dirpaths[0])
+        self.assertEqual(status, 0)
+        self.assertIn("2021-07-14T00:17:00.000000  2021-07-14T00:17:30.000000  30.000 s", stdout)
+        status, stdout, _ = self.run_main("-j", "1", "eclipses", "--min-duration", "60", self.run_dirpaths[0])
+        self.assertIn("0 intervals", stdout)
+        
+    def test_convert(self) -> None:
+        output_dirpath = os.path.join(self.temp_dir.name, "converted")
+        status, _, _ = self.run_main("-j", "1", "-q", "convert", "-o", output_dirpath, self.run_dirpaths[0])
+        self.assertEqual(status, 0)
+        self.assertEqual(len(os.listdir(output_dirpath)), len(SAMPLE_FILEPATHS))
+        loaded = load_columnar(os.path.join(output_dirpath, "Sat_SATELLITE_ALTITUDE.txt.cols"))
+        self.assertEqual(loaded.get_results(), Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]).get_results())
+        self.run_main("-j", "1", "convert", "-f", "txt.gz", self.run_dirpaths[0])
+        self.assertEqual(Sat_Altitude(os.path.join(self.run_dirpaths[0], "Sat_SATELLITE_ALTITUDE.txt.gz")).get_results(),
+                         Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]).get_results())
+        self.run_main("-j", "1", "convert", "-f", "csv", os.path.join(self.run_dirpaths[0], "Sat_SATELLITE_ALTITUDE.txt"))
+        with open(os.path.join(self.run_dirpaths[0], "Sat_SATELLITE_ALTITUDE.csv")) as file:
+            self.assertEqual(file.readline(), "Date,altitude (km)\n")
+            self.assertEqual(file.readline(), "2021-07-14T00:17:00.000000,601.674\n")
+            
+    def test_errors_are_reported_per_file(self) -> None:
+        status, stdout, stderr = self.run_main("-j", "1", "passes", os.path.join(self.run_dirpaths[0], "Sat_ORBIT_NUMBER.txt"),
+                                               os.path.join(self.run_dirpaths[0], "simu_cic_info.txt"), 
+                                               os.path.join(self.run_dirpaths[0], "Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt"))
+        self.assertEqual(status, 1)
+        self.assertEqual(len(stderr.splitlines()), 2)
+        self.assertIn("1 intervals", stdout)
+        
+    def test_unexpected_errors_are_reported_per_file(self) -> None:
+        options = {"min_duration" : None, "minimum" : 100.0, "maximum" : 100.0}
+        task = run_task("eclipses", SAMPLE_FILEPATHS["SATELLITE_ECLIPSE"], options)
+        self.assertTrue(task["error"].startswith("TypeError: "))
+        self.assertEqual(task["lines"], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the binary columnar copies of the "sat" files.
+"""
+import json
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from simu_cic_columnar import COLUMNAR_SUFFIX, load_columnar, save_columnar
+from simu_cic_file_manager import Sat_Geographical_Coordinates, Sat_Orbit_Number, Sat_Visibility
+from simu_cic_samples import SAMPLE_FILEPATHS
+
+class Test_Columnar(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def test_save_and_load_columnar(self) -> None:
+        for sat_file_parser in (Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]),
+                                Sat_Orbit_Number(SAMPLE_FILEPATHS["ORBIT_NUMBER"], precision = "single"),
+                                Sat_Visibility(SAMPLE_FILEPATHS["GEOMETRICAL_VISIBILITY_GROUND_STATION_1"])):
+            filepath = save_columnar(sat_file_parser, os.path.join(self.temp_dir.name, "copy" + COLUMNAR_SUFFIX))
+            loaded = load_columnar(filepath)
+            self.assertIsInstance(loaded, type(sat_file_parser))
+            self.assertEqual(loaded.simulation_data, sat_file_parser.simulation_data)
+            self.assertEqual([column.typecode for column in loaded.get_results().columns],
+                             [column.typecode for column in sat_file_parser.get_results().columns])
+            self.assertEqual(loaded.get_basename(), sat_file_parser.get_basename())
+            
+    def test_save_and_load_an_irregular_time_axis(self) -> None:
+        filepath = os.path.join(self.temp_dir.name, "Sat_ORBIT_NUMBER.txt")
+        with open(SAMPLE_FILEPATHS["ORBIT_NUMBER"]) as file:
+            text = file.read().rstrip("\n")
+        with open(filepath, "w") as file:
+            file.write(text + "\n59409 1100.00000 330\n")
+        sat_orbit_number = Sat_Orbit_Number(filepath)
+        self.assertFalse(sat_orbit_number.get_results().epochs.is_regular())
+        self.assertEqual(save_columnar(sat_orbit_number), filepath + COLUMNAR_SUFFIX)
+        loaded = load_columnar(filepath + COLUMNAR_SUFFIX)
+        self.assertEqual(loaded.get_results(), sat_orbit_number.get_results())
+        self.assertEqual(loaded.get_results().epochs.find(sat_orbit_number.get_results().epochs[3]), 3)
+        
+    def test_load_columnar_raises_valueerror_when_given_another_version(self) -> None:
+        filepath = os.path.join(self.temp_dir.name, "copy" + COLUMNAR_SUFFIX)
+        with open(filepath, "wb") as file:
+            file.write(json.dumps({"version" : 0}).encode() + b"\n")
+        with self.assertRaises(ValueError):
+            load_columnar(filepath)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the constellations.
+"""
+import datetime as dt
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from simu_cic_constellation import Constellation
+from simu_cic_file_manager import CONTENT_REGISTRY
+from simu_cic_samples import copy_samples
+
+DATE_0 = dt.datetime(2021, 7, 14, 0, 17, tzinfo = dt.timezone.utc)
+DATE_1 = dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo = dt.timezone.utc)
+VISIBILITY = "GEOMETRICAL_VISIBILITY_GROUND_STATION_1"
+
+class Test_Constellation(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.dirpath = tempfile.mkdtemp()
+        shutil.copy("simu_cic_info.txt", self.dirpath)
+        for object_name in ("SatA", "SatB"):
+            copy_samples(self.dirpath, object_name, [VISIBILITY, "ORBIT_NUMBER"])
+        filepath = os.path.join(self.dirpath, f"SatB_{VISIBILITY}.txt")
+        with open(filepath) as file:
+            text = file.read()
+        with open(filepath, "w") as file:
+            file.write(text.replace("59409 1030.00000 1", "59409 1030.00000 0"))
+        self.constellation = Constellation(self.dirpath)
+        
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dirpath)
+        
+    def test_init_raises_filenotfounderror_when_given_a_missing_directory(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            Constellation(os.path.join(self.dirpath, "missing"))
+            
+    def test_get_object_names(self) -> None:
+        self.assertEqual(self.constellation.get_object_names(), ["SatA", "SatB"])
+        
+    def test_load_shares_identical_time_axes(self) -> None:
+        parsers = self.constellation.load(VISIBILITY, max_workers = 2)
+        self.assertIs(parsers["SatA"].get_results().epochs, parsers["SatB"].get_results().epochs)
+        self.assertIs(self.constellation.load(VISIBILITY)["SatA"], parsers["SatA"])
+        
+    def test_get_stacked_column(self) -> None:
+        stacked_column = self.constellation.get_stacked_column(VISIBILITY, max_workers = 1)
+        self.assertEqual(list(stacked_column.get_values_at(DATE_0)), [1, 1])
+        self.assertEqual(list(stacked_column.get_values_at(DATE_1)), [1, 0])
+        self.assertEqual(list(stacked_column.get_series("SatB")), [1, 0, 1])
+        self.assertIs(self.constellation.get_stacked_column(VISIBILITY), stacked_column)
+        self.assertIsNot(self.constellation.get_stacked_column("ORBIT_NUMBER", max_workers = 1), stacked_column)
+        
+    def test_get_stacked_column_on_different_time_axes(self) -> None:
+        filepath = os.path.join(self.dirpath, f"SatB_{VISIBILITY}.txt")
+        with open(filepath) as file:
+            text = file.read()
+        with open(filepath, "w") as file:
+            file.write(text.replace("59409 1020.00000 1\n", ""))
+        stacked_column = Constellation(self.dirpath).get_stacked_column(VISIBILITY, max_workers = 1)
+        values = stacked_column.get_values_at(DATE_0)
+        self.assertEqual(values[0], 1.0)
+        self.assertTrue(math.isnan(values[1]))
+        self.assertEqual(stacked_column.get_object_names_where(DATE_0), ["SatA"])
+        
+    def test_get_stacked_column_when_a_column_was_widened(self) -> None:
+        filepath = os.path.join(self.dirpath, f"SatB_{VISIBILITY}.txt")
+        with open(filepath) as file:
+            text = file.read()
+        with open(filepath, "w") as file:
+            file.write(text.replace("59409 1030.00000 0", "59409 1030.00000 0.5"))
+        stacked_column = Constellation(self.dirpath).get_stacked_column(VISIBILITY, max_workers = 1)
+        self.assertEqual(stacked_column.values.typecode, 'd')
+        self.assertEqual(list(stacked_column.get_values_at(DATE_1)), [1.0, 0.5])
+        
+    def test_load_keeps_the_time_axes_of_frozen_parsers(self) -> None:
+        parser_class = CONTENT_REGISTRY.get_parser_class(VISIBILITY)
+        for object_name, simulation_run in self.constellation.simulation_runs.items():
+            simulation_run.parsers[(VISIBILITY, None, None)] = parser_class(simulation_run.get_filepath(VISIBILITY),
+                                                                            frozen = True)
+        parsers = self.constellation.load(VISIBILITY, max_workers = 1)
+        self.assertTrue(parsers["SatA"].is_frozen())
+        self.assertEqual(list(self.constellation.get_stacked_column(VISIBILITY).get_series("SatB")), [1, 0, 1])
+        
+    def test_get_visible_object_names(self) -> None:
+        self.assertEqual(self.constellation.get_visible_object_names(DATE_1, max_workers = 1), ["SatA"])
+        self.assertEqual(self.constellation.get_visible_object_names(DATE_1, "grasse", max_workers = 1), ["SatA"])
+        os.remove(os.path.join(self.dirpath, "simu_cic_info.txt"))
+        self.assertEqual(self.constellation.get_visible_object_names(DATE_0, "Grasse"), ["SatA", "SatB"])
+        
+    def test_get_visible_object_names_raises_valueerror_when_given_an_unknown_station(self) -> None:
+        with self.assertRaises(ValueError):
+            self.constellation.get_visible_object_names(DATE_1, "Toulouse")
+            
+if __name__ == '__main__':
+    unittest.main()
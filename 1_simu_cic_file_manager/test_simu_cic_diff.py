@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the run-to-run differences of the "sat" files.
+"""
+import datetime as dt
+import math
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from hypothesis import given, settings, strategies as st
+
+from simu_cic_diff import Run_Difference, diff, iter_file_chunks
+from simu_cic_file_manager import Sat_Altitude, Sat_Geographical_Coordinates, Sat_Visibility
+from simu_cic_samples import SAMPLE_FILEPATHS
+from simu_cic_writer import Sat_File_Writer
+
+EPOCH_0 = 5132938620000000
+STEP = 10000000
+HEADER = {'START_TIME' : dt.datetime(2021, 6, 22), 'STOP_TIME' : dt.datetime(2022, 6, 22)}
+
+class Test_Run_Difference(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def write(self, name : str, content : str, rows : dict) -> str:
+        filepath = os.path.join(self.temp_dir.name, name, f"Sat_{content}.txt")
+        os.makedirs(os.path.dirname(filepath), exist_ok = True)
+        with Sat_File_Writer(filepath, dict(HEADER, USER_DEFINED_CONTENT = content)) as sat_file_writer:
+            epochs = sorted(rows)
+            sat_file_writer.write_rows(epochs, list(zip(*[rows[epoch] for epoch in epochs])))
+        return filepath
+    
+    def test_iter_file_chunks(self) -> None:
+        chunks = list(iter_file_chunks(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"], 2))
+        self.assertEqual([len(epochs) for epochs, _ in chunks], [2, 1])
+        self.assertEqual(list(chunks[1][1][0]), [601.806])
+        
+    def test_diff_of_identical_files(self) -> None:
+        summary = diff(Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]), SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"])
+        self.assertEqual((summary["aligned"], summary["only_a"], summary["only_b"], summary["step"]), (3, 0, 0, STEP))
+        metrics = summary["columns"]["altitude (km)"]
+        self.assertEqual((metrics["mean"], metrics["rms"], metrics["max_absolute"], metrics["integral_difference"]),
+                         (0.0, 0.0, 0.0, 0.0))
+        self.assertAlmostEqual(metrics["mean_a"], 601.7403333333333)
+        
+    def test_diff_raises_valueerror_when_given_different_contents(self) -> None:
+        with self.assertRaises(ValueError):
+            Run_Difference(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"], SAMPLE_FILEPATHS["ORBIT_NUMBER"])
+            
+    def test_visibility_seconds_gained(self) -> None:
+        content = "GEOMETRICAL_VISIBILITY_GROUND_STATION_1"
+        filepath_a = self.write("run_1", content, {EPOCH_0 + i * STEP : (int(100 <= i < 160),) for i in range(1000)})
+        filepath_b = self.write("run_2", content, {EPOCH_0 + i * STEP : (int(95 <= i < 170),) for i in range(1, 1001)})
+        summary = diff(filepath_a, Sat_Visibility(filepath_b), chunk_size = 100)
+        self.assertEqual((summary["aligned"], summary["only_a"], summary["only_b"]), (999, 1, 1))
+        self.assertEqual(summary["columns"]["station_visibility"]["integral_difference"], 150.0)
+        
+    def test_differences_of_periodic_columns_are_wrapped(self) -> None:
+        content = "GEOGRAPHICAL_COORDINATES"
+        filepath_a = self.write("run_1", content, {EPOCH_0 : (359.5, 10.0), EPOCH_0 + STEP : (0.5, 10.0)})
+        filepath_b = self.write("run_2", content, {EPOCH_0 : (0.5, 10.25), EPOCH_0 + STEP : (359.5, 10.0)})
+        run_difference = Run_Difference(filepath_a, Sat_Geographical_Coordinates(filepath_b))
+        [(epochs, differences)] = list(run_difference.iter_differences())
+        self.assertEqual(list(epochs), [EPOCH_0, EPOCH_0 + STEP])
+        self.assertEqual(list(differences[0]), [1.0, -1.0])
+        self.assertEqual(list(differences[1]), [0.25, 0.0])
+        metrics = run_difference.get_summary()["columns"]["longitude (deg)"]
+        self.assertEqual(metrics["mean_absolute"], 1.0)
+        self.assertEqual(metrics["max_absolute_date"], dt.datetime(2021, 7, 14, 0, 17, tzinfo = dt.timezone.utc))
+        with self.assertRaises(ValueError):
+            list(run_difference.iter_differences())
+            
+    @settings(deadline = None, max_examples = 30)
+    @given(st.sets(st.integers(0, 300)), st.sets(st.integers(0, 300)), st.integers(1, 50))
+    def test_alignment_matches_a_dictionary_join(self, indexes_a : set, indexes_b : set, chunk_size : int) -> None:
+        content = "SATELLITE_ALTITUDE"
+        rows_a = {EPOCH_0 + i * STEP : (600.0 + i / 8,) for i in indexes_a}
+        rows_b = {EPOCH_0 + i * STEP : (600.0 + i / 4,) for i in indexes_b}
+        filepath_a, filepath_b = self.write("run_1", content, rows_a), self.write("run_2", content, rows_b)
+        run_difference = Run_Difference(filepath_a, filepath_b, chunk_size)
+        differences = {}
+        for epochs, (column,) in run_difference.iter_differences():
+            differences.update(zip(epochs, column))
+        self.assertEqual(differences, {epoch : rows_b[epoch][0] - rows_a[epoch][0] for epoch in rows_a.keys() & rows_b.keys()})
+        summary = run_difference.get_summary()
+        self.assertEqual((summary["only_a"], summary["only_b"]), (len(rows_a.keys() - rows_b.keys()), len(rows_b.keys() - rows_a.keys())))
+        if not differences:
+            self.assertTrue(math.isnan(summary["columns"]["altitude (km)"]["mean"]))
+
+if __name__ == '__main__':
+    unittest.main()
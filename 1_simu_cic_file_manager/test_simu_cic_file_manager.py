@@ -4,11 +4,21 @@ Created on Thu Mar  9 11:02:33 2023
 
 @author: Sacha
 """
+import bz2
 import datetime as dt
+import gzip
+import lzma
+import math
 import os
+import pickle
+import shutil
+import threading
+import time
 import unittest
 
+from array import array
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 from unittest.mock import MagicMock
@@ -17,10 +27,11 @@ from pathlib import Path
 
 from hypothesis import given, assume, strategies as st
 
-from simu_cic_file_manager import File, Stations_Ref_File_Parser, Simu_Cic_Info_File_Parser, \
+from simu_cic_file_manager import get_content_type, File, Stations_Ref_File_Parser, Simu_Cic_Info_File_Parser, \
     Sat_File_Parser, Sat_Orbit_Number, Sat_Altitude, \
     Sat_Geographical_Coordinates, Sat_Distance_To_Ground_Station, Sat_Visibility, \
-    Sat_Position, Sat_Eclipse
+    Sat_Position, Sat_Eclipse, Simulation_Results, Simulation_Result, Parser_Cache, Time_Axis, \
+    Frozen_Array, Frozen_Time_Axis, CONTENT_REGISTRY, Simulation_Run, get_sat_filepaths, sniff_header
 
 PATH_DATA = r'^[A-Za-z]:\\(?:[^\\/:*?"<>|\r\n]+\\)*[^\\/:*?"<>|\r\n]*$|^/$|^\\$|^\\.\\.\\(?:[\\/][^\\/:*?"<>|\r\n]+)*$|^[^\\/:*?"<>|\r\n]+(?:[\\/][^\\/:*?"<>|\r\n]+)*$'
 
@@ -133,6 +144,31 @@ class Test_File(unittest.TestCase):
             mock_basename.return_value = "a_basename"
             self.assertEqual(file.get_basename(), "a_basename")
             
+    def test_init_with_a_compressed_filepath(self) -> None:
+        for suffix in [".txt.gz", ".txt.xz", ".txt.bz2", ".txt.zst"]:
+            with self._create_temp_filepath(suffix = suffix) as temp_filepath:
+                self.assertEqual(File(temp_filepath.name).get_compression(), suffix[4:])
+                
+    def test_init_raises_valueerror_when_a_compressed_filepath_is_not_txt(self) -> None:
+        with self._create_temp_filepath(suffix = ".csv.gz") as temp_filepath:
+            with self.assertRaises(ValueError):
+                File(temp_filepath.name)
+                
+    def test_get_uncompressed_basename(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "Sat_ORBIT_NUMBER.txt.xz")
+            Path(filepath).touch()
+            self.assertEqual(File(filepath).get_uncompressed_basename(), "Sat_ORBIT_NUMBER.txt")
+            
+    def test_open_text_decompresses_the_file(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            for suffix, module in [(".gz", gzip), (".xz", lzma), (".bz2", bz2)]:
+                filepath = os.path.join(temp_dir, "simu_cic_info.txt" + suffix)
+                with module.open(filepath, "wt") as file:
+                    file.write("Name: Sat\n")
+                with File(filepath).open_text() as file:
+                    self.assertEqual(file.read(), "Name: Sat\n")
+        
     def test_get_extension(self) -> None:
         with NamedTemporaryFile(suffix = ".txt", delete = True) as temp_filepath:
             file = File(temp_filepath.name)
@@ -179,7 +215,7 @@ class Test_Stations_Ref_File_Parser(unittest.TestCase):
                                               'altitude': 30.0}}
         
     def test_get_ground_stations_informations(self) -> None:
-        with open(self.path) as file:
+        with open(self.path, encoding = "latin-1") as file:
             self.assertEqual(self.file_parser.get_ground_stations_informations(file), 
                              self.ground_stations_informations)
         
@@ -200,6 +236,30 @@ class Test_Stations_Ref_File_Parser(unittest.TestCase):
     
     def test_get_ground_altitude(self) -> None:
         self.assertEqual(self.file_parser.get_ground_station_altitude("Grasse"), 1323.0)
+        
+    def test_get_ground_min_elevation(self) -> None:
+        self.assertEqual(self.file_parser.get_ground_station_min_elevation("Grasse"), 0.0)
+    
+    def test_get_ground_stations_records(self) -> None:
+        records = self.file_parser.ground_stations_records
+        self.assertEqual([record["mnemonic"] for record in records], ["", "PAR"])
+        self.assertEqual(records[1]["altitude"], 30.0)
+        self.assertTrue(math.isnan(records[1]["reconfiguration_time"]))
+        self.assertTrue(math.isnan(records[1]["conjunction_angle"]))
+    
+    def test_get_ground_station_with_any_case_or_mnemonic(self) -> None:
+        for name in ["Paris", "paris", "PARIS", "PAR", "par"]:
+            self.assertEqual(self.file_parser.get_ground_station_name(name), "Paris")
+        self.assertEqual(self.file_parser.get_ground_station_altitude("par"), 30.0)
+        
+    def test_get_ground_station_raises_keyerror_when_given_an_unknown_name(self) -> None:
+        with self.assertRaises(KeyError):
+            self.file_parser.get_ground_station("Toulouse")
+            
+    def test_get_station_table_is_built_once(self) -> None:
+        station_table = self.file_parser.get_station_table()
+        self.assertIs(self.file_parser.get_station_table(), station_table)
+        self.assertEqual(list(station_table), ["Grasse", "Paris"])
             
     
         
@@ -462,6 +522,353 @@ class Test_Sat_File_Parser(unittest.TestCase):
         self.assertEqual(self.file_parser.get_stop_time(), dt.datetime(2022, 6, 22, 0, 0))
         
         
+class Test_Compressed_Sat_File_Parser(unittest.TestCase):
+    
+    def test_init_with_a_compressed_path(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            for suffix, module in [(".gz", gzip), (".xz", lzma), (".bz2", bz2)]:
+                filepath = os.path.join(temp_dir, "Sat_ORBIT_NUMBER.txt" + suffix)
+                with open("Sat_ORBIT_NUMBER.txt", "rb") as source, module.open(filepath, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                self.assertEqual(Sat_Orbit_Number(filepath).get_results(), Sat_Orbit_Number("Sat_ORBIT_NUMBER.txt").get_results())
+        
+        
+class Test_Parser_Cache(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.parser_cache = Parser_Cache()
+        
+    def test_init_raises_valueerror_when_given_a_negative_budget(self) -> None:
+        with self.assertRaises(ValueError):
+            Parser_Cache(-1)
+            
+    def test_get_returns_the_same_object_on_a_hit(self) -> None:
+        sat_altitude = Sat_Altitude.open("Sat_SATELLITE_ALTITUDE.txt", cache = self.parser_cache)
+        self.assertIsInstance(sat_altitude, Sat_Altitude)
+        self.assertIs(Sat_Altitude.open("Sat_SATELLITE_ALTITUDE.txt", cache = self.parser_cache), sat_altitude)
+        statistics = self.parser_cache.get_statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"]), (1, 1))
+        self.assertEqual(statistics["nbytes"], sat_altitude.get_nbytes())
+        
+    def test_get_keys_entries_by_parser_class(self) -> None:
+        self.parser_cache.get(Sat_Altitude, "Sat_SATELLITE_ALTITUDE.txt")
+        self.assertIsInstance(self.parser_cache.get(Sat_File_Parser, "Sat_SATELLITE_ALTITUDE.txt"), Sat_File_Parser)
+        self.assertEqual(len(self.parser_cache), 2)
+        
+    def test_get_parses_again_a_modified_file(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "Sat_ORBIT_NUMBER.txt")
+            shutil.copyfile("Sat_ORBIT_NUMBER.txt", filepath)
+            sat_orbit_number = self.parser_cache.get(Sat_Orbit_Number, filepath)
+            with open(filepath, "a") as file:
+                file.write("\n59409 1050.00000 329\n")
+            self.assertIsNot(self.parser_cache.get(Sat_Orbit_Number, filepath), sat_orbit_number)
+            self.assertEqual(len(self.parser_cache), 1)
+            
+    def test_get_evicts_the_least_recently_used_entries(self) -> None:
+        sat_altitude = self.parser_cache.get(Sat_Altitude, "Sat_SATELLITE_ALTITUDE.txt")
+        self.parser_cache.set_max_bytes(sat_altitude.get_nbytes())
+        self.parser_cache.get(Sat_Eclipse, "Sat_SATELLITE_ECLIPSE.txt")
+        self.assertEqual(self.parser_cache.get_statistics()["evictions"], 1)
+        self.assertEqual(len(self.parser_cache), 1)
+        
+    def test_get_does_not_cache_files_larger_than_the_budget(self) -> None:
+        self.parser_cache.set_max_bytes(0)
+        self.parser_cache.get(Sat_Altitude, "Sat_SATELLITE_ALTITUDE.txt")
+        self.assertEqual(len(self.parser_cache), 0)
+        
+    def test_clear(self) -> None:
+        self.parser_cache.get(Sat_Altitude, "Sat_SATELLITE_ALTITUDE.txt")
+        self.parser_cache.clear()
+        self.assertEqual(self.parser_cache.get_statistics()["nbytes"], 0)
+        
+        
+class Test_Frozen_Sat_File_Parser(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.sat_position = Sat_Position("Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt", frozen = True)
+        
+    def test_frozen_parser_reads_as_a_mutable_one(self) -> None:
+        sat_position = Sat_Position("Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt")
+        self.assertFalse(sat_position.is_frozen())
+        self.assertTrue(self.sat_position.is_frozen())
+        self.assertEqual(self.sat_position.get_results(), sat_position.get_results())
+        self.assertEqual(self.sat_position.get_sat_azimuts(slice(0, 2)), sat_position.get_sat_azimuts(slice(0, 2)))
+        self.assertEqual(self.sat_position.get_comment(), tuple(sat_position.get_comment()))
+        self.assertIs(sat_position.freeze(), sat_position)
+        self.assertEqual(dict(sat_position.simulation_data), dict(self.sat_position.simulation_data))
+        
+    def test_frozen_parser_is_read_only(self) -> None:
+        results = self.sat_position.get_results()
+        with self.assertRaises(TypeError):
+            self.sat_position.simulation_data['OBJECT_NAME'] = "Sat_2"
+        with self.assertRaises(AttributeError):
+            self.sat_position.start = datetime(2021, 7, 14)
+        with self.assertRaises(AttributeError):
+            results.columns = []
+        with self.assertRaises(TypeError):
+            results.columns[0][0] = 0.0
+        with self.assertRaises(TypeError):
+            results.columns[0].append(0.0)
+        with self.assertRaises(TypeError):
+            results.append(['59409', '1050.00000', '1.0', '2.0'])
+        self.assertEqual(len(results), 3)
+        values = results.get_values(1)
+        values[0] = 0.0
+        self.assertNotEqual(results.columns[0][0], 0.0)
+        
+    def test_frozen_time_axis(self) -> None:
+        time_axis = Time_Axis()
+        for epoch in [100, 110, 130, 135]:
+            time_axis.append(epoch)
+        frozen_time_axis = Frozen_Time_Axis(time_axis)
+        self.assertEqual(list(frozen_time_axis), list(time_axis))
+        self.assertIsInstance(frozen_time_axis.epochs, Frozen_Array)
+        self.assertEqual((frozen_time_axis.get_step(), frozen_time_axis.find(130)), (5, 2))
+        self.assertEqual(len(frozen_time_axis.derived), 1)
+        with self.assertRaises(TypeError):
+            frozen_time_axis.append(140)
+        with self.assertRaises(AttributeError):
+            frozen_time_axis.count = 0
+            
+    def test_get_derived_computes_once_for_concurrent_threads(self) -> None:
+        calls = []
+        lock = threading.Lock()
+        def function():
+            with lock:
+                calls.append(None)
+            time.sleep(0.01)
+            return max(self.sat_position.get_sat_elevations())
+        with ThreadPoolExecutor(max_workers = 16) as executor:
+            values = list(executor.map(lambda _ : self.sat_position.get_derived(("max_elevation",), function), range(64)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(values), {max(self.sat_position.get_sat_elevations())})
+        
+    def test_get_derived_raises_valueerror_when_not_frozen(self) -> None:
+        with self.assertRaises(ValueError):
+            Sat_Altitude("Sat_SATELLITE_ALTITUDE.txt").get_derived(("min",), lambda : 0)
+            
+    def test_frozen_parser_is_picklable_and_cached(self) -> None:
+        sat_position = pickle.loads(pickle.dumps(self.sat_position))
+        self.assertTrue(sat_position.is_frozen())
+        self.assertEqual(sat_position.get_results(), self.sat_position.get_results())
+        parser_cache = Parser_Cache()
+        sat_altitude = Sat_Altitude.open("Sat_SATELLITE_ALTITUDE.txt", cache = parser_cache, frozen = True)
+        self.assertTrue(sat_altitude.is_frozen())
+        self.assertIs(Sat_Altitude.open("Sat_SATELLITE_ALTITUDE.txt", cache = parser_cache, frozen = True), sat_altitude)
+        self.assertFalse(Sat_Altitude.open("Sat_SATELLITE_ALTITUDE.txt", cache = parser_cache).is_frozen())
+        
+        
+class Test_Time_Axis(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.time_axis = Time_Axis()
+        for epoch in [100, 110, 120, 130]:
+            self.time_axis.append(epoch)
+            
+    def test_append_keeps_a_regular_grid_implicit(self) -> None:
+        self.assertTrue(self.time_axis.is_regular())
+        self.assertEqual((self.time_axis.start, self.time_axis.step, len(self.time_axis)), (100, 10, 4))
+        self.assertEqual(self.time_axis.get_nbytes(), 0)
+        
+    def test_append_switches_to_explicit_epochs_on_a_gap(self) -> None:
+        self.time_axis.append(150)
+        self.assertFalse(self.time_axis.is_regular())
+        self.assertEqual(list(self.time_axis), [100, 110, 120, 130, 150])
+        self.assertEqual(self.time_axis.get_nbytes(), 5 * 8)
+        
+    def test_append_switches_to_explicit_epochs_on_a_duplicate(self) -> None:
+        time_axis = Time_Axis()
+        time_axis.append(100)
+        time_axis.append(100)
+        self.assertFalse(time_axis.is_regular())
+        self.assertEqual(list(time_axis), [100, 100])
+        
+    def test_get_step(self) -> None:
+        self.assertEqual(self.time_axis.get_step(), 10)
+        self.time_axis.append(135)
+        self.assertEqual(self.time_axis.get_step(), 5)
+        
+    def test_getitem(self) -> None:
+        self.assertEqual(self.time_axis[-1], 130)
+        self.assertEqual(self.time_axis[1:3], array('q', [110, 120]))
+        with self.assertRaises(IndexError):
+            self.time_axis[4]
+            
+    def test_find(self) -> None:
+        self.assertEqual(self.time_axis.find(120), 2)
+        self.assertEqual(self.time_axis.find(125), -1)
+        self.assertEqual(self.time_axis.find(140), -1)
+        self.time_axis.append(150)
+        self.assertEqual(self.time_axis.find(150), 4)
+        
+    def test_search(self) -> None:
+        self.assertEqual([self.time_axis.search(epoch) for epoch in [0, 100, 101, 130, 131]], [0, 0, 1, 3, 4])
+        
+        
+class Test_Simulation_Results(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.simulation_results = Simulation_Results()
+        for simulation_result in [["59409", "1020.00000", "202.04716", "29.24913"], 
+                                  ["59409", "1030.00000", "199.20892", "31.08049"]]:
+            self.simulation_results.append(simulation_result)
+            
+    def test_append_raises_valueerror_when_given_a_row_of_another_width(self) -> None:
+        with self.assertRaises(ValueError):
+            self.simulation_results.append(["59409", "1040.00000", "196.00411"])
+            
+    def test_len(self) -> None:
+        self.assertEqual(len(self.simulation_results), 2)
+        self.assertEqual(len(self.simulation_results[0]), 3)
+        
+    def test_getitem(self) -> None:
+        self.assertIsInstance(self.simulation_results[0], Simulation_Result)
+        self.assertEqual(self.simulation_results[-1][0], dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc))
+        self.assertEqual(self.simulation_results[1][2], 31.08049)
+        self.assertEqual(self.simulation_results[0][1:], [202.04716, 29.24913])
+        with self.assertRaises(IndexError):
+            self.simulation_results[2]
+        with self.assertRaises(IndexError):
+            self.simulation_results[0][3]
+            
+    def test_eq(self) -> None:
+        self.assertEqual(self.simulation_results, 
+                         [[dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc), 202.04716, 29.24913], 
+                          [dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc), 199.20892, 31.08049]])
+        
+    def test_get_column(self) -> None:
+        self.assertEqual(list(self.simulation_results.get_column(2)), [29.24913, 31.08049])
+        
+    def test_get_nbytes(self) -> None:
+        self.assertEqual(self.simulation_results.get_nbytes(), 2 * (8 + 8))
+        
+    def test_select(self) -> None:
+        values = self.simulation_results.get_column(1)
+        self.assertEqual(self.simulation_results.select(values), array('d', [202.04716, 199.20892]))
+        self.assertEqual(self.simulation_results.select(values, slice(1, None)), array('d', [199.20892]))
+        self.assertEqual(self.simulation_results.select(values, [1, 0]), array('d', [199.20892, 202.04716]))
+        self.assertEqual(self.simulation_results.select(values, [False, True]), array('d', [199.20892]))
+        
+    def test_select_with_byte_masks(self) -> None:
+        values = self.simulation_results.get_column(1)
+        for mask in [bytearray([0, 1]), bytes([0, 1]), array('B', [0, 1]), array('b', [0, 1])]:
+            self.assertEqual(self.simulation_results.select(values, mask), array('d', [199.20892]))
+        self.assertEqual(self.simulation_results.select(values, bytearray([1, 1])), values)
+        
+    def test_select_raises_valueerror_when_given_a_mask_of_another_length(self) -> None:
+        with self.assertRaises(ValueError):
+            self.simulation_results.select(self.simulation_results.get_column(1), [True])
+        with self.assertRaises(ValueError):
+            self.simulation_results.select(self.simulation_results.get_column(1), bytearray([1]))
+        with self.assertRaises(ValueError):
+            self.simulation_results.select(self.simulation_results.get_column(1), array('B', [1, 0, 1]))
+            
+    def test_get_index(self) -> None:
+        self.assertEqual(self.simulation_results.get_index(dt.datetime(2021, 7, 14, 0, 17, 10)), 1)
+        with self.assertRaises(ValueError):
+            self.simulation_results.get_index(dt.datetime(2021, 7, 14, 0, 17, 5))
+            
+    def test_get_dates(self) -> None:
+        self.assertEqual(self.simulation_results.get_dates([1]), 
+                         [dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)])
+        
+    def test_init_with_typecodes(self) -> None:
+        simulation_results = Simulation_Results(['B'])
+        simulation_results.append(["59409", "1020.00000", "1"])
+        self.assertEqual(simulation_results.get_column(1).typecode, 'B')
+        
+    def test_append_raises_valueerror_when_the_typecodes_do_not_match_the_row(self) -> None:
+        with self.assertRaises(ValueError):
+            Simulation_Results(['B']).append(["59409", "1020.00000", "1", "2"])
+            
+    def test_append_widens_an_integer_column_that_does_not_fit(self) -> None:
+        simulation_results = Simulation_Results(['B', 'B'])
+        simulation_results.append(["59409", "1020.00000", "1", "1.0"])
+        simulation_results.append(["59409", "1030.00000", "256", "0.5"])
+        self.assertEqual(simulation_results.get_column(1), array('d', [1.0, 256.0]))
+        self.assertEqual(simulation_results.get_column(2), array('d', [1.0, 0.5]))
+        
+    def test_set_mjd_to_epoch(self) -> None:
+        self.assertEqual(self.simulation_results.set_mjd_to_epoch(59409, 1020.0), 5132938620000000)
+        
+        
+class Test_Content_Registry(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dirpath = self.temp_dir.name
+        with open("Sat_DISTANCE_GROUND_STATION_1.txt") as file:
+            text = file.read()
+        self.station_3_filepath = os.path.join(self.dirpath, "Sat_DISTANCE_GROUND_STATION_3.TXT")
+        with open(self.station_3_filepath, "w") as file:
+            file.write(text.replace("DISTANCE_GROUND_STATION_1", "DISTANCE_GROUND_STATION_3"))
+        self.renamed_filepath = os.path.join(self.dirpath, "orbit.txt")
+        shutil.copy("Sat_ORBIT_NUMBER.txt", self.renamed_filepath)
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def test_get(self) -> None:
+        self.assertEqual(CONTENT_REGISTRY.get("DISTANCE_GROUND_STATION_3").name, "DISTANCE_GROUND_STATION")
+        self.assertEqual(CONTENT_REGISTRY.get("SATELLITE_DIRECTION-GROUND_STATION_12_FRAME").get_station(
+            "SATELLITE_DIRECTION-GROUND_STATION_12_FRAME"), 12)
+        self.assertIsNone(CONTENT_REGISTRY.get("DISTANCE_GROUND_STATION"))
+        self.assertIsNone(CONTENT_REGISTRY.get("UNKNOWN"))
+        self.assertIs(CONTENT_REGISTRY.get_parser_class("ORBIT_NUMBER"), Sat_Orbit_Number)
+        
+    def test_get_typecodes(self) -> None:
+        self.assertEqual(CONTENT_REGISTRY.get("GEOGRAPHICAL_COORDINATES").get_typecodes("single"), ['f', 'f'])
+        self.assertEqual(CONTENT_REGISTRY.get("ORBIT_NUMBER").get_typecodes(), ['i'])
+        
+    def test_sniff_header(self) -> None:
+        self.assertEqual(sniff_header(self.renamed_filepath)['USER_DEFINED_CONTENT'], "ORBIT_NUMBER")
+        
+    def test_init_with_a_station_3_and_an_upper_case_extension(self) -> None:
+        sat_distance = Sat_Distance_To_Ground_Station(self.station_3_filepath)
+        self.assertEqual(sat_distance.get_sat_distance_to_ground_station(0), 1096411.0)
+        
+    def test_init_with_a_renamed_file(self) -> None:
+        self.assertEqual(Sat_Orbit_Number(self.renamed_filepath).get_orbit_number(0), 329)
+        
+    def test_init_raises_valueerror_when_given_a_file_of_another_content(self) -> None:
+        with self.assertRaises(ValueError):
+            Sat_Altitude(self.renamed_filepath)
+            
+    def test_get_sat_filepaths(self) -> None:
+        self.assertEqual(get_sat_filepaths(self.dirpath), 
+                         {"Sat" : {"DISTANCE_GROUND_STATION_3" : self.station_3_filepath,
+                                   "ORBIT_NUMBER" : self.renamed_filepath}})
+        simulation_run = Simulation_Run(self.dirpath)
+        self.assertIsInstance(simulation_run.get_parser("DISTANCE_GROUND_STATION_3"), Sat_Distance_To_Ground_Station)
+        
+        
+class Test_Sat_File_Parser_Typecodes(unittest.TestCase):
+    
+    def test_get_content_type(self) -> None:
+        self.assertEqual(get_content_type("SATELLITE_DIRECTION-GROUND_STATION_12_FRAME"), 
+                         "SATELLITE_DIRECTION-GROUND_STATION_FRAME")
+        
+    def test_init_raises_valueerror_when_given_an_unknown_precision(self) -> None:
+        with self.assertRaises(ValueError):
+            Sat_File_Parser("Sat_SATELLITE_ECLIPSE.txt", precision = "half")
+            
+    def test_narrow_typecodes_by_default(self) -> None:
+        self.assertEqual(Sat_Visibility("Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt").get_results().get_column(1).typecode, 'B')
+        self.assertEqual(Sat_Orbit_Number("Sat_ORBIT_NUMBER.txt").get_results().get_column(1).typecode, 'i')
+        self.assertEqual(Sat_Position("Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt").get_results().get_column(1).typecode, 'd')
+        
+    def test_single_precision(self) -> None:
+        sat_position = Sat_Position("Sat_SATELLITE_DIRECTION-GROUND_STATION_1_FRAME.txt", precision = "single")
+        self.assertEqual(sat_position.get_results().get_column(2).typecode, 'f')
+        self.assertLess(abs(sat_position.get_sat_azimut(0) - 202.04716), 360 * 2**-24)
+        self.assertEqual(sat_position.get_nbytes(), 3 * (4 + 4))
+        
+    def test_typecodes_override(self) -> None:
+        sat_eclipse = Sat_Eclipse("Sat_SATELLITE_ECLIPSE.txt", typecodes = ['B'])
+        self.assertEqual(sat_eclipse.get_results().get_column(1), array('B', [100, 100, 100]))
+        
+        
 class Test_Sat_Orbit_Number(unittest.TestCase):
     
     @given(path = st.sampled_from(VALID_FILENAMES))    
@@ -483,6 +890,9 @@ class Test_Sat_Orbit_Number(unittest.TestCase):
     def test_get_orbit_number(self):
         self.assertEqual(self.sat_orbit_number.get_orbit_number(0), 329)
 
+    def test_get_orbit_numbers(self):
+        self.assertEqual(self.sat_orbit_number.get_orbit_numbers(slice(0, 2)), array('q', [329, 329]))
+
 class Test_Sat_Position(unittest.TestCase):
                 
     def test_init_with_a_valid_path(self) -> None:
@@ -498,18 +908,27 @@ class Test_Sat_Position(unittest.TestCase):
     def test_get_sat_elevation(self):
         self.assertEqual(self.sat_position.get_sat_elevation(0), 29.24913)  
         
+    def test_get_sat_azimuts(self):
+        self.assertEqual(self.sat_position.get_sat_azimuts([0, 2]), array('d', [202.04716, 196.00411]))
+        
+    def test_get_sat_elevations(self):
+        self.assertEqual(self.sat_position.get_sat_elevations([True, False, True]), array('d', [29.24913, 32.95857]))
+        
 
 class Test_Sat_Visibility(unittest.TestCase):
                 
     def test_init_with_a_valid_path(self) -> None:
         path = "Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt"
-        self.assertIsInstance(Sat_Position(path), Sat_Position)
+        self.assertIsInstance(Sat_Visibility(path), Sat_Visibility)
         
     def setUp(self):
         self.sat_visibility = Sat_Visibility("Sat_GEOMETRICAL_VISIBILITY_GROUND_STATION_1.txt")
         
     def test_get_sat_visibility(self):
         self.assertEqual(self.sat_visibility.get_sat_visibility(0), 1)  
+        
+    def test_get_sat_visibilities(self):
+        self.assertEqual(list(self.sat_visibility.get_sat_visibilities()), [1, 1, 1])
 
 class Test_Sat_Distance_To_Ground_Station(unittest.TestCase):
                 
@@ -523,6 +942,10 @@ class Test_Sat_Distance_To_Ground_Station(unittest.TestCase):
     def test_get_sat_distance_to_ground_station(self):
         self.assertEqual(self.sat_distance_to_groundstation.get_sat_distance_to_ground_station(0), 1096411.0) 
         
+    def test_get_sat_distances_to_ground_station(self):
+        self.assertEqual(self.sat_distance_to_groundstation.get_sat_distances_to_ground_station(), 
+                         array('d', [1096411.0, 1052271.0, 1010944.0]))
+        
 class Test_Sat_Geographical_Coordinates(unittest.TestCase):
     
     @given(path = st.sampled_from(VALID_FILENAMES))    
@@ -546,6 +969,12 @@ class Test_Sat_Geographical_Coordinates(unittest.TestCase):
     def test_get_sat_latitude(self):
         self.assertEqual(self.sat_geographical_coordinates.get_sat_latitude(0), 41.469732)
 
+    def test_get_sat_longitudes(self):
+        self.assertEqual(self.sat_geographical_coordinates.get_sat_longitudes(slice(1, 3)), array('d', [359.089225, 359.766168]))
+        
+    def test_get_sat_latitudes(self):
+        self.assertEqual(self.sat_geographical_coordinates.get_sat_latitudes([0]), array('d', [41.469732]))
+
 class Test_Sat_Eclipse(unittest.TestCase):
     
     @given(path = st.sampled_from(VALID_FILENAMES))    
@@ -566,6 +995,9 @@ class Test_Sat_Eclipse(unittest.TestCase):
     def test_get_orbit_number(self):
         self.assertEqual(self.sat_eclipse.get_sun_eclipse(0), 100.0)
         
+    def test_get_sun_eclipses(self):
+        self.assertEqual(list(self.sat_eclipse.get_sun_eclipses()), [100.0, 100.0, 100.0])
+        
 class Test_Sat_Altitude(unittest.TestCase):
     
     @given(path = st.sampled_from(VALID_FILENAMES))    
@@ -586,6 +1018,9 @@ class Test_Sat_Altitude(unittest.TestCase):
     def test_get_orbit_number(self):
         self.assertEqual(self.sat_altitude.get_sat_altitude(0), 601674.0)
             
+    def test_get_sat_altitudes(self):
+        self.assertEqual(self.sat_altitude.get_sat_altitudes(slice(0, 1)), array('d', [601674.0]))
+            
         
 if __name__ == "__main__":
     unittest.main()
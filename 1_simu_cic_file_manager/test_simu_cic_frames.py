@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the pandas and xarray views of the "sat" files.
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+
+from simu_cic_file_manager import Sat_Altitude, Sat_Orbit_Number, Sat_Position, Sat_Visibility, Simulation_Run
+from simu_cic_frames import get_attrs, get_column_labels, import_optional
+from simu_cic_samples import SAMPLE_FILEPATHS, copy_samples
+
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+HAS_XARRAY = importlib.util.find_spec("xarray") is not None
+class Test_Frames(unittest.TestCase):
+    
+    def test_get_column_labels(self) -> None:
+        self.assertEqual(get_column_labels(Sat_Visibility(SAMPLE_FILEPATHS["GEOMETRICAL_VISIBILITY_GROUND_STATION_1"])),
+                         ["station_visibility"])
+        self.assertEqual(get_column_labels(Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])),
+                         ["azimut (deg)", "elevation (deg)"])
+        
+    def test_get_attrs(self) -> None:
+        attrs = get_attrs(Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"], frozen = True))
+        self.assertEqual(attrs["COMMENT"], "Date, altitude (km)")
+        self.assertEqual(attrs["START_TIME"], "2021-06-22T00:00:00")
+        self.assertNotIn("SIMULATION_RESULTS", attrs)
+        
+    def test_import_optional_raises_importerror_when_the_package_is_missing(self) -> None:
+        with self.assertRaises(ImportError):
+            import_optional("simu_cic_missing_package")
+            
+    def test_pandas_is_imported_lazily(self) -> None:
+        command = "import sys, simu_cic_file_manager, simu_cic_frames; print('pandas' in sys.modules)"
+        process = subprocess.run([sys.executable, "-c", command], capture_output = True, text = True)
+        self.assertEqual(process.stdout, "False\n")
+        
+    @unittest.skipUnless(HAS_PANDAS, "pandas is not installed")
+    def test_parser_to_pandas(self) -> None:
+        import numpy
+        sat_orbit_number = Sat_Orbit_Number(SAMPLE_FILEPATHS["ORBIT_NUMBER"])
+        frame = sat_orbit_number.to_pandas()
+        self.assertEqual(list(frame.columns), ["orbit number"])
+        self.assertEqual(str(frame.index.tz), "UTC")
+        self.assertEqual(list(frame.index.to_pydatetime()), sat_orbit_number.get_simulation_result_dates())
+        self.assertEqual(frame["orbit number"].dtype, numpy.int32)
+        self.assertTrue(numpy.shares_memory(frame["orbit number"].to_numpy(),
+                                            numpy.frombuffer(sat_orbit_number.get_results().columns[0], numpy.int32)))
+        self.assertEqual(frame.attrs["USER_DEFINED_CONTENT"], "ORBIT_NUMBER")
+        
+    @unittest.skipUnless(HAS_PANDAS, "pandas is not installed")
+    def test_irregular_time_axis_to_pandas(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "Sat_ORBIT_NUMBER.txt")
+            with open(SAMPLE_FILEPATHS["ORBIT_NUMBER"]) as file:
+                text = file.read().rstrip("\n")
+            with open(filepath, "w") as file:
+                file.write(text + "\n59409 1100.00000 330\n")
+            sat_orbit_number = Sat_Orbit_Number(filepath, frozen = True)
+            self.assertFalse(sat_orbit_number.get_results().epochs.is_regular())
+            frame = sat_orbit_number.to_pandas()
+            self.assertEqual(list(frame.index.to_pydatetime()), sat_orbit_number.get_simulation_result_dates())
+            self.assertEqual(list(frame["orbit number"]), list(sat_orbit_number.get_orbit_numbers()))
+            
+    @unittest.skipUnless(HAS_XARRAY, "xarray is not installed")
+    def test_parser_to_xarray(self) -> None:
+        sat_position = Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])
+        dataset = sat_position.to_xarray()
+        self.assertEqual(list(dataset.data_vars), ["azimut (deg)", "elevation (deg)"])
+        self.assertEqual(list(dataset["elevation (deg)"].values), list(sat_position.get_sat_elevations()))
+        self.assertEqual(dataset.sizes["time"], 3)
+        self.assertEqual(dataset.attrs["OBJECT_NAME"], "Sat")
+        
+    @unittest.skipUnless(HAS_PANDAS and HAS_XARRAY, "pandas or xarray is not installed")
+    def test_run_to_pandas_and_xarray(self) -> None:
+        with TemporaryDirectory() as temp_dir:
+            copy_samples(temp_dir, contents = [content for content in SAMPLE_FILEPATHS if content != "SATELLITE_ALTITUDE"])
+            with open(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]) as file:
+                text = file.read()
+            with open(os.path.join(temp_dir, "Sat_SATELLITE_ALTITUDE.txt"), "w") as file:
+                file.write(text.replace("59409 1020.00000 601.674\n", "").rstrip("\n") + "\n59409 1050.00000 601.9\n")
+            simulation_run = Simulation_Run(temp_dir)
+            frame = simulation_run.to_pandas(["SATELLITE_ALTITUDE", "SATELLITE_ECLIPSE"])
+            self.assertEqual(list(frame.columns), [("SATELLITE_ALTITUDE", "altitude (km)"),
+                                                   ("SATELLITE_ECLIPSE", "sun_eclipse_ratio (%)")])
+            self.assertEqual(len(frame), 4)
+            self.assertEqual(frame["SATELLITE_ALTITUDE"]["altitude (km)"].isna().sum(), 1)
+            self.assertEqual(frame.attrs["contents"]["SATELLITE_ECLIPSE"]["USER_DEFINED_CONTENT"], "SATELLITE_ECLIPSE")
+            dataset = simulation_run.to_xarray()
+            self.assertEqual(len(dataset.data_vars), len(simulation_run.get_contents()) + 2)
+            self.assertEqual(dataset.sizes["time"], 4)
+            self.assertEqual(dataset["SATELLITE_ALTITUDE:altitude (km)"].attrs["COMMENT"], "Date, altitude (km)")
+            self.assertEqual(dataset.attrs["object_name"], "Sat")
+
+if __name__ == '__main__':
+    unittest.main()
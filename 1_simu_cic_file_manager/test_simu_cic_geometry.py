@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the station geometry computed from the ground track.
+"""
+import math
+import unittest
+
+from simu_cic_file_manager import Stations_Ref_File_Parser, Sat_Geographical_Coordinates, \
+    Sat_Altitude, Sat_Position, Sat_Distance_To_Ground_Station
+from simu_cic_geometry import Station_Table, Stations_Geometry, set_geodetic_to_ecef, set_ecef_to_geodetic, get_enu_rotation
+from simu_cic_samples import SAMPLE_FILEPATHS
+
+class Test_Geodesy(unittest.TestCase):
+    
+    def test_set_geodetic_to_ecef_on_the_equator(self) -> None:
+        x, y, z = set_geodetic_to_ecef(90.0, 0.0, 1000.0)
+        self.assertAlmostEqual(x, 0.0, places = 6)
+        self.assertAlmostEqual(y, 6379137.0, places = 6)
+        self.assertAlmostEqual(z, 0.0, places = 6)
+        
+    def test_set_geodetic_to_ecef_at_the_pole(self) -> None:
+        self.assertAlmostEqual(set_geodetic_to_ecef(0.0, 90.0, 0.0)[2], 6356752.314245, places = 5)
+        
+    def test_set_ecef_to_geodetic(self) -> None:
+        for longitude, latitude, altitude in [(6.9216, 43.7546, 1323.0), (358.4, -41.47, 601674.0), (10.0, 90.0, 0.0)]:
+            expected = set_ecef_to_geodetic(*set_geodetic_to_ecef(longitude, latitude, altitude))
+            self.assertAlmostEqual(expected[1], latitude, places = 9)
+            self.assertAlmostEqual(expected[2], altitude, places = 4)
+            if latitude != 90.0:
+                self.assertAlmostEqual(expected[0], longitude, places = 9)
+                
+    def test_get_enu_rotation_is_orthonormal(self) -> None:
+        rotation = get_enu_rotation(6.9216, 43.7546)
+        for i, row in enumerate(rotation):
+            for j, other in enumerate(rotation):
+                self.assertAlmostEqual(sum(a * b for a, b in zip(row, other)), float(i == j))
+                
+class Test_Station_Table(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.station_table = Stations_Ref_File_Parser("Stations_ref.txt").get_station_table()
+        
+    def test_get_station(self) -> None:
+        station = self.station_table.get_station("par")
+        self.assertEqual((station["name"], station["longitude"], station["latitude"], station["altitude"]),
+                         ("Paris", 2.351, 48.856, 30.0))
+        self.assertEqual(len(self.station_table), 2)
+        self.assertIn("GRASSE", self.station_table)
+        self.assertNotIn("Toulouse", self.station_table)
+        
+    def test_get_index_raises_keyerror_when_given_an_unknown_name(self) -> None:
+        with self.assertRaises(KeyError):
+            self.station_table.get_index("Toulouse")
+            
+    def test_init_raises_valueerror_when_given_a_duplicated_name(self) -> None:
+        record = self.station_table.get_station("Paris")
+        with self.assertRaises(ValueError):
+            Station_Table([record, dict(record, name = "PARIS")])
+        
+    def test_get_sub_table(self) -> None:
+        sub_table = self.station_table.get_sub_table(["par"])
+        self.assertEqual(list(sub_table), ["Paris"])
+        position = set_geodetic_to_ecef(5.0, 45.0, 6e5)
+        for computed, expected in zip(sub_table.get_topocentric(*position), self.station_table.get_topocentric(*position)):
+            self.assertEqual(list(computed), [expected[self.station_table.get_index("Paris")]])
+        with self.assertRaises(KeyError):
+            self.station_table.get_sub_table(["Toulouse"])
+            
+    def test_precomputed_geodesy(self) -> None:
+        for name, longitude, latitude, altitude in [("Grasse", 6.9216, 43.7546, 1323.0), ("Paris", 2.351, 48.856, 30.0)]:
+            for computed, expected in zip(self.station_table.get_ecef(name), set_geodetic_to_ecef(longitude, latitude, altitude)):
+                self.assertAlmostEqual(computed, expected, places = 6)
+            for computed, expected in zip(self.station_table.get_enu_rotation(name), get_enu_rotation(longitude, latitude)):
+                for a, b in zip(computed, expected):
+                    self.assertAlmostEqual(a, b)
+                    
+    def test_get_topocentric_matches_stations_geometry(self) -> None:
+        sat_geographical_coordinates = Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"])
+        sat_altitude = Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"])
+        stations_geometry = Stations_Geometry(Stations_Ref_File_Parser("Stations_ref.txt"), 
+                                              sat_geographical_coordinates, sat_altitude)
+        longitudes, latitudes, altitudes = stations_geometry.get_ground_track(sat_geographical_coordinates, sat_altitude)[1:]
+        position = set_geodetic_to_ecef(longitudes[0], latitudes[0], altitudes[0])
+        azimuts, elevations, distances = self.station_table.get_topocentric(*position)
+        for index, name in enumerate(self.station_table):
+            self.assertAlmostEqual(azimuts[index], stations_geometry.get_sat_azimuts(name)[0])
+            self.assertAlmostEqual(elevations[index], stations_geometry.get_sat_elevations(name)[0])
+            self.assertAlmostEqual(distances[index], stations_geometry.get_sat_distances_to_ground_station(name)[0], places = 3)
+        self.assertEqual(self.station_table.get_visible_stations(*position), stations_geometry.get_visible_stations(0))
+        
+    def test_get_topocentric_at_the_zenith_of_a_station(self) -> None:
+        for name in self.station_table:
+            x, y, z = self.station_table.get_ecef(name)
+            up = self.station_table.get_enu_rotation(name)[2]
+            for height in [1.0, 500000.0, 601674.0, 36000000.0]:
+                position = x + height * up[0], y + height * up[1], z + height * up[2]
+                index = self.station_table.get_index(name)
+                _, elevations, distances = self.station_table.get_topocentric(*position)
+                self.assertAlmostEqual(elevations[index], 90.0, places = 4)
+                self.assertAlmostEqual(distances[index], height, places = 3)
+                
+    def test_get_nearest_stations(self) -> None:
+        nearest = self.station_table.get_nearest_stations(2.0, 48.0, count = 2)
+        self.assertEqual([name for name, distance in nearest], ["Paris", "Grasse"])
+        self.assertLess(nearest[0][1], nearest[1][1])
+        self.assertEqual(self.station_table.get_nearest_stations(7.0, 43.7)[0][0], "Grasse")
+        
+class Test_Stations_Geometry(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.stations_geometry = Stations_Geometry(Stations_Ref_File_Parser("Stations_ref.txt"), 
+                                                   Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]), 
+                                                   Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]))
+        
+    def test_get_station_names(self) -> None:
+        self.assertEqual(self.stations_geometry.get_station_names(), ["Grasse", "Paris"])
+        
+    def test_get_epochs(self) -> None:
+        self.assertEqual(len(self.stations_geometry.get_epochs()), 3)
+        
+    def test_matches_the_simu_cic_direction_and_distance_files(self) -> None:
+        # the sample run uses Paris as ground station 1
+        sat_position = Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])
+        sat_distance = Sat_Distance_To_Ground_Station(SAMPLE_FILEPATHS["DISTANCE_GROUND_STATION_1"])
+        for computed, expected in zip(self.stations_geometry.get_sat_azimuts("Paris"), sat_position.get_sat_azimuts()):
+            self.assertAlmostEqual(computed, expected, places = 4)
+        for computed, expected in zip(self.stations_geometry.get_sat_elevations("Paris"), sat_position.get_sat_elevations()):
+            self.assertAlmostEqual(computed, expected, places = 4)
+        for computed, expected in zip(self.stations_geometry.get_sat_distances_to_ground_station("Paris"), 
+                                      sat_distance.get_sat_distances_to_ground_station()):
+            self.assertLess(abs(computed - expected), 1.0)
+            
+    def test_get_sat_visibilities(self) -> None:
+        self.assertEqual(list(self.stations_geometry.get_sat_visibilities("Grasse")), [1, 1, 1])
+        
+    def test_get_visible_stations(self) -> None:
+        self.assertEqual(self.stations_geometry.get_visible_stations(0), ["Grasse", "Paris"])
+        
+    def test_init_with_a_subset_of_stations(self) -> None:
+        stations_geometry = Stations_Geometry(Stations_Ref_File_Parser("Stations_ref.txt"), 
+                                              Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]), 
+                                              Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]), names = ["Paris"])
+        self.assertEqual(list(stations_geometry.geometry), ["Paris"])
+        
+    def test_init_with_a_mnemonic_or_another_case(self) -> None:
+        stations_geometry = Stations_Geometry(Stations_Ref_File_Parser("Stations_ref.txt"), 
+                                              Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]), 
+                                              Sat_Altitude(SAMPLE_FILEPATHS["SATELLITE_ALTITUDE"]), names = ["par", "GRASSE"])
+        self.assertEqual(stations_geometry.get_station_names(), ["Paris", "Grasse"])
+        self.assertEqual(stations_geometry.get_sat_elevations("PAR"), self.stations_geometry.get_sat_elevations("Paris"))
+        
+    def test_get_geometry_of_a_sample_on_a_station(self) -> None:
+        geometry = self.stations_geometry.get_geometry([2.351], [48.856], [30.0])
+        self.assertAlmostEqual(geometry["Paris"]["distance"][0], 0.0)
+        self.assertEqual(geometry["Paris"]["elevation"][0], 90.0)
+        self.assertEqual(geometry["Paris"]["visibility"][0], 1)
+        
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the integrity checks of the "sat" files.
+"""
+import gzip
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from simu_cic_file_manager import Sat_Distance_To_Ground_Station, Sat_Orbit_Number
+from simu_cic_integrity import ISSUE_KINDS, Integrity_Checker, scan_integrity
+from simu_cic_samples import SAMPLE_FILEPATHS, SAT_FILEPATHS
+
+ROWS = ["59409 1020.00000 1096.411", "59409 1030.00000 1052.271", "59409 1040.00000 1010.944",
+        "59409 1070.00000 900.000", "59409 1070.00000 900.000", "59409 1060.00000 950.000",
+        "59409 1080.00000 880.000 1.0", "59409 1090.00000 abc", "59409 1100.00000 -1.000",
+        "59409 1110.00000 850.000", "58000 0.00000 1000.000"]
+
+class Test_Integrity_Checker(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        with open(SAMPLE_FILEPATHS["DISTANCE_GROUND_STATION_1"]) as file:
+            header = file.read().split("META_STOP")[0]
+        self.filepath = os.path.join(self.temp_dir.name, "Sat_DISTANCE_GROUND_STATION_1.txt")
+        with open(self.filepath, "w") as file:
+            file.write(header + "META_STOP\n\n" + "\n".join(ROWS) + "\n")
+    
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+    
+    def test_scan_integrity_of_the_samples(self) -> None:
+        self.assertTrue(SAT_FILEPATHS)
+        for filepath in SAT_FILEPATHS:
+            report = scan_integrity(filepath)
+            self.assertTrue(report.is_valid(), str(report))
+            self.assertEqual(report.step, 10000000)
+    
+    def test_scan_integrity_summarizes_every_kind_of_issue(self) -> None:
+        report = scan_integrity(self.filepath)
+        self.assertEqual(report.row_count, len(ROWS))
+        self.assertEqual(report.step, 10000000)
+        self.assertEqual(report.get_summary(), {"gap" : 2, "duplicate" : 1, "backward" : 2, "column_count" : 1,
+                                                "invalid_value" : 1, "out_of_range_value" : 1,
+                                                "outside_start_stop" : 1})
+        self.assertEqual(report.missing_samples, 5)
+        self.assertEqual(report.get_rows("gap"), [3, 8])
+        self.assertEqual(report.get_rows("backward"), [5, 10])
+        self.assertEqual(report.get_rows("column_count"), [6])
+        self.assertFalse(report.is_valid())
+        self.assertIn("2 gaps, 5 missing samples (rows [3, 8])", str(report))
+    
+    def test_scan_integrity_of_a_compressed_file(self) -> None:
+        with open(self.filepath, "rb") as file, gzip.open(self.filepath + ".gz", "wb") as compressed_file:
+            compressed_file.write(file.read())
+        self.assertEqual(scan_integrity(self.filepath + ".gz").get_summary(), scan_integrity(self.filepath).get_summary())
+    
+    def test_max_examples(self) -> None:
+        report = scan_integrity(self.filepath, max_examples = 1)
+        self.assertEqual(report.get_rows("backward"), [5])
+        self.assertIn("(rows [5], ...)", str(report))
+    
+    def test_given_step(self) -> None:
+        report = scan_integrity(self.filepath, step = 40000000)
+        self.assertEqual(report.get_count("gap"), 0)
+    
+    def test_check_integrity_in_the_parse_loop(self) -> None:
+        with self.assertRaises(ValueError):
+            Sat_Distance_To_Ground_Station(self.filepath)
+        sat_distance_to_ground_station = Sat_Distance_To_Ground_Station(self.filepath, check_integrity = True)
+        self.assertEqual(len(sat_distance_to_ground_station.get_results()), len(ROWS) - 2)
+        self.assertEqual(sat_distance_to_ground_station.get_integrity_report().get_summary(),
+                         scan_integrity(self.filepath).get_summary())
+    
+    def test_check_integrity_of_a_valid_file(self) -> None:
+        sat_orbit_number = Sat_Orbit_Number(SAMPLE_FILEPATHS["ORBIT_NUMBER"], check_integrity = True)
+        self.assertEqual(sat_orbit_number.get_results(), Sat_Orbit_Number(SAMPLE_FILEPATHS["ORBIT_NUMBER"]).get_results())
+        self.assertTrue(sat_orbit_number.get_integrity_report().is_valid())
+        self.assertIsNone(Sat_Orbit_Number(SAMPLE_FILEPATHS["ORBIT_NUMBER"]).get_integrity_report())
+    
+    def test_unknown_content_takes_the_width_of_the_first_row(self) -> None:
+        integrity_checker = Integrity_Checker({})
+        for row in ROWS:
+            integrity_checker.check(row.split())
+        report = integrity_checker.get_report()
+        self.assertEqual(set(report.get_summary()), set(ISSUE_KINDS))
+        self.assertEqual(report.get_count("column_count"), 1)
+        self.assertEqual(report.get_count("out_of_range_value"), 0)
+        self.assertEqual(report.get_count("outside_start_stop"), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the interpolation of the "sat" files.
+"""
+import datetime as dt
+import math
+import os
+import unittest
+from array import array
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+
+from simu_cic_file_manager import Simu_Cic_Info_File_Parser, Sat_Geographical_Coordinates, Sat_Position, \
+    set_datetime_to_epoch
+from simu_cic_interpolation import Interpolator, interpolate, set_unwrapped, METHODS
+from simu_cic_propagator import J2_Propagator, get_time_axis
+from simu_cic_samples import SAMPLE_FILEPATHS
+
+DATE_0 = dt.datetime(2021, 7, 14, 0, 17, tzinfo = dt.timezone.utc)
+EPOCH_0 = set_datetime_to_epoch(DATE_0)
+
+class Test_Set_Unwrapped(unittest.TestCase):
+    
+    def test_set_unwrapped(self) -> None:
+        self.assertEqual(set_unwrapped(array('d', [359.5, 0.5, 359.0, 1.0]), 360.0), array('d', [359.5, 360.5, 359.0, 361.0]))
+        
+class Test_Interpolator(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        with open(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]) as file:
+            text = file.read().rstrip("\n")
+        self.filepath = os.path.join(self.temp_dir.name, "Sat_GEOGRAPHICAL_COORDINATES.txt")
+        with open(self.filepath, "w") as file:
+            file.write(text + "\n59409 1050.00000 0.440000 42.414690\n59409 1080.00000 1.800000 43.330000\n")
+        self.sat_geographical_coordinates = Sat_Geographical_Coordinates(self.filepath)
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def test_init_raises_valueerror_when_given_an_unknown_method(self) -> None:
+        with self.assertRaises(ValueError):
+            Interpolator(self.sat_geographical_coordinates, method = "spline")
+            
+    def test_evaluate_linear(self) -> None:
+        interpolator = Interpolator(Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]), 2)
+        latitudes = interpolator.evaluate([EPOCH_0, EPOCH_0 + 5000000, EPOCH_0 + 20000000])
+        self.assertEqual(latitudes[0], 41.469732)
+        self.assertAlmostEqual(latitudes[1], (41.469732 + 41.789518) / 2)
+        self.assertEqual(latitudes[2], 42.104843)
+        
+    def test_evaluate_outside_of_the_samples(self) -> None:
+        values = Interpolator(Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"])).evaluate(
+            [EPOCH_0 - 1, EPOCH_0 + 20000001])
+        self.assertTrue(all(math.isnan(value) for value in values))
+        
+    def test_evaluate_wraps_the_longitudes(self) -> None:
+        for method in METHODS:
+            longitude = Interpolator(self.sat_geographical_coordinates, 1, method)(DATE_0 + timedelta(seconds = 25))
+            self.assertTrue(0.0 <= longitude < 0.44 or 359.766168 < longitude < 360.0, (method, longitude))
+        self.assertAlmostEqual(Interpolator(self.sat_geographical_coordinates)(DATE_0 + timedelta(seconds = 25)),
+                               (359.766168 + 360.44) / 2 - 360)
+        
+    def test_evaluate_in_a_gap(self) -> None:
+        for method in METHODS:
+            interpolator = Interpolator(self.sat_geographical_coordinates, 2, method)
+            latitudes = interpolator.evaluate_dates([DATE_0 + timedelta(seconds = seconds) for seconds in (25, 30, 35, 60)])
+            self.assertTrue(42.104843 < latitudes[0] < 42.414690)
+            self.assertEqual(latitudes[1], 42.414690)
+            self.assertTrue(math.isnan(latitudes[2]))
+            self.assertEqual(latitudes[3], 43.33)
+            
+    def test_interpolate(self) -> None:
+        sat_position = Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])
+        azimuts, elevations = interpolate(sat_position, [EPOCH_0 + 5000000], "hermite")
+        self.assertLess(azimuts[0], 202.04716)
+        self.assertTrue(29.24913 < elevations[0] < 31.08049)
+        
+class Test_Interpolator_Accuracy(unittest.TestCase):
+    
+    def test_evaluate_against_the_propagator(self) -> None:
+        propagator = J2_Propagator.from_simu_cic_info(Simu_Cic_Info_File_Parser("simu_cic_info.txt"))
+        start, stop = dt.datetime(2021, 1, 1), dt.datetime(2021, 1, 1, 2)
+        sampled = propagator.get_parsers(get_time_axis(start, stop, timedelta(seconds = 10)))["GEOGRAPHICAL_COORDINATES"]
+        reference = propagator.get_parsers(get_time_axis(start, stop, timedelta(seconds = 3)))["GEOGRAPHICAL_COORDINATES"]
+        epochs = reference.get_results().get_epochs()
+        for method, tolerance in [("linear", 0.05), ("lagrange", 1e-3), ("hermite", 5e-3)]:
+            for index in (1, 2):
+                values = Interpolator(sampled, index, method).evaluate(epochs)
+                errors = [abs(value - expected) for value, expected in zip(values, reference.get_results().get_column(index))]
+                self.assertLess(max(min(error, 360 - error) for error in errors), tolerance, method)
+                
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the interval algebra.
+"""
+import datetime as dt
+import unittest
+
+from array import array
+from datetime import timedelta
+
+from simu_cic_file_manager import Sat_Visibility, Sat_Eclipse, Sat_Position, Time_Axis
+from simu_cic_intervals import Interval_Set, get_mask_intervals
+from simu_cic_samples import SAMPLE_FILEPATHS
+
+DATE_0 = dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc)
+DATE_1 = dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)
+DATE_2 = dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc)
+DATE_3 = dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc)
+
+class Test_Get_Mask_Intervals(unittest.TestCase):
+    
+    def test_get_mask_intervals(self) -> None:
+        time_axis = Time_Axis()
+        for epoch in [100, 110, 120, 130, 140]:
+            time_axis.append(epoch)
+        self.assertEqual(get_mask_intervals(time_axis, bytearray([1, 0, 1, 1, 0])), [(100, 110), (120, 140)])
+        self.assertEqual(get_mask_intervals(time_axis, bytearray([0, 0, 0, 1, 1])), [(130, 150)])
+        self.assertEqual(get_mask_intervals(time_axis, bytearray(5)), [])
+        
+    def test_get_mask_intervals_splits_at_the_gaps(self) -> None:
+        time_axis = Time_Axis()
+        for epoch in [100, 110, 120, 200, 210]:
+            time_axis.append(epoch)
+        self.assertEqual(get_mask_intervals(time_axis, bytearray([1, 1, 1, 1, 0])), [(100, 130), (200, 210)])
+        
+class Test_Interval_Set(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.interval_set = Interval_Set([(30, 40), (0, 10), (5, 15), (15, 20)])
+        self.other = Interval_Set([(8, 12), (18, 35), (50, 60)])
+        
+    def test_init_sorts_and_merges(self) -> None:
+        self.assertEqual(self.interval_set.starts, array('q', [0, 30]))
+        self.assertEqual(self.interval_set.stops, array('q', [20, 40]))
+        
+    def test_init_drops_empty_intervals(self) -> None:
+        self.assertEqual(len(Interval_Set([(5, 5)])), 0)
+        
+    def test_init_raises_valueerror_when_an_interval_is_reversed(self) -> None:
+        with self.assertRaises(ValueError):
+            Interval_Set([(DATE_1, DATE_0)])
+            
+    def test_init_with_datetimes(self) -> None:
+        self.assertEqual(Interval_Set([(DATE_0, DATE_1)]), [(DATE_0, DATE_1)])
+        
+    def test_union(self) -> None:
+        union = self.interval_set | self.other
+        self.assertEqual((list(union.starts), list(union.stops)), ([0, 50], [40, 60]))
+        
+    def test_intersection(self) -> None:
+        intersection = self.interval_set & self.other
+        self.assertEqual((list(intersection.starts), list(intersection.stops)), ([8, 18, 30], [12, 20, 35]))
+        
+    def test_difference(self) -> None:
+        difference = self.interval_set - self.other
+        self.assertEqual((list(difference.starts), list(difference.stops)), ([0, 12, 35], [8, 18, 40]))
+        difference = self.other - self.interval_set
+        self.assertEqual((list(difference.starts), list(difference.stops)), ([20, 50], [30, 60]))
+        
+    def test_complement(self) -> None:
+        complement = self.interval_set.complement(-10, 50)
+        self.assertEqual((list(complement.starts), list(complement.stops)), ([-10, 20, 40], [0, 30, 50]))
+        
+    def test_filter(self) -> None:
+        self.assertEqual(list(self.interval_set.filter(timedelta(microseconds = 15)).starts), [0])
+        
+    def test_get_coverage(self) -> None:
+        self.assertEqual(self.interval_set.get_coverage(), timedelta(microseconds = 30))
+        self.assertEqual(self.interval_set.get_durations(), array('q', [20, 10]))
+        
+    def test_contains(self) -> None:
+        interval_set = Interval_Set([(DATE_0, DATE_1)])
+        self.assertTrue(interval_set.contains(DATE_0))
+        self.assertFalse(interval_set.contains(DATE_1))
+        
+    def test_from_sat_visibility(self) -> None:
+        sat_visibility = Sat_Visibility(SAMPLE_FILEPATHS["GEOMETRICAL_VISIBILITY_GROUND_STATION_1"])
+        self.assertEqual(Interval_Set.from_sat_visibility(sat_visibility), [(DATE_0, DATE_3)])
+        
+    def test_from_sat_eclipse(self) -> None:
+        sat_eclipse = Sat_Eclipse(SAMPLE_FILEPATHS["SATELLITE_ECLIPSE"])
+        self.assertEqual(Interval_Set.from_sat_eclipse(sat_eclipse, minimum = 100.0), [(DATE_0, DATE_3)])
+        self.assertEqual(len(Interval_Set.from_sat_eclipse(sat_eclipse, minimum = 0.0, maximum = 50.0)), 0)
+        self.assertEqual(Interval_Set.from_sat_eclipse(sat_eclipse), [(DATE_0, DATE_3)])
+        
+    def test_from_parser(self) -> None:
+        sat_position = Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])
+        self.assertEqual(Interval_Set.from_parser(sat_position, 2, lambda elevation : elevation > 30), 
+                         [(DATE_1, DATE_3)])
+        
+        
+if __name__ == "__main__":
+    unittest.main()
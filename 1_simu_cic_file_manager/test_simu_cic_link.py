@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the link budget.
+"""
+import datetime as dt
+import math
+import unittest
+
+from simu_cic_file_manager import Sat_Distance_To_Ground_Station, Sat_Position
+from simu_cic_link import Link_Configuration, Link_Analysis
+from simu_cic_samples import SAMPLE_FILEPATHS
+
+class Test_Link_Configuration(unittest.TestCase):
+    
+    def test_init_raises_valueerror_when_given_a_non_positive_frequency(self) -> None:
+        with self.assertRaises(ValueError):
+            Link_Configuration(0.0, 10.0, 30.0, 100e6, 4.5)
+            
+class Test_Link_Analysis(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.link_configuration = Link_Configuration(8.2e9, 10.0, 30.0, 100e6, 4.5, losses = 2.0, 
+                                                     zenith_atmospheric_loss = 0.5, min_elevation = 5.0)
+        self.sat_distance = Sat_Distance_To_Ground_Station(SAMPLE_FILEPATHS["DISTANCE_GROUND_STATION_1"])
+        self.link_analysis = Link_Analysis(self.sat_distance, self.link_configuration, 
+                                           Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"]))
+        
+    def test_get_free_space_path_losses(self) -> None:
+        expected = 20 * math.log10(4 * math.pi * 1096411.0 * 8.2e9 / 299792458.0)
+        self.assertAlmostEqual(self.link_analysis.get_free_space_path_losses()[0], expected)
+        
+    def test_get_range_rates(self) -> None:
+        self.assertEqual(list(self.link_analysis.get_range_rates()), [-4414.0, -4273.35, -4132.7])
+        
+    def test_get_doppler_shifts(self) -> None:
+        self.assertAlmostEqual(self.link_analysis.get_doppler_shifts()[0], 4414.0 * 8.2e9 / 299792458.0)
+        
+    def test_get_atmospheric_losses(self) -> None:
+        self.assertAlmostEqual(self.link_analysis.get_atmospheric_losses()[0], 0.5 / math.sin(math.radians(29.24913)))
+        
+    def test_get_link_margins(self) -> None:
+        margins = self.link_analysis.get_link_margins()
+        self.assertAlmostEqual(margins[0], 9.552357, places = 5)
+        self.assertLess(margins[0], margins[2])
+        
+    def test_get_link_margins_below_the_min_elevation(self) -> None:
+        self.link_configuration.min_elevation = 30.0
+        self.assertEqual(self.link_analysis.get_link_margins()[0], -math.inf)
+        
+    def test_get_pass_volumes(self) -> None:
+        self.assertEqual(self.link_analysis.get_pass_volumes(), 
+                         [(dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc), 
+                           dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc), 3e9)])
+        
+    def test_get_pass_volumes_without_direction_file(self) -> None:
+        self.link_configuration.required_eb_n0 = 15.5
+        link_analysis = Link_Analysis(self.sat_distance, self.link_configuration)
+        self.assertEqual(link_analysis.get_pass_volumes()[0][2], 1e9)
+        
+        
+if __name__ == "__main__":
+    unittest.main()
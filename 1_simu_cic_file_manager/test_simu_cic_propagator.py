@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the analytic J2 propagator.
+"""
+import datetime as dt
+import unittest
+from datetime import timedelta
+
+from simu_cic_file_manager import Simu_Cic_Info_File_Parser, Stations_Ref_File_Parser, Sat_Altitude, \
+    Sat_Geographical_Coordinates, Sat_Orbit_Number
+from simu_cic_geometry import Stations_Geometry
+from simu_cic_propagator import J2_Propagator, get_time_axis
+
+START = dt.datetime(2021, 1, 1)
+STOP = dt.datetime(2021, 1, 1, 6)
+
+class Test_Get_Time_Axis(unittest.TestCase):
+    
+    def test_get_time_axis(self) -> None:
+        time_axis = get_time_axis(START, STOP, timedelta(seconds = 10))
+        self.assertTrue(time_axis.is_regular())
+        self.assertEqual(len(time_axis), 6 * 360 + 1)
+        
+    def test_get_time_axis_raises_valueerror_when_given_a_non_positive_step(self) -> None:
+        with self.assertRaises(ValueError):
+            get_time_axis(START, STOP, timedelta(0))
+            
+class Test_J2_Propagator(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.propagator = J2_Propagator.from_simu_cic_info(Simu_Cic_Info_File_Parser("simu_cic_info.txt"))
+        self.time_axis = get_time_axis(START, STOP, timedelta(seconds = 30))
+        self.parsers = self.propagator.get_parsers(self.time_axis)
+        
+    def test_init_raises_valueerror_when_given_a_perigee_below_the_surface(self) -> None:
+        with self.assertRaises(ValueError):
+            J2_Propagator(START, 100.0, 0.5, 97.8, 0.0, 10.5, 0.0)
+            
+    def test_get_nodal_period(self) -> None:
+        self.assertAlmostEqual(self.propagator.get_nodal_period(), 1.615, delta = 2e-3)
+        
+    def test_get_mltan_of_a_sun_synchronous_orbit(self) -> None:
+        self.assertAlmostEqual(self.propagator.get_mltan(START), 1.0)
+        self.assertAlmostEqual(self.propagator.get_mltan(dt.datetime(2021, 7, 1)), 1.0, delta = 0.05)
+        
+    def test_get_parsers_layout(self) -> None:
+        sat_geographical_coordinates = self.parsers["GEOGRAPHICAL_COORDINATES"]
+        self.assertIsInstance(sat_geographical_coordinates, Sat_Geographical_Coordinates)
+        self.assertIsInstance(self.parsers["SATELLITE_ALTITUDE"], Sat_Altitude)
+        self.assertIsInstance(self.parsers["ORBIT_NUMBER"], Sat_Orbit_Number)
+        self.assertEqual(sat_geographical_coordinates.get_comment(), ['Date', 'longitude (deg)', 'latitude (deg)'])
+        self.assertEqual(sat_geographical_coordinates.get_object_name(), "Sat")
+        self.assertEqual(sat_geographical_coordinates.get_simulation_result_date(0), START.replace(tzinfo = dt.timezone.utc))
+        self.assertEqual(len(sat_geographical_coordinates.get_results()[0]), 3)
+        self.assertEqual(self.parsers["ORBIT_NUMBER"].get_results().get_column(1).typecode, 'i')
+        
+    def test_ground_track(self) -> None:
+        sat_geographical_coordinates = self.parsers["GEOGRAPHICAL_COORDINATES"]
+        latitudes = sat_geographical_coordinates.get_sat_latitudes()
+        self.assertAlmostEqual(max(latitudes), 180 - 97.815, delta = 0.1)
+        self.assertAlmostEqual(min(latitudes), 97.815 - 180, delta = 0.1)
+        self.assertTrue(all(0 <= longitude < 360 for longitude in sat_geographical_coordinates.get_sat_longitudes()))
+        altitudes = self.parsers["SATELLITE_ALTITUDE"].get_sat_altitudes()
+        self.assertTrue(all(580e3 < altitude < 650e3 for altitude in altitudes))
+        
+    def test_orbit_numbers_increase_at_the_ascending_nodes(self) -> None:
+        latitudes = self.parsers["GEOGRAPHICAL_COORDINATES"].get_sat_latitudes()
+        orbit_numbers = self.parsers["ORBIT_NUMBER"].get_orbit_numbers()
+        self.assertEqual(orbit_numbers[0], 1)
+        for index in range(1, len(orbit_numbers)):
+            ascending_node = latitudes[index - 1] < 0 <= latitudes[index]
+            self.assertEqual(orbit_numbers[index] - orbit_numbers[index - 1], int(ascending_node))
+        self.assertEqual(orbit_numbers[-1], 4)
+        
+    def test_stations_geometry_of_the_generated_files(self) -> None:
+        stations_geometry = Stations_Geometry(Stations_Ref_File_Parser("Stations_ref.txt"),
+                                              self.parsers["GEOGRAPHICAL_COORDINATES"],
+                                              self.parsers["SATELLITE_ALTITUDE"], ["Grasse"])
+        self.assertEqual(len(stations_geometry.get_sat_elevations("Grasse")), len(self.time_axis))
+        
+if __name__ == '__main__':
+    unittest.main()
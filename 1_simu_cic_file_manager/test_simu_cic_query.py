@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the boolean queries over a simu-cic run.
+"""
+import datetime as dt
+import unittest
+
+from simu_cic_file_manager import Parser_Cache, Simulation_Run, Time_Axis
+from simu_cic_query import Column, Predicate, Query, get_column_name
+
+DATE_0 = dt.datetime(2021, 7, 14, 0, 17, tzinfo=dt.timezone.utc)
+DATE_1 = dt.datetime(2021, 7, 14, 0, 17, 10, tzinfo=dt.timezone.utc)
+DATE_2 = dt.datetime(2021, 7, 14, 0, 17, 20, tzinfo=dt.timezone.utc)
+DATE_3 = dt.datetime(2021, 7, 14, 0, 17, 30, tzinfo=dt.timezone.utc)
+
+class Test_Column(unittest.TestCase):
+    
+    def test_get_column_name(self) -> None:
+        self.assertEqual(get_column_name("sun_eclipse_ratio (%)"), "sun eclipse ratio")
+        
+    def test_init(self) -> None:
+        column = Column("elevation", station = 2)
+        self.assertEqual(column.get_key(), ("SATELLITE_DIRECTION-GROUND_STATION_2_FRAME", 2))
+        self.assertEqual(Column("orbit_number").get_key(), ("ORBIT_NUMBER", 1))
+        
+    def test_init_raises_valueerror_when_given_an_unknown_name(self) -> None:
+        with self.assertRaises(ValueError):
+            Column("speed")
+            
+    def test_init_raises_valueerror_when_the_station_is_missing(self) -> None:
+        with self.assertRaises(ValueError):
+            Column("distance")
+        with self.assertRaises(ValueError):
+            Column("altitude", station = 1)
+            
+    def test_predicates_collect_their_columns(self) -> None:
+        predicate = (Column("elevation", station = 1) > 10) & ~(Column("sun_eclipse_ratio") < 100)
+        self.assertEqual(predicate.get_columns(), {("SATELLITE_DIRECTION-GROUND_STATION_1_FRAME", 2), 
+                                                   ("SATELLITE_ECLIPSE", 1)})
+        
+    def test_predicate_is_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            Predicate()
+            
+    def test_missing_values_are_unknown(self) -> None:
+        elevation, eclipse = Column("elevation", station = 1), Column("sun_eclipse_ratio")
+        values = {elevation.get_key() : [5.0, 20.0, None, None, None], 
+                  eclipse.get_key() : [100.0, 100.0, 100.0, 0.0, None]}
+        self.assertEqual(list((elevation > 10).evaluate(values)), [0, 1, 0, 0, 0])
+        self.assertEqual(list((~(elevation > 10)).evaluate(values)), [1, 0, 0, 0, 0])
+        self.assertEqual(list((~((elevation > 10) & (eclipse > 50))).evaluate(values)), [1, 0, 0, 1, 0])
+        self.assertEqual(list((~((elevation > 10) | (eclipse > 50))).evaluate(values)), [0, 0, 0, 0, 0])
+        self.assertEqual(list(((elevation > 10) | (eclipse > 50)).evaluate(values)), [1, 1, 1, 0, 0])
+        
+class Test_Query(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.simulation_run = Simulation_Run(".")
+        self.query = Query(self.simulation_run)
+        
+    def test_get_intervals(self) -> None:
+        self.assertEqual(self.query.get_intervals(Column("elevation", station = 1) > 30), [(DATE_1, DATE_3)])
+        
+    def test_get_intervals_combines_several_files(self) -> None:
+        predicate = (Column("elevation", station = 1) > 30) & (Column("sun_eclipse_ratio") >= 100) & \
+            Column("orbit_number").between(300, 350)
+        self.assertEqual(self.query.get_intervals(predicate), [(DATE_1, DATE_3)])
+        self.assertEqual(self.query.get_intervals(predicate | (Column("latitude") < 41.5)), [(DATE_0, DATE_3)])
+        self.assertEqual(self.query.get_intervals(~predicate), [(DATE_0, DATE_1)])
+        
+    def test_get_intervals_only_parses_the_files_of_the_predicate(self) -> None:
+        self.query.get_intervals(Column("altitude") > 0)
+        self.assertEqual([key[0] for key in self.simulation_run.parsers], ["SATELLITE_ALTITUDE"])
+        
+    def test_get_intervals_within_a_time_range(self) -> None:
+        predicate = Column("altitude") > 0
+        self.assertEqual(self.query.get_intervals(predicate, start = DATE_1, stop = DATE_2), [(DATE_1, DATE_3)])
+        self.assertEqual(len(self.simulation_run.get_parser("SATELLITE_ALTITUDE", DATE_1, DATE_2).get_results()), 2)
+        self.assertEqual(self.query.get_intervals(predicate, start = DATE_3), [])
+        
+    def test_windows_are_kept_in_a_bounded_cache(self) -> None:
+        window = Simulation_Run(".").get_parser("SATELLITE_ALTITUDE", start = DATE_0, stop = DATE_3)
+        simulation_run = Simulation_Run(".", window_cache = Parser_Cache(window.get_nbytes()))
+        query = Query(simulation_run)
+        for seconds in range(0, 30, 5):
+            start = DATE_0 + dt.timedelta(seconds = seconds)
+            query.get_intervals(Column("altitude") > 0, start = start, stop = DATE_3)
+        self.assertEqual(simulation_run.parsers, {})
+        self.assertLessEqual(simulation_run.window_cache.nbytes, window.get_nbytes())
+        self.assertGreater(simulation_run.window_cache.evictions, 0)
+        
+if __name__ == "__main__":
+    unittest.main()
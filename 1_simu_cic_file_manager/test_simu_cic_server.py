@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the HTTP/JSON service over preloaded simulations.
+"""
+import datetime as dt
+import json
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from simu_cic_samples import SAMPLE_FILEPATHS, copy_samples
+from simu_cic_server import Simulation_Server, Simulation_Store
+
+class Test_Simulation_Store(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dirpath = os.path.join(self.temp_dir.name, "run_1")
+        os.mkdir(self.dirpath)
+        copy_samples(self.dirpath)
+        self.store = Simulation_Store([self.dirpath])
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def test_get_runs(self) -> None:
+        self.assertEqual(sorted(self.store.get_runs()["run_1"]["Sat"]), 
+                         sorted(SAMPLE_FILEPATHS))
+        
+    def test_get_range(self) -> None:
+        response = self.store.get_range("SATELLITE_ALTITUDE", dt.datetime(2021, 7, 14, 0, 17, 5),
+                                        dt.datetime(2021, 7, 14, 0, 17, 20))
+        self.assertEqual(response["dates"], ["2021-07-14T00:17:10+00:00", "2021-07-14T00:17:20+00:00"])
+        self.assertEqual(response["values"], [[601.741, 601.806]])
+        self.assertEqual(len(self.store.get_range("SATELLITE_ALTITUDE")["dates"]), 3)
+        self.store.max_rows = 2
+        with self.assertRaises(ValueError):
+            self.store.get_range("SATELLITE_ALTITUDE")
+            
+    def test_get_value(self) -> None:
+        response = self.store.get_value("SATELLITE_DIRECTION-GROUND_STATION_1_FRAME",
+                                        dt.datetime(2021, 7, 14, 0, 17, 5, tzinfo = dt.timezone.utc))
+        self.assertAlmostEqual(response["values"]["elevation (deg)"], (29.24913 + 31.08049) / 2)
+        response = self.store.get_value("SATELLITE_ALTITUDE", dt.datetime(2021, 7, 14, 1))
+        self.assertIsNone(response["values"]["altitude (km)"])
+        
+    def test_get_passes_and_eclipses(self) -> None:
+        self.assertEqual(self.store.get_passes(1)["intervals"],
+                         [["2021-07-14T00:17:00+00:00", "2021-07-14T00:17:30+00:00", 30.0]])
+        self.assertEqual(self.store.get_passes(1, stop = dt.datetime(2021, 7, 14, 0, 17, 10))["intervals"],
+                         [["2021-07-14T00:17:00+00:00", "2021-07-14T00:17:10+00:00", 10.0]])
+        self.assertEqual(len(self.store.get_eclipses(maximum = 50.0)["intervals"]), 0)
+        for minimum in range(10):
+            self.store.get_eclipses(minimum = float(minimum))
+        self.store.get_eclipses()
+        self.assertEqual(list(self.store.get_file("SATELLITE_ECLIPSE").parser.derived.values), [("eclipses",)])
+        with self.assertRaises(KeyError):
+            self.store.get_passes(2)
+            
+    def test_reload_only_the_modified_files(self) -> None:
+        self.assertEqual(self.store.reload(), [])
+        altitude = self.store.get_file("SATELLITE_ALTITUDE")
+        filepath = os.path.join(self.dirpath, "Sat_SATELLITE_ALTITUDE.txt")
+        with open(filepath, "a") as file:
+            file.write("59409 1050.00000 601.870\n")
+        self.assertEqual(self.store.reload(), [("run_1", "Sat", "SATELLITE_ALTITUDE")])
+        self.assertEqual(len(self.store.get_range("SATELLITE_ALTITUDE")["dates"]), 4)
+        self.assertEqual(len(altitude.parser.get_results()), 3)
+        os.remove(filepath)
+        self.store.reload()
+        self.assertNotIn("SATELLITE_ALTITUDE", self.store.get_runs()["run_1"]["Sat"])
+
+class Test_Simulation_Server(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dirpath = os.path.join(self.temp_dir.name, "run_1")
+        os.mkdir(self.dirpath)
+        copy_samples(self.dirpath)
+        self.server = Simulation_Server(Simulation_Store([self.dirpath]), port = 0, reload_interval = 0.05)
+        self.thread = threading.Thread(target = self.server.serve_forever, daemon = True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.temp_dir.cleanup()
+        
+    def get(self, path : str) -> tuple:
+        try:
+            with urlopen(self.url + path) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as error:
+            return error.code, json.loads(error.read())
+        
+    def test_queries(self) -> None:
+        status, response = self.get("/range?content=SATELLITE_ALTITUDE&start=2021-07-14T00:17:10Z")
+        self.assertEqual(status, 200)
+        self.assertEqual(response["values"], [[601.741, 601.806]])
+        status, response = self.get("/value?content=GEOGRAPHICAL_COORDINATES&date=2021-07-14T00:17:00&method=hermite")
+        self.assertEqual(response["values"], {"longitude (deg)" : 358.419329, "latitude (deg)" : 41.469732})
+        status, response = self.get("/passes?station=1&run=run_1&object_name=Sat")
+        self.assertEqual(response["intervals"][0][2], 30.0)
+        status, response = self.get("/eclipses?minimum=0")
+        self.assertEqual(len(response["intervals"]), 1)
+        
+    def test_errors(self) -> None:
+        self.assertEqual(self.get("/orbits")[0], 404)
+        self.assertEqual(self.get("/passes?station=2")[0], 404)
+        self.assertEqual(self.get("/range?content=SATELLITE_ALTITUDE&start=yesterday")[0], 400)
+        self.assertEqual(self.get("/range?contents=SATELLITE_ALTITUDE")[0], 400)
+        self.assertEqual(self.get("/value?content=SATELLITE_ALTITUDE")[0], 400)
+        self.assertEqual(self.get("/value?content=SATELLITE_ALTITUDE&date=2021-07-14T00:17:00&method=spline")[0], 400)
+        
+    def test_hot_reload(self) -> None:
+        with open(os.path.join(self.dirpath, "Sat_SATELLITE_ALTITUDE.txt"), "a") as file:
+            file.write("59409 1050.00000 601.870\n")
+        deadline = time.monotonic() + 5
+        while len(self.get("/range?content=SATELLITE_ALTITUDE")[1]["dates"]) != 4 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.get("/range?content=SATELLITE_ALTITUDE")[1]["values"][0][-1], 601.87)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the mergeable sketches of the columns of the "sat" files.
+"""
+import math
+import pickle
+import random
+import unittest
+from bisect import bisect_right
+
+from hypothesis import given, settings, strategies as st
+
+from simu_cic_file_manager import Sat_Position
+from simu_cic_samples import SAMPLE_FILEPATHS
+from simu_cic_sketch import Histogram, KLL_Sketch, fill_sketches
+
+class Test_Histogram(unittest.TestCase):
+    
+    def test_update(self) -> None:
+        histogram = Histogram(0.0, 90.0, 9)
+        histogram.update([-1.0, 0.0, 5.0, 15.0, 89.9, 90.0, math.nan])
+        self.assertEqual(list(histogram.counts), [2, 1, 0, 0, 0, 0, 0, 0, 1])
+        self.assertEqual((histogram.underflow, histogram.overflow, histogram.nan_count), (1, 1, 1))
+        self.assertEqual((len(histogram), histogram.minimum, histogram.maximum), (6, -1.0, 90.0))
+        self.assertAlmostEqual(histogram.get_mean(), 198.9 / 6)
+        self.assertEqual(list(histogram.get_edges()), [0.0, 10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0])
+        
+    def test_init_raises_valueerror_when_given_invalid_bins(self) -> None:
+        with self.assertRaises(ValueError):
+            Histogram(1.0, 1.0)
+        with self.assertRaises(ValueError):
+            Histogram(0.0, 1.0, 0)
+            
+    def test_merge_is_exact(self) -> None:
+        values = [random.Random(0).uniform(-10.0, 100.0) for _ in range(1000)]
+        histogram = Histogram(0.0, 90.0, 45)
+        histogram.update(values)
+        parts = [Histogram(0.0, 90.0, 45) for _ in range(3)]
+        for index, part in enumerate(parts):
+            part.update(values[index::3])
+        merged = parts[0].merge(parts[1]).merge(parts[2])
+        self.assertEqual(list(merged.counts), list(histogram.counts))
+        self.assertEqual((merged.underflow, merged.overflow, merged.count), (histogram.underflow, histogram.overflow, 1000))
+        self.assertEqual((merged.minimum, merged.maximum), (min(values), max(values)))
+        with self.assertRaises(ValueError):
+            merged.merge(Histogram(0.0, 90.0, 90))
+            
+    def test_get_quantile(self) -> None:
+        histogram = Histogram(0.0, 100.0, 100)
+        self.assertTrue(math.isnan(histogram.get_quantile(0.5)))
+        histogram.update(range(100))
+        self.assertEqual(histogram.get_quantile(0.0), 0.0)
+        self.assertEqual(histogram.get_quantile(0.5), 50.0)
+        self.assertEqual(histogram.get_quantile(1.0), 99.0)
+        with self.assertRaises(ValueError):
+            histogram.get_quantile(1.5)
+            
+class Test_KLL_Sketch(unittest.TestCase):
+    
+    def test_small_sketches_are_exact(self) -> None:
+        kll_sketch = KLL_Sketch()
+        kll_sketch.update([3.0, 1.0, math.nan, 2.0, 5.0, 4.0])
+        self.assertEqual((len(kll_sketch), kll_sketch.nan_count), (5, 1))
+        self.assertEqual(kll_sketch.get_quantiles([0.0, 0.2, 0.5, 0.9, 1.0]), [1.0, 1.0, 3.0, 5.0, 5.0])
+        self.assertEqual(kll_sketch.get_rank(2.0), 0.4)
+        
+    def test_empty_sketch(self) -> None:
+        self.assertTrue(math.isnan(KLL_Sketch().get_quantile(0.5)))
+        self.assertTrue(math.isnan(KLL_Sketch().get_rank(0.0)))
+        with self.assertRaises(ValueError):
+            KLL_Sketch(k = 4)
+        with self.assertRaises(ValueError):
+            KLL_Sketch().get_quantiles([-0.1])
+            
+    def test_memory_is_bounded_and_merges_keep_the_error_bound(self) -> None:
+        generator = random.Random(1)
+        values = [generator.gauss(0.0, 1.0) for _ in range(100000)]
+        sorted_values = sorted(values)
+        kll_sketch = KLL_Sketch(seed = 0)
+        for first in range(0, len(values), 4096):
+            kll_sketch.update(values[first:first + 4096])
+        parts = [KLL_Sketch(seed = index) for index in range(4)]
+        for index, part in enumerate(parts):
+            part.update(values[index::4])
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        for sketch in (kll_sketch, merged):
+            self.assertEqual((len(sketch), sketch.minimum, sketch.maximum), (len(values), min(values), max(values)))
+            self.assertLess(sketch.size, 3 * sketch.k)
+            for q in [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]:
+                rank = bisect_right(sorted_values, sketch.get_quantile(q)) / len(values)
+                self.assertLess(abs(rank - q), 0.02)
+        with self.assertRaises(ValueError):
+            merged.merge(KLL_Sketch(k = 100))
+            
+    def test_sketches_with_the_same_seed_are_identical(self) -> None:
+        values = [float(value % 997) for value in range(0, 50000 * 7, 7)]
+        sketches = [KLL_Sketch(k = 16, seed = 42) for _ in range(2)]
+        for sketch in sketches:
+            sketch.update(values)
+        self.assertEqual(sketches[0].levels, sketches[1].levels)
+        
+    @settings(deadline = None, max_examples = 30)
+    @given(st.lists(st.floats(-1e6, 1e6), max_size = 3000), st.integers(1, 5))
+    def test_merge_keeps_the_count_the_weights_and_the_extrema(self, values : list, parts : int) -> None:
+        sketches = [KLL_Sketch(k = 16, seed = index) for index in range(parts)]
+        for index, sketch in enumerate(sketches):
+            sketch.update(values[index::parts])
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+        self.assertEqual(len(merged), len(values))
+        if values:
+            self.assertEqual(merged.get_quantiles([0.0, 1.0]), [min(values), max(values)])
+            self.assertEqual(sum(len(samples) << level for level, samples in enumerate(merged.levels)), len(values))
+            
+class Test_Fill_Sketches(unittest.TestCase):
+    
+    def test_fill_sketches_by_chunks(self) -> None:
+        filepath = SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"]
+        sat_position = Sat_Position(filepath)
+        sketches = fill_sketches(filepath, {2 : [Histogram(0.0, 90.0, 90), KLL_Sketch()]}, chunk_size = 2)
+        histogram, kll_sketch = sketches[2]
+        elevations = list(sat_position.get_sat_elevations())
+        self.assertEqual((len(histogram), len(kll_sketch)), (3, 3))
+        self.assertEqual(kll_sketch.get_quantiles([0.0, 1.0]), [min(elevations), max(elevations)])
+        parser_sketches = fill_sketches(sat_position, {2 : [Histogram(0.0, 90.0, 90)]})
+        self.assertEqual(list(parser_sketches[2][0].counts), list(histogram.counts))
+        
+    def test_fill_sketches_where(self) -> None:
+        sat_position = Sat_Position(SAMPLE_FILEPATHS["SATELLITE_DIRECTION-GROUND_STATION_1_FRAME"])
+        threshold = sorted(sat_position.get_sat_elevations())[1]
+        sketches = fill_sketches(sat_position, {1 : [KLL_Sketch()], 2 : [KLL_Sketch()]},
+                                 where = lambda epochs, columns : [elevation >= threshold for elevation in columns[1]])
+        self.assertEqual((len(sketches[1][0]), len(sketches[2][0])), (2, 2))
+        self.assertEqual(sketches[2][0].minimum, threshold)
+        
+    def test_sketches_are_picklable(self) -> None:
+        kll_sketch = KLL_Sketch(seed = 3)
+        kll_sketch.update(range(5000))
+        copy = pickle.loads(pickle.dumps(kll_sketch))
+        self.assertEqual(copy.get_quantiles([0.1, 0.5]), kll_sketch.get_quantiles([0.1, 0.5]))
+        copy.update(range(10))
+        kll_sketch.update(range(10))
+        self.assertEqual(copy.levels, kll_sketch.levels)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the spatial index over the ground track.
+"""
+import datetime as dt
+import math
+import os
+import unittest
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+
+from simu_cic_file_manager import Simu_Cic_Info_File_Parser, Sat_Geographical_Coordinates
+from simu_cic_intervals import Interval_Set
+from simu_cic_propagator import J2_Propagator, get_time_axis
+from simu_cic_samples import SAMPLE_FILEPATHS
+from simu_cic_spatial import Ground_Track_Index, set_point_in_polygon, INDEX_SUFFIX
+
+FRANCE = [(-5.0, 42.0), (8.0, 42.0), (8.0, 51.0), (-5.0, 51.0)]
+
+class Test_Set_Point_In_Polygon(unittest.TestCase):
+    
+    def test_set_point_in_polygon(self) -> None:
+        self.assertTrue(set_point_in_polygon(2.35, 48.85, FRANCE))
+        self.assertFalse(set_point_in_polygon(12.5, 41.9, FRANCE))
+        
+class Test_Ground_Track_Index(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        propagator = J2_Propagator.from_simu_cic_info(Simu_Cic_Info_File_Parser("simu_cic_info.txt"))
+        time_axis = get_time_axis(dt.datetime(2021, 1, 1), dt.datetime(2021, 1, 2), timedelta(seconds = 10))
+        self.sat_geographical_coordinates = propagator.get_parsers(time_axis)["GEOGRAPHICAL_COORDINATES"]
+        self.index = Ground_Track_Index(self.sat_geographical_coordinates, 2.0)
+        
+    def get_scanned_overflights(self, contains) -> Interval_Set:
+        results = self.sat_geographical_coordinates.get_results()
+        mask = bytearray(contains(longitude, latitude) for longitude, latitude 
+                         in zip(results.get_column(1), results.get_column(2)))
+        return Interval_Set.from_mask(results.epochs, mask)
+        
+    def test_init_raises_valueerror_when_given_an_invalid_tile_size(self) -> None:
+        with self.assertRaises(ValueError):
+            Ground_Track_Index(self.sat_geographical_coordinates, 7.0)
+            
+    def test_get_box_overflights(self) -> None:
+        for longitude_min, latitude_min, longitude_max, latitude_max in [(-5.0, 42.0, 8.0, 51.0), (350.0, -10.0, 10.0, 10.0),
+                                                                         (100.0, -90.0, 120.0, 90.0), (0.0, -90.0, 360.0, 90.0)]:
+            width = (longitude_max - longitude_min) % 360 if longitude_max - longitude_min < 360 else 360
+            expected = self.get_scanned_overflights(lambda longitude, latitude : latitude_min <= latitude <= latitude_max and 
+                                                    (longitude - longitude_min) % 360 <= width)
+            self.assertEqual(self.index.get_box_overflights(longitude_min, latitude_min, longitude_max, latitude_max), expected)
+            self.assertTrue(len(expected))
+            
+    def test_get_polygon_overflights(self) -> None:
+        for vertices in [FRANCE, [(350.0, -20.0), (20.0, -20.0), (5.0, 0.0), (20.0, 20.0), (350.0, 20.0)],
+                         [(170.0, -60.0), (-170.0, -60.0), (-175.0, 60.0)]]:
+            unwrapped = [vertices[0]]
+            for longitude, latitude in vertices[1:]:
+                unwrapped.append((unwrapped[-1][0] + math.remainder(longitude - unwrapped[-1][0], 360), latitude))
+            longitude_min = min(longitude for longitude, _ in unwrapped)
+            expected = self.get_scanned_overflights(lambda longitude, latitude : set_point_in_polygon(
+                longitude_min + (longitude - longitude_min) % 360, latitude, unwrapped))
+            self.assertEqual(self.index.get_polygon_overflights(vertices), expected)
+            self.assertTrue(len(expected))
+            
+    def test_get_polygon_overflights_raises_valueerror_when_given_2_vertices(self) -> None:
+        with self.assertRaises(ValueError):
+            self.index.get_polygon_overflights(FRANCE[:2])
+            
+class Test_Ground_Track_Index_File(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        with open(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]) as file:
+            text = file.read()
+        self.filepath = os.path.join(self.temp_dir.name, "Sat_GEOGRAPHICAL_COORDINATES.txt")
+        with open(self.filepath, "w") as file:
+            file.write(text)
+            
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def test_open_saves_the_index_next_to_the_file(self) -> None:
+        index = Ground_Track_Index.open(self.filepath)
+        self.assertTrue(os.path.exists(self.filepath + INDEX_SUFFIX))
+        loaded = Ground_Track_Index.open(self.filepath)
+        self.assertEqual(loaded.runs, index.runs)
+        self.assertEqual(loaded.latitudes, index.latitudes)
+        self.assertEqual(loaded.get_box_overflights(358.0, 41.0, 359.5, 42.0), 
+                         index.get_box_overflights(358.0, 41.0, 359.5, 42.0))
+        self.assertEqual(len(loaded.get_box_overflights(358.0, 41.0, 359.5, 42.0)), 1)
+        
+    def test_open_rebuilds_an_outdated_index(self) -> None:
+        Ground_Track_Index.open(self.filepath)
+        with open(self.filepath, "a") as file:
+            file.write("59409 1050.00000 0.440000 42.414690\n")
+        os.utime(self.filepath, ns = (0, 0))
+        self.assertEqual(len(Ground_Track_Index.open(self.filepath).latitudes), 4)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the aggregation of the runs of a parameter sweep.
+"""
+import io
+import math
+import os
+import unittest
+from array import array
+from contextlib import redirect_stderr, redirect_stdout
+from tempfile import TemporaryDirectory
+
+from simu_cic_columnar import load_columnar, load_columnar_table, save_columnar_table
+from simu_cic_samples import copy_samples
+from simu_cic_sweep import CACHE_DIRNAME, Parameter_Sweep, main
+
+class Test_Parameter_Sweep(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+        self.dirpath = os.path.join(self.temp_dir.name, "sweep")
+        os.mkdir(self.dirpath)
+        for index in range(1, 4):
+            self.add_run(f"run_{index}")
+        
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        
+    def add_run(self, name : str, altitude : str = "607.942") -> str:
+        dirpath = os.path.join(self.dirpath, name)
+        os.mkdir(dirpath)
+        copy_samples(dirpath)
+        with open("simu_cic_info.txt") as file:
+            text = file.read()
+        with open(os.path.join(dirpath, "simu_cic_info.txt"), "w") as file:
+            file.write(text.replace("Altitude (km): 607.942", f"Altitude (km): {altitude}"))
+        return dirpath
+    
+    def test_get_table(self) -> None:
+        parameter_sweep = Parameter_Sweep(self.dirpath)
+        self.assertEqual(len(parameter_sweep.update(max_workers = 1)), 3)
+        table = parameter_sweep.get_table()
+        self.assertEqual(table["run"], ["run_1", "run_2", "run_3"])
+        self.assertEqual(table["start (UTC)"], ["2021-01-01T00:00:00"] * 3)
+        self.assertEqual(table["stations"], ["Grasse, Paris"] * 3)
+        self.assertEqual(list(table["Altitude (km)"]), [607.942] * 3)
+        self.assertEqual(list(table["min altitude (km)"]), [601.674] * 3)
+        self.assertEqual(list(table["contact time station 1 (s)"]), [30.0] * 3)
+        self.assertEqual(list(table["eclipse fraction"]), [1.0] * 3)
+        
+    def test_only_the_new_runs_are_processed(self) -> None:
+        Parameter_Sweep(self.dirpath).update(max_workers = 2)
+        eclipse_filepath = os.path.join(self.add_run("run_4", altitude = "500.0"), "Sat_SATELLITE_ECLIPSE.txt")
+        with open(eclipse_filepath) as file:
+            text = file.read()
+        with open(eclipse_filepath, "w") as file:
+            file.write(text.replace("1040.00000 100.00", "1040.00000 40.00"))
+        self.add_run("run_5")
+        os.remove(os.path.join(self.dirpath, "run_5", "Sat_SATELLITE_ALTITUDE.txt"))
+        parameter_sweep = Parameter_Sweep(self.dirpath)
+        results = parameter_sweep.update(max_workers = 2)
+        self.assertEqual([result["run"] for result in results], ["run_4", "run_5"])
+        self.assertEqual(parameter_sweep.get_runs(), ["run_1", "run_2", "run_3", "run_4", "run_5"])
+        table = parameter_sweep.get_table()
+        self.assertEqual(table["Altitude (km)"][3], 500.0)
+        self.assertEqual(table["eclipse fraction"][3], 2 / 3)
+        self.assertTrue(math.isnan(table["min altitude (km)"][4]))
+        self.assertEqual(parameter_sweep.update(max_workers = 1), [])
+        
+    def test_modified_runs_are_processed_again(self) -> None:
+        Parameter_Sweep(self.dirpath).update(max_workers = 1)
+        with open(os.path.join(self.dirpath, "run_2", "simu_cic_info.txt"), "a") as file:
+            file.write("3: Toulouse\n")
+        parameter_sweep = Parameter_Sweep(self.dirpath)
+        self.assertEqual([result["run"] for result in parameter_sweep.update(max_workers = 1)], ["run_2"])
+        self.assertEqual(parameter_sweep.get_table()["stations"][1], "Grasse, Paris, Toulouse")
+        
+    def test_save_and_load_the_table(self) -> None:
+        parameter_sweep = Parameter_Sweep(self.dirpath)
+        parameter_sweep.update(max_workers = 1)
+        filepath = parameter_sweep.save()
+        self.assertEqual(filepath, self.dirpath + ".cols")
+        table = load_columnar_table(filepath)
+        self.assertEqual(table, parameter_sweep.get_table())
+        self.assertEqual([type(values).__name__ for values in table.values()].count("array"), 10)
+        with self.assertRaises(ValueError):
+            load_columnar(filepath)
+            
+    def test_save_columnar_table_with_nan(self) -> None:
+        filepath = os.path.join(self.temp_dir.name, "table.cols")
+        save_columnar_table({"run" : ["a", "b"], "value" : array('d', [1.5, math.nan])}, filepath)
+        table = load_columnar_table(filepath)
+        self.assertEqual(table["run"], ["a", "b"])
+        self.assertEqual(table["value"][0], 1.5)
+        self.assertTrue(math.isnan(table["value"][1]))
+        
+    def test_main(self) -> None:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        os.remove(os.path.join(self.dirpath, "run_3", "Sat_SATELLITE_ALTITUDE.txt"))
+        with open(os.path.join(self.dirpath, "run_3", "simu_cic_info.txt"), "w") as file:
+            file.write("# Simulation synthesis\n")
+        output = os.path.join(self.temp_dir.name, "table.cols")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertEqual(main(["-j", "1", "-o", output, self.dirpath]), 1)
+        self.assertIn("run_3: TypeError", stderr.getvalue())
+        self.assertIn("2 runs (2 processed, 0 cached)", stdout.getvalue())
+        self.assertEqual(load_columnar_table(output)["run"], ["run_1", "run_2"])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dirpath, CACHE_DIRNAME))), ["run_1.json", "run_2.json"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the writer of the "sat" files.
+"""
+import datetime as dt
+import os
+import unittest
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+
+from hypothesis import given, settings, strategies as st
+
+from simu_cic_file_manager import Sat_Altitude, Sat_Distance_To_Ground_Station, Sat_Eclipse, \
+    Sat_Geographical_Coordinates, Sat_Orbit_Number, Sat_Position, Sat_Visibility, Simu_Cic_Info_File_Parser
+from simu_cic_propagator import J2_Propagator, get_time_axis
+from simu_cic_samples import SAMPLE_FILEPATHS
+from simu_cic_writer import Sat_File_Writer, get_header, set_datetime_to_str, write_sat_file
+
+SAT_FILES = {"DISTANCE_GROUND_STATION_1" : Sat_Distance_To_Ground_Station,
+             "GEOGRAPHICAL_COORDINATES" : Sat_Geographical_Coordinates,
+             "GEOMETRICAL_VISIBILITY_GROUND_STATION_1" : Sat_Visibility,
+             "ORBIT_NUMBER" : Sat_Orbit_Number, "SATELLITE_ALTITUDE" : Sat_Altitude,
+             "SATELLITE_DIRECTION-GROUND_STATION_1_FRAME" : Sat_Position,
+             "SATELLITE_ECLIPSE" : Sat_Eclipse}
+
+HEADER = {'USER_DEFINED_CONTENT' : 'DISTANCE_GROUND_STATION_1', 'START_TIME' : dt.datetime(2021, 6, 22),
+          'STOP_TIME' : dt.datetime(2022, 6, 22)}
+
+class Test_Get_Header(unittest.TestCase):
+    
+    def test_set_datetime_to_str(self) -> None:
+        self.assertEqual(set_datetime_to_str(dt.datetime(2021, 6, 23, 9, 52, 26, 123456)), "2021-06-23T09:52:26.123")
+    
+    def test_get_header_fills_the_defaults(self) -> None:
+        header = get_header(HEADER)
+        self.assertEqual(header['COMMENT'], "days (MJD), sec (UTC), distance (km)")
+        self.assertEqual(header['OBJECT_ID'], "Sat")
+        self.assertEqual(header['START_TIME'], "2021-06-22T00:00:00.000")
+    
+    def test_get_header_raises_valueerror_when_given_an_unknown_content(self) -> None:
+        with self.assertRaises(ValueError):
+            get_header(dict(HEADER, USER_DEFINED_CONTENT = "MAGNETIC_FIELD"))
+    
+    def test_get_header_raises_valueerror_when_missing_the_stop_time(self) -> None:
+        with self.assertRaises(ValueError):
+            get_header({'USER_DEFINED_CONTENT' : 'SATELLITE_ALTITUDE', 'START_TIME' : dt.datetime(2021, 6, 22)})
+
+class Test_Sat_File_Writer(unittest.TestCase):
+    
+    def setUp(self) -> None:
+        self.temp_dir = TemporaryDirectory()
+    
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+    
+    def get_filepath(self, basename : str) -> str:
+        return os.path.join(self.temp_dir.name, basename)
+    
+    def test_write_sat_file_round_trips_every_sample(self) -> None:
+        for content, parser_class in SAT_FILES.items():
+            basename = f"Sat_{content}.txt"
+            for suffix in ("", ".gz", ".xz", ".bz2"):
+                sat_file_parser = parser_class(SAMPLE_FILEPATHS[content])
+                filepath = self.get_filepath(basename + suffix)
+                self.assertEqual(write_sat_file(filepath, sat_file_parser), len(sat_file_parser.get_results()))
+                written = parser_class(filepath)
+                self.assertEqual(written.simulation_data, sat_file_parser.simulation_data, basename + suffix)
+                self.assertEqual([column.typecode for column in written.get_results().columns],
+                                 [column.typecode for column in sat_file_parser.get_results().columns])
+    
+    def test_write_sat_file_reproduces_the_samples(self) -> None:
+        filepath = self.get_filepath("Sat_GEOGRAPHICAL_COORDINATES.txt")
+        write_sat_file(filepath, Sat_Geographical_Coordinates(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]))
+        with open(SAMPLE_FILEPATHS["GEOGRAPHICAL_COORDINATES"]) as file, open(filepath) as written:
+            self.assertEqual(written.read().rstrip("\n"), file.read().rstrip("\n"))
+    
+    def test_write_rows_from_generators_in_several_buffers(self) -> None:
+        filepath = self.get_filepath("Sat_DISTANCE_GROUND_STATION_1.txt")
+        epoch = 5132938620000000
+        with Sat_File_Writer(filepath, HEADER, buffer_size = 7) as sat_file_writer:
+            self.assertEqual(sat_file_writer.write_rows((epoch + 10000000 * i for i in range(50)),
+                                                        [(1000.0 + i / 8 for i in range(50))]), 50)
+            sat_file_writer.write_row(dt.datetime(2021, 7, 14, 0, 25, 20, 5, tzinfo = dt.timezone.utc), [1.5])
+        results = Sat_Distance_To_Ground_Station(filepath).get_results()
+        self.assertEqual(len(results), 51)
+        self.assertEqual(results.get_column(1)[49], 1006.125)
+        self.assertEqual(results.epochs[50], epoch + 500000005)
+    
+    def test_write_results_of_a_propagator_with_exact_decimals(self) -> None:
+        propagator = J2_Propagator.from_simu_cic_info(Simu_Cic_Info_File_Parser("simu_cic_info.txt"))
+        time_axis = get_time_axis(dt.datetime(2021, 1, 1), dt.datetime(2021, 1, 1, 1), timedelta(seconds = 30))
+        sat_geographical_coordinates = propagator.get_parsers(time_axis)['GEOGRAPHICAL_COORDINATES']
+        filepath = self.get_filepath("Sat_GEOGRAPHICAL_COORDINATES.txt.gz")
+        write_sat_file(filepath, sat_geographical_coordinates, [None, None], ORIGINATOR = "J2_Propagator")
+        written = Sat_Geographical_Coordinates(filepath)
+        self.assertEqual(written.get_results(), sat_geographical_coordinates.get_results())
+        self.assertEqual(written.get_originator(), "J2_Propagator")
+    
+    def test_init_raises_valueerror_when_given_an_invalid_extension(self) -> None:
+        with self.assertRaises(ValueError):
+            Sat_File_Writer(self.get_filepath("Sat_DISTANCE_GROUND_STATION_1.csv"), HEADER)
+    
+    @settings(deadline = None, max_examples = 50)
+    @given(st.lists(st.tuples(st.integers(0, 10**9), st.floats(-1e6, 1e6)), min_size = 1, max_size = 20))
+    def test_write_rows_round_trips_any_epoch(self, rows : list) -> None:
+        epoch = 5132938620000000
+        epochs = [epoch + sum(delta for delta, _ in rows[:index + 1]) for index in range(len(rows))]
+        values = [round(value, 3) for _, value in rows]
+        filepath = self.get_filepath("Sat_DISTANCE_GROUND_STATION_1.txt")
+        with Sat_File_Writer(filepath, HEADER) as sat_file_writer:
+            sat_file_writer.write_rows(epochs, [values])
+        results = Sat_Distance_To_Ground_Station(filepath).get_results()
+        self.assertEqual(list(results.epochs), epochs)
+        self.assertEqual(list(results.get_column(1)), values)
+
+if __name__ == '__main__':
+    unittest.main()